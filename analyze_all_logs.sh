@@ -1,9 +1,10 @@
 #!/bin/bash
 
 # Simple script to find and analyze all locust_*.log files in LoadTester_Logs directories
-# Usage: ./analyze_all_logs.sh [--draft] [experiment_type1] [experiment_type2] ...
+# Usage: ./analyze_all_logs.sh [--draft] [--mathtext] [experiment_type1] [experiment_type2] ...
 # Options:
 #   --draft    Call analyze_logs.py without --publication option (for draft analysis)
+#   --mathtext Render publication plots with mathtext instead of LaTeX (no TeX installation needed, faster)
 # Available experiment types:
 #   - baseline
 #   - training
@@ -17,6 +18,7 @@
 # Parse command line arguments for options and experiment type filtering
 SPECIFIED_EXPERIMENT_TYPES=()
 DRAFT_MODE=false
+PUBLICATION_BACKEND="latex"
 
 # Process arguments
 while [ $# -gt 0 ]; do
@@ -25,9 +27,13 @@ while [ $# -gt 0 ]; do
             DRAFT_MODE=true
             shift
             ;;
+        --mathtext)
+            PUBLICATION_BACKEND="mathtext"
+            shift
+            ;;
         -*)
             echo "Unknown option: $1"
-            echo "Usage: ./analyze_all_logs.sh [--draft] [experiment_type1] [experiment_type2] ..."
+            echo "Usage: ./analyze_all_logs.sh [--draft] [--mathtext] [experiment_type1] [experiment_type2] ..."
             exit 1
             ;;
         *)
@@ -46,7 +52,7 @@ fi
 if [ "$DRAFT_MODE" = true ]; then
     echo "Draft mode enabled - will call analyze_logs.py without --publication option"
 else
-    echo "Publication mode enabled - will call analyze_logs.py with --publication option"
+    echo "Publication mode enabled - will call analyze_logs.py with --publication option ($PUBLICATION_BACKEND text rendering)"
 fi
 echo
 
@@ -198,12 +204,17 @@ done
 echo
 
 # Process all log files in a single call
+# The parsed runs are also stored in the results database for queries across experiments (python analyze_logs.py query --db ...)
 echo "Analyzing all log files together..."
 if [ "$DRAFT_MODE" = true ]; then
-    python analyze_logs.py "${sorted_log_files[@]}" --output-dir "$OUTPUT_DIR"
+    python analyze_logs.py analyze "${sorted_log_files[@]}" --output-dir "$OUTPUT_DIR" --summary-dir "$OUTPUT_DIR/summaries" --db "$OUTPUT_DIR/experiment_results.sqlite"
 else
-    python analyze_logs.py "${sorted_log_files[@]}" --publication --scatter-plot --output-dir "$OUTPUT_DIR"
+    python analyze_logs.py analyze "${sorted_log_files[@]}" --publication --publication-backend "$PUBLICATION_BACKEND" --scatter-plot --output-dir "$OUTPUT_DIR" --summary-dir "$OUTPUT_DIR/summaries" --db "$OUTPUT_DIR/experiment_results.sqlite"
 fi
 
+# Pool repeated runs of the same experiment using the run summaries written above
+echo "Aggregating repeated runs..."
+python analyze_logs.py aggregate "$OUTPUT_DIR/summaries" --output-csv "$OUTPUT_DIR/aggregated_runs.csv"
+
 echo "All log files processed!"
 echo "Results saved to: $OUTPUT_DIR"
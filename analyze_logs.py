@@ -11,18 +11,34 @@ Features:
 - Detailed error categorization by HTTP status and functional types
 - Success rate calculation and statistics
 - PDF chart generation with experiment type detection
+- Input formats: locust text logs, per-request CSV, locust stats_history CSV and locust --json output
+- Resource efficiency of the tfvars allocations (efficiency command)
 """
 
 import re
+import json
+import array
+import heapq
+import sqlite3
+import shutil
+import hashlib
+import tempfile
 import typer
 from pathlib import Path
 from collections import defaultdict
-from typing import Dict, List, Tuple
+from contextlib import ExitStack
+from typing import Dict, Iterator, List, Tuple
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields, asdict
 from datetime import datetime
+from dateutil.tz import tzlocal
+from statistics import NormalDist
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from k8s_api import parse_cpu_quantity, parse_memory_quantity
+
 
 @dataclass
 class FileData:
@@ -35,6 +51,29 @@ class FileData:
     response_timestamps: Dict[str, List[float]] = None  # Relative time in seconds from start
     error_timestamps: List[float] = None  # Timestamps of all errors
     start_time: float = None  # Start timestamp of the log file
+    error_timeline: 'ErrorTimeline' = None  # Time, category and user of every error
+    data_digest: str = None  # Digest of the parsed data for the chart cache (see file_data_digest)
+    change_points: List[float] = None  # Detected change points in seconds (see detect_change_points)
+    response_users: Dict[str, np.ndarray] = None  # uint32 locust user id per response time (0 if unknown)
+
+# Error categories in the order used by ErrorStats.to_dict (field name -> label).
+# The position in this mapping is the category code stored in ErrorTimeline.
+ERROR_CATEGORY_LABELS = {
+    'http_503_errors': 'HTTP 503 (Service Unavailable)',
+    'http_502_errors': 'HTTP 502 (Bad Gateway)',
+    'http_500_errors': 'HTTP 500 (Internal Server)',
+    'login_errors': 'Login Errors',
+    'logout_errors': 'Logout Errors',
+    'profile_errors': 'Profile Access Errors',
+    'product_errors': 'Product/Cart Errors',
+    'category_errors': 'Category Browse Errors',
+    'page_load_errors': 'Page Load Errors',
+    'timeout_errors': 'Timeout Errors',
+    'unknown_errors': 'Unknown/Empty Errors',
+    'connection_errors': 'Connection Errors',
+    'other_errors': 'Other Errors',
+}
+ERROR_CATEGORIES = list(ERROR_CATEGORY_LABELS)
 
 @dataclass
 class ErrorStats:
@@ -75,40 +114,433 @@ class ErrorStats:
                 self.product_errors + self.category_errors + self.page_load_errors)
     
     def to_dict(self) -> Dict[str, int]:
+        return {label: getattr(self, category) for category, label in ERROR_CATEGORY_LABELS.items()}
+    
+    def merge(self, other: 'ErrorStats') -> 'ErrorStats':
+        """Return a new ErrorStats with the counts of both instances added up."""
+        return ErrorStats(**{f.name: getattr(self, f.name) + getattr(other, f.name) for f in fields(self)})
+
+@dataclass
+class ErrorTimeline:
+    """Every error of a run as (time, category code, user id) in compact typed arrays."""
+    times: np.ndarray  # float64, seconds from start
+    categories: np.ndarray  # uint8, index into ERROR_CATEGORIES
+    users: np.ndarray  # uint32, locust user id
+    
+    @classmethod
+    def empty(cls) -> 'ErrorTimeline':
+        return cls(times=np.empty(0, dtype=np.float64), categories=np.empty(0, dtype=np.uint8),
+                   users=np.empty(0, dtype=np.uint32))
+    
+    def __len__(self) -> int:
+        return len(self.times)
+    
+    def rate_series(self, bin_seconds: float, end_time: float = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Count the errors per category and time bin.
+        
+        Returns:
+            Tuple of (bin_edges, counts) where counts has the shape
+            (len(ERROR_CATEGORIES), number of bins)
+        """
+        if end_time is None:
+            end_time = float(self.times.max()) if len(self.times) else 0.0
+        num_bins = max(1, int(np.ceil(end_time / bin_seconds)))
+        bin_edges = np.arange(num_bins + 1) * bin_seconds
+        bins = np.minimum((self.times // bin_seconds).astype(np.int64), num_bins - 1)
+        counts = np.bincount(self.categories.astype(np.int64) * num_bins + bins,
+                             minlength=len(ERROR_CATEGORIES) * num_bins)
+        return bin_edges, counts.reshape(len(ERROR_CATEGORIES), num_bins)
+
+# Maximum number of distinct synthetic values of LatencyHistogram.corrected (about 40 bytes each)
+CORRECTION_MAX_VALUES = 10_000_000
+
+@dataclass
+class LatencyHistogram:
+    """Exact histogram of response times (count per distinct value).
+
+    Locust logs response times in whole milliseconds, so keeping the count per
+    distinct value is lossless and still compact. Merging histograms adds the
+    counts, and percentiles of a merged histogram are identical to the
+    percentiles of the pooled raw samples.
+    """
+    values: np.ndarray  # Sorted distinct response times (ms)
+    counts: np.ndarray  # Number of samples per value
+    
+    @classmethod
+    def from_samples(cls, samples) -> 'LatencyHistogram':
+        values, counts = np.unique(np.asarray(samples, dtype=np.float64), return_counts=True)
+        return cls(values=values, counts=counts.astype(np.int64))
+    
+    @classmethod
+    def from_chunks(cls, chunks) -> 'LatencyHistogram':
+        """Histogram of samples that are read in chunks (counts are exact, so equal to from_samples)."""
+        histogram = cls(values=np.empty(0, dtype=np.float64), counts=np.empty(0, dtype=np.int64))
+        for chunk in chunks:
+            histogram = histogram.merge(cls.from_samples(chunk))
+        return histogram
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, list]) -> 'LatencyHistogram':
+        return cls(values=np.asarray(data['values'], dtype=np.float64),
+                   counts=np.asarray(data['counts'], dtype=np.int64))
+    
+    def to_dict(self) -> Dict[str, list]:
+        # Whole milliseconds are stored as integers to keep the JSON compact
+        values = [int(v) if v.is_integer() else v for v in self.values.tolist()]
+        return {'values': values, 'counts': self.counts.tolist()}
+    
+    def merge(self, other: 'LatencyHistogram') -> 'LatencyHistogram':
+        values, inverse = np.unique(np.concatenate([self.values, other.values]), return_inverse=True)
+        counts = np.bincount(inverse, weights=np.concatenate([self.counts, other.counts]))
+        return LatencyHistogram(values=values, counts=counts.astype(np.int64))
+    
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+    
+    @property
+    def total(self) -> float:
+        return float(np.dot(self.values, self.counts))
+    
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else float('nan')
+    
+    @property
+    def min(self) -> float:
+        return float(self.values[0]) if len(self.values) else float('nan')
+    
+    @property
+    def max(self) -> float:
+        return float(self.values[-1]) if len(self.values) else float('nan')
+    
+    def percentile(self, q):
+        """Percentile(s) with the same linear interpolation as np.percentile on the raw samples."""
+        q = np.asarray(q, dtype=np.float64)
+        n = self.count
+        if n == 0:
+            return np.full(q.shape, np.nan) if q.ndim else float('nan')
+        cumulative = np.cumsum(self.counts)
+        position = (n - 1) * q / 100.0
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, n - 1)
+        lower_values = self.values[np.searchsorted(cumulative, lower, side='right')]
+        upper_values = self.values[np.searchsorted(cumulative, upper, side='right')]
+        result = lower_values + (position - lower) * (upper_values - lower_values)
+        return result if q.ndim else float(result)
+    
+    def corrected(self, expected_interval: float) -> 'LatencyHistogram':
+        """
+        Histogram corrected for coordinated omission, like HdrHistogram's
+        recordValueWithExpectedInterval: a user waiting v ms for a response
+        could not send the requests due every expected_interval ms, so each
+        sample v adds the samples v - interval, v - 2 * interval, ... down to
+        the interval itself.
+        
+        The synthetic samples of all values with the same remainder r modulo the
+        interval lie on the grid r + j * interval, so their counts are computed
+        per grid point (a reverse cumulative sum) without materializing them.
+        Raises ValueError if the grid would exceed CORRECTION_MAX_VALUES points.
+        """
+        quotients = np.floor(self.values / expected_interval)
+        missing = np.maximum(quotients.astype(np.int64) - 1, 0)
+        has_missing = missing > 0
+        if not has_missing.any():
+            return self
+        missing = missing[has_missing]
+        # Rounded to 1 ns, so that floating point noise does not split a grid
+        remainders = np.round(self.values[has_missing] - quotients[has_missing] * expected_interval, 6)
+        grids, grid_of_value = np.unique(remainders, return_inverse=True)
+        lengths = np.zeros(len(grids), dtype=np.int64)
+        np.maximum.at(lengths, grid_of_value, missing)
+        total = int(lengths.sum())
+        if total > CORRECTION_MAX_VALUES:
+            raise ValueError(f"expected interval {expected_interval:g} ms needs {total:,} synthetic values "
+                             f"(more than {CORRECTION_MAX_VALUES:,}), use a larger interval")
+        offsets = np.cumsum(lengths) - lengths
+        # Grid point j (1-based) of a grid gets the counts of all values with at least j missing samples
+        starts = np.zeros(total + 1)
+        np.add.at(starts, offsets[grid_of_value] + missing - 1, self.counts[has_missing])
+        reverse_cumulative = np.cumsum(starts[::-1])[::-1]
+        grid_ends = np.repeat(offsets + lengths, lengths)
+        synthetic_counts = reverse_cumulative[:total] - reverse_cumulative[grid_ends]
+        steps = np.arange(total) - np.repeat(offsets, lengths) + 1
+        synthetic = np.repeat(grids, lengths) + steps * expected_interval
+        values, inverse = np.unique(np.concatenate([self.values, synthetic]), return_inverse=True)
+        counts = np.bincount(inverse, weights=np.concatenate([self.counts, synthetic_counts]))
+        return LatencyHistogram(values=values, counts=np.rint(counts).astype(np.int64))
+
+@dataclass
+class RunSummary:
+    """Compact, mergeable summary of a single experiment run."""
+    file_label: str
+    experiment_type: str  # Directory name of the experiment (e.g. deployment type)
+    run_name: str  # Name of the run, e.g. LoadTester_Logs_<time>/locust_log_<profile>
+    source_file: str
+    start_time: float
+    duration: float  # Seconds between the first and last recorded response
+    histograms: Dict[str, LatencyHistogram]
+    error_stats: ErrorStats = field(default_factory=ErrorStats)
+    
+    @property
+    def group_key(self) -> Tuple[str, str]:
+        """Runs with the same experiment type and load profile are repeats of each other."""
+        return self.experiment_type, Path(self.run_name).name
+    
+    def to_dict(self) -> dict:
         return {
-            'HTTP 503 (Service Unavailable)': self.http_503_errors,
-            'HTTP 502 (Bad Gateway)': self.http_502_errors,
-            'HTTP 500 (Internal Server)': self.http_500_errors,
-            'Login Errors': self.login_errors,
-            'Logout Errors': self.logout_errors,
-            'Profile Access Errors': self.profile_errors,
-            'Product/Cart Errors': self.product_errors,
-            'Category Browse Errors': self.category_errors,
-            'Page Load Errors': self.page_load_errors,
-            'Timeout Errors': self.timeout_errors,
-            'Unknown/Empty Errors': self.unknown_errors,
-            'Connection Errors': self.connection_errors,
-            'Other Errors': self.other_errors
+            'file_label': self.file_label,
+            'experiment_type': self.experiment_type,
+            'run_name': self.run_name,
+            'source_file': self.source_file,
+            'start_time': self.start_time,
+            'duration': self.duration,
+            'histograms': {request_type: histogram.to_dict()
+                           for request_type, histogram in self.histograms.items()},
+            'error_stats': asdict(self.error_stats),
         }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'RunSummary':
+        return cls(
+            file_label=data['file_label'],
+            experiment_type=data['experiment_type'],
+            run_name=data['run_name'],
+            source_file=data['source_file'],
+            start_time=data['start_time'],
+            duration=data['duration'],
+            histograms={request_type: LatencyHistogram.from_dict(histogram)
+                        for request_type, histogram in data['histograms'].items()},
+            error_stats=ErrorStats(**data['error_stats']),
+        )
+
+# Memory-bounded analysis (--max-memory): the response records are written to
+# files in chunks while parsing and all statistics and charts stream over them.
+SPILL_CHUNK_FRACTION = 256  # A chunk of one column takes 1/256 of the memory cap
+SPILL_MIN_CHUNK_ROWS = 4096
+# Matplotlib keeps every point of a scatter plot until the figure is saved
+SCATTER_PLOT_BYTES_PER_POINT = 200
+
+
+class SpilledColumn:
+    """Column (response times, timestamps or user ids) stored on disk and read in chunks via np.memmap."""
+    
+    def __init__(self, path: Path, length: int, chunk_rows: int, dtype=np.float64):
+        self.path = path
+        self.length = length
+        self.chunk_rows = chunk_rows
+        self.dtype = np.dtype(dtype)
+        self.histogram = None  # Cached LatencyHistogram (see response_time_histogram)
+    
+    def __len__(self) -> int:
+        return self.length
+    
+    def __bool__(self) -> bool:
+        return self.length > 0
+    
+    def chunks(self) -> Iterator[np.ndarray]:
+        # Each chunk is mapped on its own, so only one chunk is resident at a time
+        for start in range(0, self.length, self.chunk_rows):
+            rows = min(self.chunk_rows, self.length - start)
+            yield np.memmap(self.path, dtype=self.dtype, mode='r', offset=start * self.dtype.itemsize, shape=(rows,))
+    
+    def take(self, rows: np.ndarray) -> np.ndarray:
+        """Values at the given row indices (only the touched pages are read)."""
+        if self.length == 0:
+            return np.empty(0, dtype=self.dtype)
+        return np.asarray(np.memmap(self.path, dtype=self.dtype, mode='r', shape=(self.length,))[rows])
+
+
+class ColumnWriter:
+    """Appends values to a column file, buffering one chunk in memory."""
+    
+    def __init__(self, path: Path, chunk_rows: int, typecode: str = 'd'):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.typecode = typecode
+        self.buffer = array.array(typecode)
+        self.length = 0
+        self.file = open(path, 'wb')
+    
+    def append(self, value: float):
+        self.buffer.append(value)
+        if len(self.buffer) >= self.chunk_rows:
+            self._flush()
+    
+    def extend(self, values):
+        for chunk in iter_column_chunks(values, self.typecode):
+            self.buffer.frombytes(chunk.tobytes())
+            if len(self.buffer) >= self.chunk_rows:
+                self._flush()
+    
+    def _flush(self):
+        self.buffer.tofile(self.file)
+        self.length += len(self.buffer)
+        self.buffer = array.array(self.typecode)
+    
+    def finish(self) -> SpilledColumn:
+        self._flush()
+        self.file.close()
+        return SpilledColumn(self.path, self.length, self.chunk_rows, self.typecode)
+    
+    def discard(self):
+        self.file.close()
+        self.path.unlink(missing_ok=True)
+
+
+class SpillStore:
+    """Temporary directory holding the spilled columns of all parsed files."""
+    
+    def __init__(self, max_memory: int, spill_dir: Path = None):
+        self.max_memory = max_memory
+        self.chunk_rows = max(SPILL_MIN_CHUNK_ROWS, max_memory // SPILL_CHUNK_FRACTION // 8)
+        self.directory = Path(tempfile.mkdtemp(prefix='analyze_logs_spill_', dir=spill_dir))
+        self.columns = 0
+    
+    def writer(self, typecode: str = 'd') -> ColumnWriter:
+        """Writer of a new column with the array typecode 'd' (float64) or 'I' (uint32, user ids)."""
+        self.columns += 1
+        return ColumnWriter(self.directory / f"column_{self.columns}.{np.dtype(typecode).name}",
+                            self.chunk_rows, typecode)
+    
+    def spill(self, columns: Dict[str, List[float]], typecode: str = 'd') -> Dict[str, SpilledColumn]:
+        """Move in-memory columns (e.g. from the CSV loaders) to disk."""
+        spilled = {}
+        for request_type, values in columns.items():
+            writer = self.writer(typecode)
+            writer.extend(values)
+            spilled[request_type] = writer.finish()
+        return spilled
+    
+    def close(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+    
+    def __enter__(self) -> 'SpillStore':
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def iter_column_chunks(values, dtype=np.float64) -> Iterator[np.ndarray]:
+    """Chunks of a response time, timestamp or user id column; an in-memory column is a single chunk."""
+    if isinstance(values, SpilledColumn):
+        yield from values.chunks()
+    elif len(values) > 0:
+        yield np.asarray(values, dtype=dtype)
+
+
+def iter_aligned_chunks(*columns) -> Iterator[Tuple[np.ndarray, ...]]:
+    """Aligned chunks of the columns of a request type, cut to the shortest column."""
+    remaining = min(len(column) for column in columns)
+    column_chunks = [iter_column_chunks(column, getattr(column, 'dtype', np.float64)) for column in columns]
+    for chunks in zip(*column_chunks):
+        rows = min(min(len(chunk) for chunk in chunks), remaining)
+        if rows <= 0:
+            break
+        yield tuple(chunk[:rows] for chunk in chunks)
+        remaining -= rows
+
+
+def iter_paired_chunks(times, timestamps) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Aligned chunks of the response times and timestamps of a request type, cut to the shorter column."""
+    return iter_aligned_chunks(times, timestamps)
+
+
+def column_max(values) -> float:
+    return max(float(chunk.max()) for chunk in iter_column_chunks(values))
+
+
+def response_time_histogram(times) -> 'LatencyHistogram':
+    """Exact histogram of a response time column (cached for spilled columns, which are read from disk)."""
+    if not isinstance(times, SpilledColumn):
+        return LatencyHistogram.from_samples(times)
+    if times.histogram is None:
+        times.histogram = LatencyHistogram.from_chunks(times.chunks())
+    return times.histogram
+
+
+def open_spill_store(max_memory: str, spill_dir: Path = None) -> SpillStore:
+    """SpillStore for a --max-memory option (a quantity like 2Gi or 500M), or None without a cap."""
+    if max_memory is None:
+        return None
+    try:
+        max_memory_bytes = int(parse_memory_quantity(max_memory))
+    except ValueError:
+        typer.echo(f"Error: Invalid memory size '{max_memory}'. Use a quantity like 2Gi or 500M.", err=True)
+        raise typer.Exit(1)
+    if max_memory_bytes <= 0:
+        typer.echo(f"Error: Invalid memory size '{max_memory}'.", err=True)
+        raise typer.Exit(1)
+    spill = SpillStore(max_memory_bytes, spill_dir)
+    typer.echo(f"Memory cap {max_memory}: response records are spilled to {spill.directory} "
+               f"in chunks of {spill.chunk_rows:,} values")
+    return spill
+
 
 app = typer.Typer()
 
-def parse_multiple_log_files(log_files: List[Path]) -> List[FileData]:
+# Timestamp of a locust log line, e.g. [2025-10-03 18:50:10,744]
+LOG_TIMESTAMP_PATTERN = re.compile(r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3})\]')
+
+# Suffix that tells the logs of the workers of a distributed run apart, e.g. locust_log_low_4_worker2.log
+WORKER_SUFFIX_PATTERN = r'[._-]worker[._-]?\d+'
+
+
+def group_worker_logs(log_files: List[Path], worker_pattern: str = WORKER_SUFFIX_PATTERN) -> List[Tuple[Path, List[Path]]]:
+    """
+    Group the logs of the workers of distributed runs: logs in the same
+    directory whose names are equal without the worker suffix belong to one run.
+    
+    Returns:
+        List of (run path without the worker suffix, worker logs) in the order of log_files
+    """
+    groups = {}
+    for log_file in log_files:
+        run_path = log_file.parent / re.sub(worker_pattern, '', log_file.name)
+        groups.setdefault(run_path, []).append(log_file)
+    return list(groups.items())
+
+
+def parse_multiple_log_files(log_files: List[Path], input_format: str = 'auto',
+                             spill: SpillStore = None, warmup_seconds: float = None,
+                             worker_pattern: str = None) -> List[FileData]:
     """
     Parse multiple log files and return a list of FileData objects.
     
     Args:
         log_files: List of Path objects pointing to log files
+        input_format: Input format of the files (a key of LOG_LOADERS) or 'auto' to detect it per file
+        spill: Store the response records on disk instead of in memory (see SpillStore)
+        warmup_seconds: Drop the first seconds of every file instead of cutting at the warm-up marker
+        worker_pattern: Merge the locust logs of the workers of a distributed run into one run
+            (see group_worker_logs); None parses every file on its own
         
     Returns:
-        List of FileData objects containing parsed data from each file
+        List of FileData objects containing parsed data from each file (or group of worker logs)
     """
     file_data_list = []
     used_labels = {}  # Track how many times each label has been used
     
-    for log_file in log_files:
-        typer.echo(f"Parsing {log_file.name}...")
-        response_times, error_stats, response_timestamps, error_timestamps, start_time = parse_log_file(log_file)
+    if worker_pattern is None:
+        groups = [(log_file, [log_file]) for log_file in log_files]
+    else:
+        groups = group_worker_logs(log_files, worker_pattern)
+    
+    for log_file, worker_logs in groups:
+        if len(worker_logs) == 1:
+            typer.echo(f"Parsing {worker_logs[0].name}...")
+            loaded = load_log_file(worker_logs[0], input_format, spill, warmup_seconds)
+        else:
+            typer.echo(f"Merging {len(worker_logs)} worker logs into {log_file.name}: "
+                       f"{', '.join(worker_log.name for worker_log in worker_logs)}...")
+            formats = {input_format if input_format != 'auto' else detect_log_format(worker_log) for worker_log in worker_logs}
+            if formats != {'locust-log'}:
+                typer.echo(f"Error: Only locust text logs can be merged, not {', '.join(sorted(formats))}.", err=True)
+                raise typer.Exit(1)
+            loaded = parse_log_files(worker_logs, spill, warmup_seconds)
+        response_times, error_stats, response_timestamps, error_timeline, start_time, response_users = loaded
         
         # Create a human-readable label using experiment type
         try:
@@ -132,38 +564,302 @@ def parse_multiple_log_files(log_files: List[Path]) -> List[FileData]:
             error_stats=error_stats,
             file_label=file_label,
             response_timestamps=response_timestamps,
-            error_timestamps=error_timestamps,
-            start_time=start_time
+            error_timestamps=error_timeline.times,
+            start_time=start_time,
+            error_timeline=error_timeline,
+            response_users=response_users
         )
         file_data_list.append(file_data)
     
     return file_data_list
 
-def parse_log_file(file_path: Path) -> Tuple[Dict[str, List[float]], ErrorStats, Dict[str, List[float]], List[float], float]:
+def categorize_error(error_message: str) -> str:
+    """Map an error message to its error category (an ErrorStats field name)."""
+    if error_message == "":
+        return 'unknown_errors'
+    
+    message = error_message.lower()
+    if "timed out" in message:
+        return 'timeout_errors'
+    elif any(conn_keyword in message for conn_keyword in 
+            ["connection", "connect", "refused", "reset", "closed"]):
+        return 'connection_errors'
+    # HTTP Status Code categorization
+    elif "status 500" in error_message or "status: 500" in error_message:
+        return 'http_500_errors'
+    elif "status 502" in error_message or "status: 502" in error_message:
+        return 'http_502_errors'
+    elif "status 503" in error_message or "status: 503" in error_message:
+        return 'http_503_errors'
+    # Functional error categorization
+    elif "login" in message and "username" in message:
+        return 'login_errors'
+    elif "log out" in message or "logout" in message:
+        return 'logout_errors'
+    elif "profile" in message:
+        return 'profile_errors'
+    elif "product" in message or "cart" in message:
+        return 'product_errors'
+    elif "category" in message:
+        return 'category_errors'
+    elif "load" in message and ("page" in message or "landing" in message):
+        return 'page_load_errors'
+    else:
+        return 'other_errors'
+
+
+# Steady-state detection of logs without a warm-up marker (see detect_steady_state)
+STEADY_STATE_WINDOW_SECONDS = 10.0
+STEADY_STATE_MIN_WINDOWS = 6  # Shorter runs are used as a whole
+STEADY_STATE_THROUGHPUT_FRACTION = 0.9  # Throughput is stable once it stays above this fraction of the steady level
+STEADY_STATE_MAX_WARMUP_FRACTION = 0.25  # A latency transient longer than this fraction of the run is not a warm-up
+
+
+def _is_warmup_transient(latency: np.ndarray, cut: int) -> bool:
+    """
+    Whether the windows before cut look like a warm-up: slower than the
+    windows right after them and decaying towards their level, not a level
+    step (e.g. the onset or end of noisy-neighbor interference).
+    """
+    if cut == 0:
+        return False
+    # Level right after the cut, so that a later step does not hide the warm-up
+    steady = np.median(latency[cut:cut + max(2 * cut, STEADY_STATE_MIN_WINDOWS)])
+    # Excess latency of the first, middle and last third of the discarded windows: a decaying
+    # transient has most of it in the first third, a plateau that ends in a step has it spread evenly
+    excess = [part.mean() - steady for part in np.array_split(latency[:cut], min(3, cut))]
+    return excess[0] > 0 and excess[0] > 1.5 * max(excess[1:], default=0.0)
+
+
+def detect_steady_state(response_times: Dict[str, List[float]], response_timestamps: Dict[str, List[float]],
+                        window_seconds: float = STEADY_STATE_WINDOW_SECONDS) -> Tuple[float, float, float]:
+    """
+    Estimate the end of the warm-up phase of a run from its data.
+    
+    Two signals per time window are used:
+    - Throughput: the ramp-up ends at the first window (within the first
+      STEADY_STATE_MAX_WARMUP_FRACTION of the run) whose rolling throughput
+      reaches STEADY_STATE_THROUGHPUT_FRACTION (or the Poisson noise band) of
+      the median throughput of the windows right after it, so that load that
+      grows over the whole run or steps up later is not taken for a ramp.
+      If no window qualifies, nothing is cut for the throughput.
+    - Latency: the Marginal Standard Error Rule (MSER, White 1997) on the
+      mean response time per window picks the truncation point d that
+      minimizes the squared standard error of the remaining windows,
+      var(x[d:]) / (n - d), searched over the first
+      STEADY_STATE_MAX_WARMUP_FRACTION of the run. The truncation is only
+      used if the discarded windows form a decaying transient (see
+      _is_warmup_transient); a latency step is left to the change-point
+      detection and the cut-off uses the throughput alone.
+    
+    Returns:
+        Tuple of (cut-off, end of the throughput ramp, MSER truncation point) in seconds from the start;
+        the end of the ramp is None if the throughput did not settle within the searched windows
+    """
+    window_counts = np.zeros(0)
+    window_sums = np.zeros(0)
+    for request_type, times in response_times.items():
+        timestamps = response_timestamps.get(request_type, [])
+        for times_chunk, timestamps_chunk in iter_paired_chunks(times, timestamps):
+            windows = np.floor_divide(timestamps_chunk, window_seconds).astype(np.int64)
+            size = max(len(window_counts), int(windows.max()) + 1)
+            window_counts = np.pad(window_counts, (0, size - len(window_counts)))
+            window_sums = np.pad(window_sums, (0, size - len(window_sums)))
+            window_counts += np.bincount(windows, minlength=size)
+            window_sums += np.bincount(windows, weights=times_chunk, minlength=size)
+    
+    n = len(window_counts)
+    if n < STEADY_STATE_MIN_WINDOWS:
+        return 0.0, 0.0, 0.0
+    # The last window is usually cut short by the end of the run
+    window_counts, window_sums = window_counts[:-1], window_sums[:-1]
+    n -= 1
+    max_warmup_windows = int(STEADY_STATE_MAX_WARMUP_FRACTION * n)
+    
+    rolling = pd.Series(window_counts).rolling(3, center=True, min_periods=1).mean().to_numpy()
+    # The ramp is the run of low windows at the start, later dips are not part of it
+    ramp_windows = None
+    for cut in range(max_warmup_windows + 1):
+        # Level right after the cut, so that a later step or slow growth of the load does not count
+        level = np.median(window_counts[cut:cut + max(2 * cut, STEADY_STATE_MIN_WINDOWS)])
+        # Below the fraction and beyond the Poisson noise of a 3-window mean, so random dips are no ramp
+        if level > 0 and rolling[cut] >= min(STEADY_STATE_THROUGHPUT_FRACTION * level,
+                                             level - 3 * np.sqrt(level / 3)):
+            ramp_windows = cut
+            break
+    
+    # Windows without responses keep the latency of the previous window
+    latency = pd.Series(np.where(window_counts > 0, window_sums / np.maximum(window_counts, 1), np.nan)).ffill().bfill()
+    latency = latency.fillna(0.0).to_numpy()
+    remaining = np.arange(n, 0, -1, dtype=np.float64)  # n - d
+    suffix_sums = np.cumsum(latency[::-1])[::-1]
+    suffix_squares = np.cumsum((latency ** 2)[::-1])[::-1]
+    mser = (suffix_squares - suffix_sums ** 2 / remaining) / remaining ** 2
+    mser_windows = int(np.argmin(mser[:int(STEADY_STATE_MAX_WARMUP_FRACTION * n) + 1]))
+    if not _is_warmup_transient(latency, mser_windows):
+        mser_windows = 0
+    
+    cutoff_windows = max(ramp_windows or 0, mser_windows)
+    ramp_end = ramp_windows * window_seconds if ramp_windows is not None else None
+    return cutoff_windows * window_seconds, ramp_end, mser_windows * window_seconds
+
+
+def drop_warmup(loaded: tuple, cutoff: float, spill: SpillStore = None) -> tuple:
+    """
+    Drop the responses and errors before cutoff seconds from the start of a
+    loaded file (the tuple of parse_log_file) and make the times relative to
+    the cut-off. Spilled columns are filtered chunk by chunk into new columns.
+    """
+    response_times, error_stats, response_timestamps, error_timeline, start_time, response_users = loaded
+    kept_times, kept_timestamps, kept_users = {}, {}, {}
+    for request_type, times in response_times.items():
+        columns = [times, response_timestamps.get(request_type, [])]
+        if len(columns[1]) == 0:
+            # Without timestamps (e.g. locust JSON reports), the responses cannot be cut
+            kept_times[request_type] = times
+            if request_type in response_users:
+                kept_users[request_type] = response_users[request_type]
+            continue
+        if request_type in response_users:
+            columns.append(response_users[request_type])
+        typecodes = ['d', 'd', 'I'][:len(columns)]
+        parts = [[] for _ in columns]
+        writers = [spill.writer(typecode) for typecode in typecodes] if spill is not None else None
+        for chunks in iter_aligned_chunks(*columns):
+            keep = chunks[1] >= cutoff
+            kept_chunks = [chunk[keep] for chunk in chunks]
+            kept_chunks[1] = kept_chunks[1] - cutoff
+            for i, chunk in enumerate(kept_chunks):
+                if writers is not None:
+                    writers[i].extend(chunk)
+                else:
+                    parts[i].append(chunk)
+        if writers is not None:
+            kept = [writer.finish() for writer in writers]
+        else:
+            kept = [np.concatenate(column_parts + [np.empty(0, dtype=typecode)])
+                    for column_parts, typecode in zip(parts, typecodes)]
+            kept[0], kept[1] = kept[0].tolist(), kept[1].tolist()
+        kept_times[request_type] = kept[0]
+        kept_timestamps[request_type] = kept[1]
+        if len(kept) > 2:
+            kept_users[request_type] = kept[2]
+    
+    keep = error_timeline.times >= cutoff
+    dropped = np.bincount(error_timeline.categories[~keep], minlength=len(ERROR_CATEGORIES))
+    for code, count in enumerate(dropped):
+        setattr(error_stats, ERROR_CATEGORIES[code], getattr(error_stats, ERROR_CATEGORIES[code]) - int(count))
+    error_timeline = ErrorTimeline(times=error_timeline.times[keep] - cutoff,
+                                   categories=error_timeline.categories[keep], users=error_timeline.users[keep])
+    start_time = start_time + cutoff if start_time is not None else None
+    return kept_times, error_stats, kept_timestamps, error_timeline, start_time, kept_users
+
+
+def parse_log_file(file_path: Path, spill: SpillStore = None, warmup_seconds: float = None) -> Tuple[Dict[str, List[float]], ErrorStats, Dict[str, List[float]], ErrorTimeline, float, Dict[str, np.ndarray]]:
     """
     Parse the locust log file to extract response times and categorized error counts.
     
+    See parse_log_lines for the warm-up phase and the spilling of the records.
+    
     Returns:
         Tuple of (request_types_with_response_times, error_statistics, 
-                 response_timestamps, error_timestamps, start_time)
+                 response_timestamps, error_timeline, start_time, response_users)
     """
-    response_times = defaultdict(list)
-    response_timestamps = defaultdict(list)
-    error_timestamps = []
-    error_stats = ErrorStats()
+    return parse_log_files([file_path], spill, warmup_seconds)
+
+
+def parse_log_files(file_paths: List[Path], spill: SpillStore = None, warmup_seconds: float = None) -> Tuple[Dict[str, List[float]], ErrorStats, Dict[str, List[float]], ErrorTimeline, float, Dict[str, np.ndarray]]:
+    """
+    Parse the logs of the workers of one distributed locust run as a single run.
+    
+    The logs are merged by timestamp while reading (see merge_worker_logs), so
+    all workers share one start time and one warm-up boundary.
+    
+    Returns:
+        Same tuple as parse_log_file
+    """
+    source_name = file_paths[0].name if len(file_paths) == 1 else f"{file_paths[0].name} (+{len(file_paths) - 1} workers)"
+    try:
+        with ExitStack() as stack:
+            files = [stack.enter_context(open(file_path, 'r', encoding='utf-8')) for file_path in file_paths]
+            lines = files[0] if len(files) == 1 else merge_worker_logs(files)
+            return parse_log_lines(lines, source_name, spill, warmup_seconds, warmup_markers=len(files))
+    except FileNotFoundError as e:
+        typer.echo(f"Error: File '{e.filename}' not found.", err=True)
+        raise typer.Exit(1)
+    except typer.Exit:
+        raise
+    except Exception as e:
+        typer.echo(f"Error reading file: {e}", err=True)
+        raise typer.Exit(1)
+
+
+def merge_worker_logs(files: list) -> Iterator[str]:
+    """
+    K-way merge of the lines of several log files by timestamp.
+    
+    heapq.merge holds one line per file, so the memory does not grow with the
+    logs. The timestamps are compared as strings (their format sorts like the
+    time); lines without a timestamp stay behind the preceding line of their file.
+    """
+    def timestamped_lines(index: int, file) -> Iterator[Tuple[str, int, str]]:
+        timestamp = ''
+        for line in file:
+            match = LOG_TIMESTAMP_PATTERN.search(line)
+            if match:
+                timestamp = match.group(1)
+            yield timestamp, index, line
+    
+    for _, _, line in heapq.merge(*(timestamped_lines(index, file) for index, file in enumerate(files))):
+        yield line
+
+
+def parse_log_lines(lines, source_name: str, spill: SpillStore = None, warmup_seconds: float = None,
+                    warmup_markers: int = 1) -> Tuple[Dict[str, List[float]], ErrorStats, Dict[str, List[float]], ErrorTimeline, float, Dict[str, np.ndarray]]:
+    """
+    Parse the lines of a locust log (or of merged worker logs) in one pass.
+    
+    With a SpillStore, the response times, timestamps and user ids are written
+    to disk in chunks while parsing and returned as SpilledColumns.
+    
+    Everything before the warm-up marker is dropped; with warmup_markers > 1
+    (merged worker logs), everything before the last of the workers' markers.
+    Without a marker, the end of the warm-up phase is detected from the data
+    (see detect_steady_state); warmup_seconds sets the cut-off (seconds after
+    the first log line) instead.
+    
+    Returns:
+        Same tuple as parse_log_file
+    """
+    new_column = list if spill is None else spill.writer
+    category_codes = {category: code for code, category in enumerate(ERROR_CATEGORIES)}
+    
+    def new_records():
+        # User ids of the responses (0 if the line has none) are kept as uint32.
+        # Errors are collected in typed arrays: time (float64), category code (uint8), user id (uint32)
+        return (defaultdict(new_column), defaultdict(new_column),
+                defaultdict(lambda: array.array('I') if spill is None else spill.writer('I')),
+                array.array('d'), array.array('B'), array.array('I'), ErrorStats())
+    
+    (response_times, response_timestamps, response_users,
+     error_times, error_categories, error_users, error_stats) = new_records()
     start_time = None
     
-    # Pattern to match response time lines in INFO logs: (METHOD endpoint) Response time X ms
-    response_pattern = re.compile(r'/INFO/root:\s+\(([A-Z]+\s+\w+)\)\s+Response\s+time\s+(\d+)\s+ms')
+    # Pattern to match response time lines in INFO logs: [userN: ](METHOD endpoint) Response time X ms
+    # The userN: prefix has to be written by the locustfile (the error lines already carry it);
+    # without it the responses get user 0 and only errors are attributed to users
+    response_pattern = re.compile(r'/INFO/root:\s+(?:user(\d+):\s+)?\(([A-Z]+\s+\w+)\)\s+Response\s+time\s+(\d+)\s+ms')
     
-    # Pattern to match error lines and capture the error message
-    error_pattern = re.compile(r'ERROR/root: user\d+: (.*)$')
+    # Pattern to match error lines and capture the user id and the error message
+    error_pattern = re.compile(r'ERROR/root: user(\d+): (.*)$')
     
     # Pattern to extract timestamp from log line
-    timestamp_pattern = re.compile(r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3})\]')
+    timestamp_pattern = LOG_TIMESTAMP_PATTERN
    
     warmup_pattern = re.compile(r'Warm-Up finished.*Regular load profile starts', re.IGNORECASE)
-    warmup_finished = False
+    # With an explicit cut-off, the marker is ignored
+    warmup_finished = warmup_seconds is not None
+    warmup_markers_seen = 0
     
     def parse_timestamp(timestamp_str: str) -> float:
         """Parse timestamp string to seconds since epoch."""
@@ -174,139 +870,2137 @@ def parse_log_file(file_path: Path) -> Tuple[Dict[str, List[float]], ErrorStats,
         except ValueError:
             return None
     
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            for line_num, line in enumerate(file, 1):
-                if not warmup_finished:
-                    if warmup_pattern.search(line):
-                        warmup_finished = True
-                    continue
-
-                # Extract timestamp from every line
-                timestamp_match = timestamp_pattern.search(line)
-                current_timestamp = None
-                if timestamp_match:
-                    current_timestamp = parse_timestamp(timestamp_match.group(1))
-                    if start_time is None:
-                        start_time = current_timestamp
-
-                # Check for response time entries
-                response_match = response_pattern.search(line)
-                if response_match:
-                    request_type = response_match.group(1)
-                    response_time = float(response_match.group(2))
-                    response_times[request_type].append(response_time)
-                    
-                    # Store relative timestamp for scatter plot
-                    if current_timestamp and start_time:
-                        relative_time = current_timestamp - start_time
-                        response_timestamps[request_type].append(relative_time)
+    for line in lines:
+        if not warmup_finished and warmup_pattern.search(line):
+            # Everything recorded so far belongs to the warm-up phase (of all workers after the last marker)
+            warmup_markers_seen += 1
+            warmup_finished = warmup_markers_seen >= warmup_markers
+            if spill is not None:
+                for writer in [*response_times.values(), *response_timestamps.values(), *response_users.values()]:
+                    writer.discard()
+            (response_times, response_timestamps, response_users,
+             error_times, error_categories, error_users, error_stats) = new_records()
+            start_time = None
+            continue
+
+        # Extract timestamp from every line
+        timestamp_match = timestamp_pattern.search(line)
+        current_timestamp = None
+        if timestamp_match:
+            current_timestamp = parse_timestamp(timestamp_match.group(1))
+            if start_time is None:
+                start_time = current_timestamp
+
+        # Check for response time entries
+        response_match = response_pattern.search(line)
+        if response_match:
+            request_type = response_match.group(2)
+            response_time = float(response_match.group(3))
+            response_times[request_type].append(response_time)
+            response_users[request_type].append(int(response_match.group(1) or 0))
+            
+            # Store relative timestamp for scatter plot
+            if current_timestamp and start_time:
+                relative_time = current_timestamp - start_time
+                response_timestamps[request_type].append(relative_time)
+        
+        # Check for error entries
+        else:
+            error_match = error_pattern.search(line)
+            if error_match:
+                error_message = error_match.group(2).strip()
                 
-                # Check for error entries
-                else:
-                    error_match = error_pattern.search(line)
-                    if error_match:
-                        error_message = error_match.group(1).strip()
-                        
-                        # Store error timestamp
-                        if current_timestamp and start_time:
-                            relative_time = current_timestamp - start_time
-                            error_timestamps.append(relative_time)
-                        
-                        # Categorize the error based on the message
-                        error_type = "Unknown"
-                        
-                        if error_message == "":
-                            error_stats.unknown_errors += 1
-                            error_type = "Unknown/Empty"
-                        elif "timed out" in error_message.lower():
-                            error_stats.timeout_errors += 1
-                            error_type = "Timeout"
-                        elif any(conn_keyword in error_message.lower() for conn_keyword in 
-                                ["connection", "connect", "refused", "reset", "closed"]):
-                            error_stats.connection_errors += 1
-                            error_type = "Connection"
-                        # HTTP Status Code categorization
-                        elif "status 500" in error_message or "status: 500" in error_message:
-                            error_stats.http_500_errors += 1
-                            error_type = "HTTP 500"
-                        elif "status 502" in error_message or "status: 502" in error_message:
-                            error_stats.http_502_errors += 1
-                            error_type = "HTTP 502"
-                        elif "status 503" in error_message or "status: 503" in error_message:
-                            error_stats.http_503_errors += 1
-                            error_type = "HTTP 503"
-                        # Functional error categorization
-                        elif "login" in error_message.lower() and "username" in error_message.lower():
-                            error_stats.login_errors += 1
-                            error_type = "Login"
-                        elif "log out" in error_message.lower() or "logout" in error_message.lower():
-                            error_stats.logout_errors += 1
-                            error_type = "Logout"
-                        elif "profile" in error_message.lower():
-                            error_stats.profile_errors += 1
-                            error_type = "Profile"
-                        elif "product" in error_message.lower() or "cart" in error_message.lower():
-                            error_stats.product_errors += 1
-                            error_type = "Product/Cart"
-                        elif "category" in error_message.lower():
-                            error_stats.category_errors += 1
-                            error_type = "Category"
-                        elif "load" in error_message.lower() and ("page" in error_message.lower() or "landing" in error_message.lower()):
-                            error_stats.page_load_errors += 1
-                            error_type = "Page Load"
-                        else:
-                            error_stats.other_errors += 1
-                            error_type = "Other"
-                        
-                        # typer.echo(f"Found {error_type} error at line {line_num}: {line.strip()}")
-    
-    except FileNotFoundError:
-        typer.echo(f"Error: File '{file_path}' not found.", err=True)
-        raise typer.Exit(1)
-    except Exception as e:
-        typer.echo(f"Error reading file: {e}", err=True)
+                # Categorize the error based on the message
+                error_category = categorize_error(error_message)
+                setattr(error_stats, error_category, getattr(error_stats, error_category) + 1)
+                
+                # Store error time, category and user
+                if current_timestamp and start_time:
+                    error_times.append(current_timestamp - start_time)
+                    error_categories.append(category_codes[error_category])
+                    error_users.append(int(error_match.group(1)))
+    
+    error_timeline = ErrorTimeline(
+        times=np.frombuffer(error_times, dtype=np.float64),
+        categories=np.frombuffer(error_categories, dtype=np.uint8),
+        users=np.frombuffer(error_users, dtype=np.uint32),
+    )
+    
+    if spill is not None:
+        response_times = {request_type: writer.finish() for request_type, writer in response_times.items()}
+        response_timestamps = {request_type: writer.finish() for request_type, writer in response_timestamps.items()}
+        response_users = {request_type: writer.finish() for request_type, writer in response_users.items()}
+    else:
+        response_users = {request_type: np.frombuffer(users, dtype=np.uint32)
+                          for request_type, users in response_users.items()}
+    loaded = dict(response_times), error_stats, dict(response_timestamps), error_timeline, start_time, response_users
+    
+    if warmup_seconds is not None:
+        typer.echo(f"Warm-up cut-off of {source_name}: {warmup_seconds:g}s (--warmup-seconds)")
+        return drop_warmup(loaded, warmup_seconds, spill)
+    if warmup_markers_seen == 0 and start_time is not None:
+        cutoff, ramp_end, mser_point = detect_steady_state(loaded[0], loaded[2])
+        if ramp_end is None:
+            typer.echo(f"Warning: The throughput of {source_name} does not settle within the first "
+                       f"{STEADY_STATE_MAX_WARMUP_FRACTION:.0%} of the run; no throughput ramp is cut", err=True)
+            throughput = "no throughput ramp found"
+        else:
+            throughput = f"throughput stable after {ramp_end:g}s"
+        latency = f"MSER truncation at {mser_point:g}s" if mser_point > 0 else "no latency warm-up transient"
+        typer.echo(f"No warm-up marker in {source_name}: steady state from {cutoff:g}s "
+                   f"({throughput}, {latency}); "
+                   f"use --warmup-seconds to override")
+        if cutoff > 0:
+            return drop_warmup(loaded, cutoff, spill)
+    return loaded
+
+
+def _read_csv(file_path: Path, **kwargs) -> pd.DataFrame:
+    """Read a CSV file with the pyarrow engine if it is installed, else with the pandas C engine."""
+    try:
+        import pyarrow  # noqa: F401
+        engine = 'pyarrow'
+    except ImportError:
+        engine = 'c'
+    return pd.read_csv(file_path, engine=engine, **kwargs)
+
+
+def _epoch_seconds(timestamps: pd.Series) -> np.ndarray:
+    """
+    Convert a timestamp column (epoch seconds or date strings) to epoch seconds.
+    
+    Date strings without a time zone are local time, like the timestamps in the text log.
+    """
+    if pd.api.types.is_numeric_dtype(timestamps):
+        return timestamps.to_numpy(dtype=np.float64)
+    timestamps = pd.to_datetime(timestamps)
+    if timestamps.dt.tz is None:
+        # Ambiguous times (DST end) are taken as daylight saving time like datetime.timestamp() does
+        timestamps = timestamps.dt.tz_localize(tzlocal(), ambiguous=np.ones(len(timestamps), dtype=bool),
+                                               nonexistent='shift_forward')
+    timestamps = timestamps.dt.tz_convert('UTC').dt.tz_localize(None)
+    return ((timestamps - pd.Timestamp('1970-01-01')) / pd.Timedelta('1s')).to_numpy(dtype=np.float64)
+
+
+def _error_timeline_from_arrays(times: np.ndarray, categories: np.ndarray, users: np.ndarray) -> ErrorTimeline:
+    order = np.argsort(times, kind='stable')
+    return ErrorTimeline(times=np.asarray(times, dtype=np.float64)[order],
+                         categories=np.asarray(categories, dtype=np.uint8)[order],
+                         users=np.asarray(users, dtype=np.uint32)[order])
+
+
+def _group_by_request_type(request_types: np.ndarray, *columns: np.ndarray) -> List[Dict[str, List[float]]]:
+    """Split value arrays into per request type lists (keeping the order of the rows)."""
+    names, codes = np.unique(request_types, return_inverse=True)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+    return [{str(name): column[order[bounds[i]:bounds[i + 1]]].tolist() for i, name in enumerate(names)}
+            for column in columns]
+
+
+def load_request_csv(file_path: Path) -> Tuple[Dict[str, List[float]], ErrorStats, Dict[str, List[float]], ErrorTimeline, float, Dict[str, np.ndarray]]:
+    """
+    Load a CSV file with one row per request (e.g. written by a locust request event hook).
+    
+    Recognized columns (case-insensitive):
+        timestamp/time/start_time: epoch seconds or a date string
+        request_type, or request_method/method and name
+        response_time: milliseconds
+        exception/error (optional): error message, rows with a message count as errors
+        user/user_id (optional): locust user id
+    
+    The file has no warm-up marker, so all rows are used.
+    
+    Returns:
+        Same tuple as parse_log_file
+    """
+    df = _read_csv(file_path)
+    columns = {name.strip().lower(): name for name in df.columns}
+    
+    def column(*candidates):
+        for candidate in candidates:
+            if candidate in columns:
+                return df[columns[candidate]]
+        return None
+    
+    timestamps = column('timestamp', 'time', 'start_time')
+    response_time = column('response_time', 'response_time_ms')
+    if timestamps is None or response_time is None:
+        typer.echo(f"Error: '{file_path}' needs a timestamp and a response_time column.", err=True)
         raise typer.Exit(1)
     
-    return dict(response_times), error_stats, dict(response_timestamps), error_timestamps, start_time
+    timestamps = _epoch_seconds(timestamps)
+    start_time = float(timestamps.min()) if len(timestamps) else None
+    relative_times = timestamps - start_time if start_time is not None else timestamps
+    
+    request_type = column('request_type')
+    if request_type is None:
+        method = column('request_method', 'method')
+        name = column('name')
+        if name is None:
+            typer.echo(f"Error: '{file_path}' needs a request_type column or method and name columns.", err=True)
+            raise typer.Exit(1)
+        request_type = name.astype(str) if method is None else method.astype(str) + " " + name.astype(str)
+    request_types = request_type.astype(str).to_numpy()
+    response_times_ms = response_time.to_numpy(dtype=np.float64)
+    
+    users = column('user', 'user_id')
+    users = np.zeros(len(df), dtype=np.uint32) if users is None else users.fillna(0).to_numpy(dtype=np.uint32)
+    
+    error_stats = ErrorStats()
+    error_timeline = ErrorTimeline.empty()
+    exception = column('exception', 'error')
+    is_error = np.zeros(len(df), dtype=bool)
+    if exception is not None:
+        messages = exception.fillna("").astype(str).str.strip()
+        is_error = (messages != "").to_numpy()
+        if is_error.any():
+            # Categorize every distinct message only once
+            unique_messages, message_codes = np.unique(messages[is_error].to_numpy(), return_inverse=True)
+            category_codes = {category: code for code, category in enumerate(ERROR_CATEGORIES)}
+            unique_categories = np.array([category_codes[categorize_error(message)] for message in unique_messages],
+                                         dtype=np.uint8)
+            categories = unique_categories[message_codes]
+            for code, count in enumerate(np.bincount(categories, minlength=len(ERROR_CATEGORIES))):
+                setattr(error_stats, ERROR_CATEGORIES[code], int(count))
+            error_timeline = _error_timeline_from_arrays(relative_times[is_error], categories, users[is_error])
+    
+    # Failed requests are counted as errors like in the text log, not as response times
+    ok = ~is_error & ~np.isnan(response_times_ms)
+    response_times, response_timestamps, response_users = _group_by_request_type(
+        request_types[ok], response_times_ms[ok], relative_times[ok], users[ok])
+    response_users = {request_type: np.asarray(ids, dtype=np.uint32) for request_type, ids in response_users.items()}
+    return response_times, error_stats, response_timestamps, error_timeline, start_time, response_users
 
 
-def calculate_multi_file_statistics(file_data_list: List[FileData]) -> pd.DataFrame:
-    """Calculate statistics for multiple files, keeping file information."""
-    all_stats = []
+def load_stats_history_csv(file_path: Path) -> Tuple[Dict[str, List[float]], ErrorStats, Dict[str, List[float]], ErrorTimeline, float, Dict[str, np.ndarray]]:
+    """
+    Load a locust --csv stats_history file.
     
-    for file_data in file_data_list:
-        for request_type, times in file_data.response_times.items():
-            if times:  # Only process if there are response times
-                sorted_times = sorted(times)
-                n = len(sorted_times)
-                
-                # Calculate median
-                if n % 2 == 0:
-                    median_time = (sorted_times[n//2 - 1] + sorted_times[n//2]) / 2
-                else:
-                    median_time = sorted_times[n//2]
-                
-                all_stats.append({
-                    'Request Type': request_type,
-                    'File': file_data.file_label,
-                    'Average Response Time (ms)': sum(times) / len(times),
-                    'Median Response Time (ms)': median_time,
-                    'Min Response Time (ms)': min(times),
-                    'Max Response Time (ms)': max(times),
-                    'Count': len(times)
-                })
+    The file only contains cumulative counts and response time percentiles per
+    interval, so the response times are reconstructed: the new requests of an
+    interval are spread over the percentiles reported for that interval. The
+    result is an approximation, per-request logs should be preferred.
+    Failures are recorded as 'other_errors' at the time of the interval, since
+    the file contains no error messages.
     
-    return pd.DataFrame(all_stats).sort_values(['Request Type', 'File'])
+    Returns:
+        Same tuple as parse_log_file
+    """
+    df = _read_csv(file_path, na_values=['N/A'])
+    # Use the per request type rows if the history was written with --csv-full-history
+    per_type = df[df['Name'] != 'Aggregated']
+    if not per_type.empty:
+        df = per_type
+        request_type_names = (df['Type'].fillna('').astype(str) + " " + df['Name'].astype(str)).str.strip()
+    else:
+        request_type_names = df['Name'].astype(str)
+    
+    percentile_columns = [name for name in df.columns if re.fullmatch(r'\d+(\.\d+)?%', name)]
+    quantiles = np.array([float(name[:-1]) / 100 for name in percentile_columns])
+    
+    start_time = float(df['Timestamp'].min()) if len(df) else None
+    response_times = defaultdict(list)
+    response_timestamps = defaultdict(list)
+    error_times = []
+    error_stats = ErrorStats()
+    
+    for request_type, group in df.assign(_request_type=request_type_names).groupby('_request_type', sort=True):
+        group = group.sort_values('Timestamp')
+        relative_times = group['Timestamp'].to_numpy(dtype=np.float64) - start_time
+        new_requests = np.diff(group['Total Request Count'].to_numpy(dtype=np.int64), prepend=0).clip(min=0)
+        new_failures = np.diff(group['Total Failure Count'].to_numpy(dtype=np.int64), prepend=0).clip(min=0)
+        percentiles = group[percentile_columns].to_numpy(dtype=np.float64)
+        
+        for relative_time, requests, failures, values in zip(relative_times, new_requests, new_failures, percentiles):
+            valid = ~np.isnan(values)
+            successes = requests - failures
+            if successes > 0 and valid.any():
+                sample_quantiles = (np.arange(successes) + 0.5) / successes
+                samples = np.interp(sample_quantiles, quantiles[valid], values[valid])
+                response_times[request_type].extend(samples.tolist())
+                response_timestamps[request_type].extend([relative_time] * successes)
+            if failures > 0:
+                error_times.extend([relative_time] * failures)
+    
+    error_stats.other_errors = len(error_times)
+    error_timeline = _error_timeline_from_arrays(
+        np.array(error_times, dtype=np.float64),
+        np.full(len(error_times), ERROR_CATEGORIES.index('other_errors'), dtype=np.uint8),
+        np.zeros(len(error_times), dtype=np.uint32))
+    return dict(response_times), error_stats, dict(response_timestamps), error_timeline, start_time, {}
 
 
-def create_multi_file_bar_chart(file_data_list: List[FileData], output_dir: Path, 
-                                omit_request_count_per_bar_labels: bool = False,
-                                simple_title: bool = False,
-                                publication_ready: bool = False,
-                                export_svg: bool = False,
-                                metric_type: str = "average"):
-    """Create and save bar charts for multiple files using textures to distinguish files."""
+def load_locust_json(file_path: Path) -> Tuple[Dict[str, List[float]], ErrorStats, Dict[str, List[float]], ErrorTimeline, float, Dict[str, np.ndarray]]:
+    """
+    Load the statistics printed by locust --json.
+    
+    Every request type contains a histogram of (rounded) response times, which
+    is expanded back into the individual response times. The histogram has no
+    timestamps, so response_timestamps stay empty and the scatter plot and
+    heatmap skip these files. Failures per second are recorded as
+    'other_errors' at their second, since the output contains no messages.
+    
+    Returns:
+        Same tuple as parse_log_file
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    
+    start_time = min((entry['start_time'] for entry in entries if entry.get('start_time')), default=None)
+    response_times = {}
+    error_times = []
+    for entry in entries:
+        request_type = f"{entry.get('method') or ''} {entry['name']}".strip()
+        histogram = entry.get('response_times', {})
+        values = np.fromiter((float(value) for value in histogram), dtype=np.float64, count=len(histogram))
+        counts = np.fromiter(histogram.values(), dtype=np.int64, count=len(histogram))
+        order = np.argsort(values)
+        response_times[request_type] = np.repeat(values[order], counts[order]).tolist()
+        
+        for second, failures in entry.get('num_fail_per_sec', {}).items():
+            error_times.extend([float(second) - (start_time or 0.0)] * int(failures))
+    
+    error_stats = ErrorStats(other_errors=sum(entry.get('num_failures', 0) for entry in entries))
+    error_timeline = _error_timeline_from_arrays(
+        np.array(error_times, dtype=np.float64),
+        np.full(len(error_times), ERROR_CATEGORIES.index('other_errors'), dtype=np.uint8),
+        np.zeros(len(error_times), dtype=np.uint32))
+    return response_times, error_stats, {}, error_timeline, start_time, {}
+
+
+# Input formats that can be analyzed (name -> loader); all loaders return the tuple of parse_log_file
+LOG_LOADERS = {
+    'locust-log': parse_log_file,
+    'request-csv': load_request_csv,
+    'stats-history': load_stats_history_csv,
+    'locust-json': load_locust_json,
+}
+
+
+def detect_log_format(file_path: Path) -> str:
+    """Detect the input format of a file from its extension and its first line."""
+    suffix = file_path.suffix.lower()
+    if suffix == '.json':
+        return 'locust-json'
+    if suffix != '.csv':
+        return 'locust-log'
+    
+    with open(file_path, 'r', encoding='utf-8') as f:
+        header = [name.strip().lower() for name in f.readline().split(',')]
+    if 'total request count' in header:
+        return 'stats-history'
+    if 'response_time' in header or 'response_time_ms' in header:
+        return 'request-csv'
+    typer.echo(f"Error: Unknown CSV format of '{file_path}'. Supported are per-request CSV files "
+               f"and locust stats_history files (the *_stats.csv and *_failures.csv files only "
+               f"contain totals).", err=True)
+    raise typer.Exit(1)
+
+
+def load_log_file(file_path: Path, input_format: str = 'auto', spill: SpillStore = None,
+                  warmup_seconds: float = None) -> Tuple[Dict[str, List[float]], ErrorStats, Dict[str, List[float]], ErrorTimeline, float, Dict[str, np.ndarray]]:
+    """
+    Load a file with the loader of its (detected) input format.
+    
+    warmup_seconds drops the first seconds of the file (see parse_log_file
+    for the handling of the warm-up phase of locust logs).
+    """
+    if input_format == 'auto':
+        input_format = detect_log_format(file_path)
+    if input_format == 'locust-log':
+        return parse_log_file(file_path, spill, warmup_seconds)
+    loaded = LOG_LOADERS[input_format](file_path)
+    if warmup_seconds is not None:
+        typer.echo(f"Warm-up cut-off of {file_path.name}: {warmup_seconds:g}s (--warmup-seconds)")
+        loaded = drop_warmup(loaded, warmup_seconds)
+    if spill is None:
+        return loaded
+    # The CSV and JSON loaders read the whole file at once; their columns are spilled afterwards
+    response_times, error_stats, response_timestamps, error_timeline, start_time, response_users = loaded
+    return (spill.spill(response_times), error_stats, spill.spill(response_timestamps), error_timeline, start_time,
+            spill.spill(response_users, 'I'))
+
+
+def build_run_summary(file_data: FileData) -> RunSummary:
+    """Reduce the parsed data of one log file to a mergeable RunSummary."""
+    histograms = {request_type: response_time_histogram(times)
+                  for request_type, times in file_data.response_times.items() if len(times) > 0}
+    
+    duration = 0.0
+    if file_data.response_timestamps:
+        duration = max((column_max(timestamps) for timestamps in file_data.response_timestamps.values()
+                        if len(timestamps) > 0), default=0.0)
+    
+    log_file = file_data.file_path
+    return RunSummary(
+        file_label=file_data.file_label,
+        experiment_type=log_file.parent.parent.name or log_file.stem,
+        run_name=f"{log_file.parent.name}/{log_file.stem}",
+        source_file=str(log_file),
+        start_time=file_data.start_time,
+        duration=duration,
+        histograms=histograms,
+        error_stats=file_data.error_stats,
+    )
+
+
+def save_run_summary(summary: RunSummary, summary_dir: Path) -> Path:
+    """Write a RunSummary as JSON to summary_dir and return the path of the file."""
+    summary_dir.mkdir(parents=True, exist_ok=True)
+    safe_name = re.sub(r'[^\w.-]+', '_', f"{summary.experiment_type}__{summary.run_name}")
+    summary_file = summary_dir / f"{safe_name}.summary.json"
+    with open(summary_file, 'w', encoding='utf-8') as f:
+        json.dump(summary.to_dict(), f, separators=(',', ':'))
+    return summary_file
+
+
+def load_run_summary(summary_file: Path) -> RunSummary:
+    with open(summary_file, 'r', encoding='utf-8') as f:
+        return RunSummary.from_dict(json.load(f))
+
+
+def aggregate_run_summaries(summaries: List[RunSummary]) -> pd.DataFrame:
+    """
+    Group repeated runs of the same experiment and compute pooled and between-run statistics.
+    
+    Pooled percentiles come from the merged histograms of all repeats. The
+    spread columns describe how much the per-run values differ between repeats.
+    
+    Returns:
+        DataFrame with one row per (experiment, profile, request type)
+    """
+    groups = defaultdict(list)
+    for summary in summaries:
+        groups[summary.group_key].append(summary)
+    
+    rows = []
+    for (experiment_type, profile), runs in sorted(groups.items()):
+        request_types = sorted(set().union(*(run.histograms.keys() for run in runs)))
+        for request_type in request_types:
+            run_histograms = [run.histograms[request_type] for run in runs if request_type in run.histograms]
+            pooled = run_histograms[0]
+            for histogram in run_histograms[1:]:
+                pooled = pooled.merge(histogram)
+            
+            pooled_p50, pooled_p95, pooled_p99 = pooled.percentile([50, 95, 99])
+            run_p95 = np.array([histogram.percentile(95) for histogram in run_histograms])
+            run_means = np.array([histogram.mean for histogram in run_histograms])
+            
+            rows.append({
+                'Experiment': experiment_type,
+                'Profile': profile,
+                'Request Type': request_type,
+                'Runs': len(run_histograms),
+                'Count': pooled.count,
+                'Average Response Time (ms)': pooled.mean,
+                'P50 Response Time (ms)': pooled_p50,
+                'P95 Response Time (ms)': pooled_p95,
+                'P99 Response Time (ms)': pooled_p99,
+                'Run P95 Min (ms)': run_p95.min(),
+                'Run P95 Max (ms)': run_p95.max(),
+                'Run P95 Std (ms)': run_p95.std(ddof=1) if len(run_p95) > 1 else 0.0,
+                'Run Average Std (ms)': run_means.std(ddof=1) if len(run_means) > 1 else 0.0,
+            })
+    
+    return pd.DataFrame(rows)
+
+
+def print_aggregate_summary(summaries: List[RunSummary], aggregate_df: pd.DataFrame):
+    """Print pooled statistics and error totals per group of repeated runs."""
+    groups = defaultdict(list)
+    for summary in summaries:
+        groups[summary.group_key].append(summary)
+    
+    typer.echo("\n" + "="*80)
+    typer.echo("AGGREGATED RUN SUMMARY")
+    typer.echo("="*80)
+    
+    for (experiment_type, profile), runs in sorted(groups.items()):
+        typer.echo(f"\n{experiment_type} [{profile}] - {len(runs)} run(s)")
+        typer.echo("-" * 60)
+        for run in runs:
+            typer.echo(f"  - {run.run_name}")
+        
+        group_df = aggregate_df[(aggregate_df['Experiment'] == experiment_type) &
+                                (aggregate_df['Profile'] == profile)]
+        columns = ['Request Type', 'Runs', 'Count', 'Average Response Time (ms)',
+                   'P50 Response Time (ms)', 'P95 Response Time (ms)', 'P99 Response Time (ms)',
+                   'Run P95 Min (ms)', 'Run P95 Max (ms)', 'Run P95 Std (ms)']
+        typer.echo(group_df[columns].to_string(index=False, float_format=lambda v: f"{v:.1f}"))
+        
+        error_stats = runs[0].error_stats
+        for run in runs[1:]:
+            error_stats = error_stats.merge(run.error_stats)
+        total_requests = int(group_df['Count'].sum())
+        typer.echo(f"Total Requests: {total_requests:,}")
+        typer.echo(f"Total Errors: {error_stats.total_errors}")
+        per_run_errors = [run.error_stats.total_errors for run in runs]
+        typer.echo(f"  Errors per run: min {min(per_run_errors)}, max {max(per_run_errors)}")
+
+
+# Upper bounds of the exported latency histogram buckets in milliseconds (+Inf is added)
+OPENMETRICS_BUCKETS_MS = [5, 10, 25, 50, 75, 100, 150, 200, 300, 500, 750, 1000, 2000, 5000, 10000]
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# Exported metric families: name -> (type, unit, help)
+OPENMETRICS_FAMILIES = {
+    'locust_response_time_seconds': ('histogram', 'seconds', 'Response times recorded by locust.'),
+    'locust_requests': ('counter', None, 'Responses recorded by locust.'),
+    'locust_throughput_requests_per_second': ('gauge', None, 'Average responses per second over the run.'),
+    'locust_errors': ('counter', None, 'Errors recorded by locust per error category.'),
+    'locust_run_duration_seconds': ('gauge', 'seconds', 'Time between the start and the last recorded response.'),
+    'locust_run_start_timestamp_seconds': ('gauge', 'seconds', 'Start of the run (after the warm-up).'),
+}
+
+
+def _openmetrics_labels(**labels) -> str:
+    escaped = []
+    for name, value in labels.items():
+        value = str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+        escaped.append(f'{name}="{value}"')
+    return '{' + ','.join(escaped) + '}'
+
+
+def format_openmetrics(summaries: List[RunSummary], buckets_ms: List[float] = None,
+                       openmetrics: bool = True) -> str:
+    """
+    Format run summaries as OpenMetrics text (see OPENMETRICS_FAMILIES).
+    
+    Every sample has the labels experiment and run; latency, request and
+    throughput samples also have request_type, error samples have category.
+    With openmetrics=False the Prometheus text format 0.0.4 is written instead,
+    which the node-exporter textfile collector expects: counter families are
+    named after their _total samples and there are no UNIT and EOF lines.
+    """
+    bounds = np.asarray(buckets_ms or OPENMETRICS_BUCKETS_MS, dtype=np.float64)
+    samples = {name: [] for name in OPENMETRICS_FAMILIES}
+    
+    for summary in summaries:
+        run_labels = {'experiment': summary.experiment_type, 'run': summary.run_name}
+        for request_type, histogram in sorted(summary.histograms.items()):
+            labels = {**run_labels, 'request_type': request_type}
+            # Cumulative number of samples <= each bucket bound
+            cumulative = np.concatenate([[0], np.cumsum(histogram.counts)])
+            bucket_counts = cumulative[np.searchsorted(histogram.values, bounds, side='right')]
+            lines = samples['locust_response_time_seconds']
+            for bound, bucket_count in zip(bounds, bucket_counts):
+                lines.append(f"locust_response_time_seconds_bucket"
+                             f"{_openmetrics_labels(**labels, le=f'{bound / 1000:g}')} {bucket_count}")
+            lines.append(f"locust_response_time_seconds_bucket{_openmetrics_labels(**labels, le='+Inf')} {histogram.count}")
+            lines.append(f"locust_response_time_seconds_count{_openmetrics_labels(**labels)} {histogram.count}")
+            lines.append(f"locust_response_time_seconds_sum{_openmetrics_labels(**labels)} {float(histogram.total / 1000)!r}")
+            
+            samples['locust_requests'].append(f"locust_requests_total{_openmetrics_labels(**labels)} {histogram.count}")
+            if summary.duration > 0:
+                samples['locust_throughput_requests_per_second'].append(
+                    f"locust_throughput_requests_per_second{_openmetrics_labels(**labels)} "
+                    f"{float(histogram.count / summary.duration)!r}")
+        
+        for category in ERROR_CATEGORIES:
+            samples['locust_errors'].append(f"locust_errors_total{_openmetrics_labels(**run_labels, category=category)} "
+                                            f"{getattr(summary.error_stats, category)}")
+        
+        samples['locust_run_duration_seconds'].append(
+            f"locust_run_duration_seconds{_openmetrics_labels(**run_labels)} {float(summary.duration)!r}")
+        if summary.start_time is not None:
+            samples['locust_run_start_timestamp_seconds'].append(
+                f"locust_run_start_timestamp_seconds{_openmetrics_labels(**run_labels)} {summary.start_time:.3f}")
+    
+    lines = []
+    for name, (metric_type, unit, help_text) in OPENMETRICS_FAMILIES.items():
+        if openmetrics:
+            lines.append(f"# TYPE {name} {metric_type}")
+            if unit:
+                lines.append(f"# UNIT {name} {unit}")
+            lines.append(f"# HELP {name} {help_text}")
+        else:
+            family = f"{name}_total" if metric_type == 'counter' else name
+            lines.append(f"# HELP {family} {help_text}")
+            lines.append(f"# TYPE {family} {metric_type}")
+        lines.extend(samples[name])
+    if openmetrics:
+        lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics_textfile(summaries: List[RunSummary], output_file: Path):
+    """Write the Prometheus text atomically, so a textfile collector never reads a partial file."""
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = output_file.with_name(output_file.name + '.tmp')
+    temp_file.write_text(format_openmetrics(summaries, openmetrics=False), encoding='utf-8')
+    temp_file.replace(output_file)
+
+
+def serve_openmetrics(summary_dirs: List[Path], host: str = '0.0.0.0', port: int = 9108):
+    """
+    Serve the run summaries in summary_dirs as OpenMetrics on /metrics.
+    
+    The directories are read again on every scrape, so runs written by
+    analyze --summary-dir appear without restarting the exporter.
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            paths = sorted(path for summary_dir in summary_dirs for path in summary_dir.glob('*.summary.json'))
+            body = format_openmetrics([load_run_summary(path) for path in paths]).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', OPENMETRICS_CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    typer.echo(f"Serving OpenMetrics of {', '.join(str(d) for d in summary_dirs)} on http://{host}:{port}/metrics")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# Deployment type directory names are "<type>" or "<type>-<tfvars name>" (see run_teastore_experiment.sh)
+DEPLOYMENT_TYPE_PATTERN = re.compile(r'^(default|(?:cpu|mem)-with(?:out)?-resources)(?:-(.+))?$')
+
+RESULTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    source_file TEXT NOT NULL UNIQUE,
+    experiment_group TEXT,
+    experiment_type TEXT NOT NULL,
+    deployment_type TEXT,
+    tfvars_name TEXT,
+    run_name TEXT NOT NULL,
+    load_profile TEXT,
+    start_time REAL,
+    duration REAL,
+    imported_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    request_type TEXT NOT NULL,
+    time REAL,
+    response_time REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stats (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    request_type TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    mean REAL, median REAL, p90 REAL, p95 REAL, p99 REAL, min REAL, max REAL,
+    PRIMARY KEY (run_id, request_type)
+);
+CREATE TABLE IF NOT EXISTS error_stats (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    category TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (run_id, category)
+);
+CREATE TABLE IF NOT EXISTS errors (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    time REAL NOT NULL,
+    category TEXT NOT NULL,
+    user_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_by_experiment ON runs (experiment_type, tfvars_name, load_profile);
+CREATE INDEX IF NOT EXISTS records_by_request_type ON records (request_type, run_id, time);
+CREATE INDEX IF NOT EXISTS records_by_time ON records (run_id, time);
+CREATE INDEX IF NOT EXISTS stats_by_request_type ON stats (request_type);
+CREATE INDEX IF NOT EXISTS errors_by_time ON errors (run_id, time);
+"""
+
+# Summary over all imported runs, one row per experiment, tfvars file, load profile and request type
+DEFAULT_RESULTS_QUERY = """
+SELECT r.experiment_type AS "Experiment",
+       COALESCE(r.tfvars_name, '') AS "Tfvars",
+       r.load_profile AS "Profile",
+       s.request_type AS "Request Type",
+       COUNT(*) AS "Runs",
+       SUM(s.count) AS "Count",
+       SUM(s.mean * s.count) / SUM(s.count) AS "Average Response Time (ms)",
+       AVG(s.median) AS "Run Median Avg (ms)",
+       AVG(s.p95) AS "Run P95 Avg (ms)",
+       MIN(s.p95) AS "Run P95 Min (ms)",
+       MAX(s.p95) AS "Run P95 Max (ms)",
+       AVG(s.p99) AS "Run P99 Avg (ms)"
+FROM stats s JOIN runs r USING (run_id)
+GROUP BY r.experiment_type, r.tfvars_name, r.load_profile, s.request_type
+ORDER BY r.experiment_type, r.tfvars_name, r.load_profile, s.request_type
+"""
+
+
+def split_deployment_type(experiment_type: str) -> Tuple[str, str]:
+    """Split an experiment directory name like 'cpu-with-resources-<tfvars>' into (deployment type, tfvars name)."""
+    match = DEPLOYMENT_TYPE_PATTERN.match(experiment_type)
+    if match is None:
+        return None, None
+    return match.group(1), match.group(2)
+
+
+def open_results_db(db_file: Path) -> 'sqlite3.Connection':
+    """Open (and create if needed) the SQLite results store."""
+    connection = sqlite3.connect(db_file)
+    connection.execute("PRAGMA foreign_keys = ON")
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.executescript(RESULTS_SCHEMA)
+    return connection
+
+
+def import_run(connection: 'sqlite3.Connection', file_data: FileData) -> int:
+    """
+    Store one parsed run (records, statistics, error statistics and error timeline).
+    
+    A run that was imported before (same source file) is replaced.
+    
+    Returns:
+        run_id of the stored run
+    """
+    summary = build_run_summary(file_data)
+    log_file = file_data.file_path
+    deployment_type, tfvars_name = split_deployment_type(summary.experiment_type)
+    source_file = str(log_file.resolve())
+    
+    connection.execute("DELETE FROM runs WHERE source_file = ?", (source_file,))
+    cursor = connection.execute(
+        "INSERT INTO runs (source_file, experiment_group, experiment_type, deployment_type, tfvars_name, "
+        "run_name, load_profile, start_time, duration, imported_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (source_file, log_file.parent.parent.parent.name or None, summary.experiment_type, deployment_type,
+         tfvars_name, summary.run_name, log_file.stem, summary.start_time, summary.duration,
+         datetime.now().timestamp()))
+    run_id = cursor.lastrowid
+    
+    for request_type, times in file_data.response_times.items():
+        timestamps = (file_data.response_timestamps or {}).get(request_type, [])
+        if len(timestamps) == len(times):
+            chunks = ((times_chunk.tolist(), timestamps_chunk.tolist())
+                      for times_chunk, timestamps_chunk in iter_paired_chunks(times, timestamps))
+        else:
+            chunks = ((times_chunk.tolist(), [None] * len(times_chunk)) for times_chunk in iter_column_chunks(times))
+        for times_chunk, timestamps_chunk in chunks:
+            connection.executemany(
+                "INSERT INTO records (run_id, request_type, time, response_time) VALUES (?, ?, ?, ?)",
+                zip([run_id] * len(times_chunk), [request_type] * len(times_chunk), timestamps_chunk, times_chunk))
+    
+    stats_rows = []
+    for request_type, histogram in summary.histograms.items():
+        median, p90, p95, p99 = histogram.percentile([50, 90, 95, 99])
+        stats_rows.append((run_id, request_type, histogram.count, histogram.mean, median, p90, p95, p99,
+                           histogram.min, histogram.max))
+    connection.executemany("INSERT INTO stats VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", stats_rows)
+    
+    connection.executemany("INSERT INTO error_stats VALUES (?, ?, ?)",
+                           [(run_id, category, getattr(file_data.error_stats, category))
+                            for category in ERROR_CATEGORIES])
+    
+    timeline = file_data.error_timeline if file_data.error_timeline is not None else ErrorTimeline.empty()
+    connection.executemany(
+        "INSERT INTO errors (run_id, time, category, user_id) VALUES (?, ?, ?, ?)",
+        zip([run_id] * len(timeline), timeline.times.tolist(),
+            [ERROR_CATEGORIES[code] for code in timeline.categories], timeline.users.tolist()))
+    return run_id
+
+
+# Base tfvars file that deploy.sh applies per deployment type (before the additional var file)
+DEPLOYMENT_TYPE_VAR_FILES = {
+    'mem-without-resources': 'memory_allocator_teastore_without_resource',
+    'mem-with-resources': 'memory_allocator_teastore_with_resource',
+    'cpu-without-resources': 'cpu_load_generator_teastore_without_resources',
+    'cpu-with-resources': 'cpu_load_generator_teastore_with_resources',
+    'default': None,
+}
+
+# Terraform variables with the resources of the TeaStore services (one replica each)
+TEASTORE_RESOURCE_VARIABLES = ['auth_resources', 'db_resources', 'image_resources', 'persistence_resources',
+                               'rabbitmq_resources', 'recommender_resources', 'registry_resources',
+                               'webui_resources']
+
+_TFVARS_TOKEN_PATTERN = re.compile(r'\s+|#[^\n]*|//[^\n]*|"((?:[^"\\]|\\.)*)"|([A-Za-z_][\w-]*)|(-?\d+(?:\.\d+)?)|([={}\[\],])')
+
+
+def parse_tfvars(tfvars_file: Path) -> dict:
+    """
+    Parse the subset of HCL used by the tfvars files of the experiments.
+    
+    Supports assignments of strings, numbers, booleans, null, objects and lists.
+    """
+    text = tfvars_file.read_text(encoding='utf-8')
+    tokens = []
+    position = 0
+    while position < len(text):
+        match = _TFVARS_TOKEN_PATTERN.match(text, position)
+        if match is None:
+            raise ValueError(f"{tfvars_file}: unexpected character {text[position]!r} at offset {position}")
+        position = match.end()
+        string, identifier, number, symbol = match.groups()
+        if string is not None:
+            tokens.append(('value', string))
+        elif identifier is not None:
+            tokens.append(('value', {'null': None, 'true': True, 'false': False}[identifier])
+                          if identifier in ('null', 'true', 'false') else ('name', identifier))
+        elif number is not None:
+            tokens.append(('value', float(number) if '.' in number else int(number)))
+        elif symbol is not None:
+            tokens.append(('symbol', symbol))
+    
+    index = 0
+    
+    def expect(symbol):
+        nonlocal index
+        if index >= len(tokens) or tokens[index] != ('symbol', symbol):
+            raise ValueError(f"{tfvars_file}: expected '{symbol}'")
+        index += 1
+    
+    def parse_value():
+        nonlocal index
+        kind, token = tokens[index]
+        index += 1
+        if kind == 'value':
+            return token
+        if token == '{':
+            return parse_assignments('}')
+        if token == '[':
+            items = []
+            while tokens[index] != ('symbol', ']'):
+                items.append(parse_value())
+                if tokens[index] == ('symbol', ','):
+                    index += 1
+            index += 1
+            return items
+        raise ValueError(f"{tfvars_file}: unexpected '{token}'")
+    
+    def parse_assignments(end):
+        nonlocal index
+        result = {}
+        while index < len(tokens) and tokens[index] != ('symbol', end):
+            kind, name = tokens[index]
+            if kind not in ('name', 'value'):
+                raise ValueError(f"{tfvars_file}: expected a name, got '{name}'")
+            index += 1
+            expect('=')
+            result[name] = parse_value()
+            if index < len(tokens) and tokens[index] == ('symbol', ','):
+                index += 1
+        if end is not None:
+            expect(end)
+        return result
+    
+    return parse_assignments(None)
+
+
+def teastore_allocation(tfvars_dir: Path, experiment_type: str) -> Dict[str, float]:
+    """
+    Resources allocated to TeaStore in an experiment, summed over all services.
+    
+    The variables are merged like deploy.sh applies them: the base file of the
+    deployment type first, then the tfvars file named in the experiment
+    directory. Without requests, Kubernetes uses the limits as requests.
+    
+    Returns:
+        dict with cpu_request_m, cpu_limit_m, memory_request_gib, memory_limit_gib
+        (NaN for limits if any service has no limit, NaN for requests if any
+        service has neither a request nor a limit, i.e. the allocation is unknown)
+    """
+    deployment_type, tfvars_name = split_deployment_type(experiment_type)
+    if deployment_type is None:
+        raise ValueError(f"Unknown deployment type of experiment '{experiment_type}'")
+    variables = {}
+    for name in (DEPLOYMENT_TYPE_VAR_FILES[deployment_type], tfvars_name):
+        if name:
+            variables.update(parse_tfvars(tfvars_dir / f"{name}.tfvars"))
+    
+    totals = {'cpu_request_m': 0.0, 'cpu_limit_m': 0.0, 'memory_request_gib': 0.0, 'memory_limit_gib': 0.0}
+    for variable in TEASTORE_RESOURCE_VARIABLES:
+        resources = variables.get(variable) or {}
+        requests = resources.get('requests') or {}
+        limits = resources.get('limits') or {}
+        for resource, parse, scale in (('cpu', parse_cpu_quantity, 1.0),
+                                       ('memory', parse_memory_quantity, 1024 ** -3)):
+            limit = limits.get(resource)
+            request = requests.get(resource, limit)
+            unit = 'm' if resource == 'cpu' else 'gib'
+            totals[f'{resource}_request_{unit}'] += parse(request) * scale if request is not None else float('nan')
+            totals[f'{resource}_limit_{unit}'] += parse(limit) * scale if limit is not None else float('nan')
+    return totals
+
+
+def fit_allocation_model(allocations: np.ndarray, latencies: np.ndarray) -> Tuple[float, float, float]:
+    """
+    Fit p95 = a + b / allocation (latency falls with the inverse of the capacity).
+    
+    Returns:
+        Tuple of (a, b, r_squared), NaNs if there are fewer than two distinct allocations
+    """
+    valid = (allocations > 0) & np.isfinite(latencies)
+    if len(np.unique(allocations[valid])) < 2:
+        return float('nan'), float('nan'), float('nan')
+    x = 1.0 / allocations[valid]
+    y = latencies[valid]
+    b, a = np.polyfit(x, y, 1)
+    residual = np.sum((y - (a + b * x)) ** 2)
+    total = np.sum((y - y.mean()) ** 2)
+    return float(a), float(b), float(1 - residual / total) if total > 0 else 1.0
+
+
+# Requested resources a configuration can set -> columns it is ranked and modelled on,
+# in the order the groups are reported (configurations setting neither come last)
+ALLOCATION_DIMENSIONS = {
+    'CPU and memory': ['CPU Requests (m)', 'Memory Requests (GiB)'],
+    'CPU': ['CPU Requests (m)'],
+    'Memory': ['Memory Requests (GiB)'],
+}
+UNKNOWN_ALLOCATION = 'Unknown'
+
+
+def allocation_dimension(cpu_request_m: float, memory_request_gib: float) -> str:
+    """Name of the ALLOCATION_DIMENSIONS group of a configuration (UNKNOWN_ALLOCATION if it sets neither)."""
+    cpu_known, memory_known = not np.isnan(cpu_request_m), not np.isnan(memory_request_gib)
+    if cpu_known and memory_known:
+        return 'CPU and memory'
+    if cpu_known:
+        return 'CPU'
+    if memory_known:
+        return 'Memory'
+    return UNKNOWN_ALLOCATION
+
+
+def score_efficiency(summaries: List[RunSummary], tfvars_dir: Path, slo_p95_ms: float = None,
+                     max_error_rate: float = None) -> pd.DataFrame:
+    """
+    Compute latency, throughput and resource efficiency per experiment configuration.
+    
+    All runs of a configuration (experiment directory) are pooled. Configurations
+    are grouped by the resources they request (see ALLOCATION_DIMENSIONS), e.g.
+    memory-only configurations are only compared with each other. Within a
+    group they are ranked by the requested amounts; configurations that violate
+    the SLO (p95 and error rate) are ranked after those that meet it.
+    Configurations without any requests (e.g. BestEffort) come last.
+    
+    Returns:
+        DataFrame with one row per configuration
+    """
+    configurations = defaultdict(list)
+    for summary in summaries:
+        configurations[summary.experiment_type].append(summary)
+    
+    rows = []
+    for experiment_type, runs in sorted(configurations.items()):
+        try:
+            allocation = teastore_allocation(tfvars_dir, experiment_type)
+        except (OSError, ValueError, KeyError) as e:
+            typer.echo(f"Warning: Skipping '{experiment_type}': no resource allocation ({e})", err=True)
+            continue
+        
+        pooled = None
+        for run in runs:
+            for histogram in run.histograms.values():
+                pooled = histogram if pooled is None else pooled.merge(histogram)
+        if pooled is None:
+            continue
+        p50, p95, p99 = pooled.percentile([50, 95, 99])
+        duration = sum(run.duration for run in runs)
+        throughput = pooled.count / duration if duration > 0 else float('nan')
+        errors = sum(run.error_stats.total_errors for run in runs)
+        error_rate = errors / (pooled.count + errors)
+        cpu_cores = allocation['cpu_request_m'] / 1000
+        memory_gib = allocation['memory_request_gib']
+        
+        meets_slo = True
+        if slo_p95_ms is not None and p95 > slo_p95_ms:
+            meets_slo = False
+        if max_error_rate is not None and error_rate > max_error_rate:
+            meets_slo = False
+        
+        rows.append({
+            'Experiment': experiment_type,
+            'Allocation': allocation_dimension(allocation['cpu_request_m'], memory_gib),
+            'Runs': len(runs),
+            'CPU Requests (m)': allocation['cpu_request_m'],
+            'CPU Limits (m)': allocation['cpu_limit_m'],
+            'Memory Requests (GiB)': memory_gib,
+            'Memory Limits (GiB)': allocation['memory_limit_gib'],
+            'P50 Response Time (ms)': p50,
+            'P95 Response Time (ms)': p95,
+            'P99 Response Time (ms)': p99,
+            'Throughput (req/s)': throughput,
+            'Error Rate (%)': error_rate * 100,
+            'Throughput per Core (req/s)': throughput / cpu_cores if cpu_cores > 0 else float('nan'),
+            'Throughput per GiB (req/s)': throughput / memory_gib if memory_gib > 0 else float('nan'),
+            'P95 per Millicore (ms/m)': p95 / allocation['cpu_request_m'] if cpu_cores > 0 else float('nan'),
+            'P95 per GiB (ms/GiB)': p95 / memory_gib if memory_gib > 0 else float('nan'),
+            'Meets SLO': meets_slo,
+        })
+    
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return df
+    # Per allocation group: cheapest allocation first (CPU, then memory; a request the group does not
+    # set is NaN in all of its rows), SLO violations after them
+    group_order = {name: index for index, name in enumerate([*ALLOCATION_DIMENSIONS, UNKNOWN_ALLOCATION])}
+    df = df.assign(_group=df['Allocation'].map(group_order)).sort_values(
+        ['_group', 'Meets SLO', 'CPU Requests (m)', 'Memory Requests (GiB)', 'P95 Response Time (ms)'],
+        ascending=[True, False, True, True, True], kind='stable').drop(columns='_group').reset_index(drop=True)
+    df.insert(0, 'Rank', np.arange(1, len(df) + 1))
+    return df
+
+
+def print_efficiency_report(efficiency_df: pd.DataFrame, slo_p95_ms: float = None, max_error_rate: float = None):
+    """
+    Print the ranking, the latency-versus-allocation models and the cheapest configuration meeting the SLO.
+    
+    Models and cheapest configurations are reported per allocation group, on
+    the requests the configurations of the group actually set.
+    """
+    typer.echo("\n" + "="*80)
+    typer.echo("RESOURCE EFFICIENCY")
+    typer.echo("="*80)
+    columns = ['Rank', 'Experiment', 'Allocation', 'Runs', 'CPU Requests (m)', 'Memory Requests (GiB)',
+               'P95 Response Time (ms)', 'Throughput (req/s)', 'Error Rate (%)', 'Throughput per Core (req/s)',
+               'Throughput per GiB (req/s)', 'P95 per Millicore (ms/m)', 'P95 per GiB (ms/GiB)', 'Meets SLO']
+    typer.echo(efficiency_df[columns].to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+    
+    slo = None
+    if slo_p95_ms is not None or max_error_rate is not None:
+        slo = ", ".join(part for part in (f"P95 <= {slo_p95_ms:g} ms" if slo_p95_ms is not None else None,
+                                          f"error rate <= {max_error_rate * 100:g}%" if max_error_rate is not None else None)
+                        if part)
+    units = {'CPU Requests (m)': 'm', 'Memory Requests (GiB)': 'GiB'}
+    
+    for group, group_columns in ALLOCATION_DIMENSIONS.items():
+        group_df = efficiency_df[efficiency_df['Allocation'] == group]
+        if group_df.empty:
+            continue
+        typer.echo(f"\n{group} requests ({len(group_df)} configuration(s)):")
+        typer.echo("  Latency-versus-allocation model (P95 = a + b / allocation):")
+        p95 = group_df['P95 Response Time (ms)'].to_numpy(dtype=np.float64)
+        for column in group_columns:
+            unit = units[column]
+            a, b, r_squared = fit_allocation_model(group_df[column].to_numpy(dtype=np.float64), p95)
+            if np.isnan(a):
+                typer.echo(f"    {column}: not enough distinct allocations to fit a model")
+                continue
+            typer.echo(f"    {column}: a = {a:.2f} ms, b = {b:.2f} ms*{unit}, R^2 = {r_squared:.3f}")
+            if slo_p95_ms is not None:
+                if b > 0 and slo_p95_ms > a:
+                    typer.echo(f"      -> P95 <= {slo_p95_ms:g} ms predicted from {b / (slo_p95_ms - a):.2f} {unit}")
+                else:
+                    typer.echo(f"      -> the model predicts no allocation for P95 <= {slo_p95_ms:g} ms")
+        
+        if slo is not None:
+            meeting = group_df[group_df['Meets SLO']]
+            if meeting.empty:
+                typer.echo(f"  No configuration meets the SLO ({slo}).")
+            else:
+                best = meeting.iloc[0]
+                amounts = ", ".join(f"{best[column]:.0f}m CPU" if units[column] == 'm' else f"{best[column]:.2f} GiB"
+                                    for column in group_columns)
+                typer.echo(f"  Cheapest configuration meeting the SLO ({slo}): {best['Experiment']} "
+                           f"({amounts}, P95 {best['P95 Response Time (ms)']:.1f} ms)")
+    
+    if slo is not None:
+        unknown_meeting = efficiency_df[efficiency_df['Meets SLO'] & (efficiency_df['Allocation'] == UNKNOWN_ALLOCATION)]
+        if not unknown_meeting.empty:
+            typer.echo(f"\nAlso meeting the SLO, but without resource requests (unknown allocation): "
+                       f"{', '.join(unknown_meeting['Experiment'])}")
+
+
+def merge_run_summaries(summaries: List[RunSummary]) -> RunSummary:
+    """Pool several runs (e.g. repeats of a baseline) into one RunSummary."""
+    histograms = {}
+    error_stats = ErrorStats()
+    for summary in summaries:
+        for request_type, histogram in summary.histograms.items():
+            histograms[request_type] = (histogram if request_type not in histograms
+                                        else histograms[request_type].merge(histogram))
+        error_stats = error_stats.merge(summary.error_stats)
+    first = summaries[0]
+    return RunSummary(
+        file_label=first.file_label,
+        experiment_type=first.experiment_type,
+        run_name=first.run_name if len(summaries) == 1 else f"{len(summaries)} runs",
+        source_file=', '.join(summary.source_file for summary in summaries),
+        start_time=min((summary.start_time for summary in summaries if summary.start_time is not None), default=None),
+        duration=sum(summary.duration for summary in summaries),
+        histograms=histograms,
+        error_stats=error_stats,
+    )
+
+
+def load_run_summaries(inputs: List[Path], input_format: str = 'auto') -> List[RunSummary]:
+    """Run summaries from summary files, directories of summary files or log files (which are parsed)."""
+    entries = []  # Summaries, or the log file paths that are parsed together below
+    for path in inputs:
+        if path.is_dir():
+            entries.extend(load_run_summary(summary_file) for summary_file in sorted(path.glob('*.summary.json')))
+        elif path.name.endswith('.summary.json'):
+            entries.append(load_run_summary(path))
+        elif path.is_file():
+            entries.append(path)
+        else:
+            typer.echo(f"Error: '{path}' does not exist.", err=True)
+            raise typer.Exit(1)
+    log_files = [entry for entry in entries if isinstance(entry, Path)]
+    parsed = iter(build_run_summary(file_data) for file_data in parse_multiple_log_files(log_files, input_format))
+    return [next(parsed) if isinstance(entry, Path) else entry for entry in entries]
+
+
+def mann_whitney_test(baseline: LatencyHistogram, run: LatencyHistogram) -> Tuple[float, float, float]:
+    """
+    Mann-Whitney U test of two response time histograms (normal approximation with tie correction).
+    
+    The ranks are computed per distinct value, so the test needs no raw samples.
+    
+    Returns:
+        Tuple of (probability that a request of run is slower than one of baseline
+        (ties count half), p-value for run slower, p-value for run faster)
+    """
+    values, inverse = np.unique(np.concatenate([baseline.values, run.values]), return_inverse=True)
+    counts = np.zeros((2, len(values)))
+    np.add.at(counts[0], inverse[:len(baseline.values)], baseline.counts)
+    np.add.at(counts[1], inverse[len(baseline.values):], run.counts)
+    n1, n2 = counts[0].sum(), counts[1].sum()
+    n = n1 + n2
+    ties = counts.sum(axis=0)
+    midranks = np.cumsum(ties) - (ties - 1) / 2
+    u = float(np.dot(counts[1], midranks)) - n2 * (n2 + 1) / 2
+    variance = n1 * n2 / 12 * ((n + 1) - float(np.sum(ties ** 3 - ties)) / (n * (n - 1)))
+    if variance <= 0:
+        return 0.5, 1.0, 1.0
+    sd = np.sqrt(variance)
+    normal = NormalDist()
+    # Continuity correction of 0.5 towards the mean
+    p_slower = 1 - normal.cdf((u - n1 * n2 / 2 - 0.5) / sd)
+    p_faster = normal.cdf((u - n1 * n2 / 2 + 0.5) / sd)
+    return u / (n1 * n2), p_slower, p_faster
+
+
+def two_proportion_test(baseline_errors: int, baseline_total: int, run_errors: int, run_total: int) -> float:
+    """One-sided p-value of a two-proportion z-test for a higher error rate in the run."""
+    pooled = (baseline_errors + run_errors) / (baseline_total + run_total)
+    variance = pooled * (1 - pooled) * (1 / baseline_total + 1 / run_total)
+    if variance <= 0:
+        return 1.0
+    z = (run_errors / run_total - baseline_errors / baseline_total) / np.sqrt(variance)
+    return 1 - NormalDist().cdf(z)
+
+
+def tail_exceedance_test(baseline: LatencyHistogram, run: LatencyHistogram,
+                         percentile: float = 95) -> Tuple[float, float, float]:
+    """
+    Test whether more (or fewer) requests of a run exceed the baseline percentile.
+    
+    Compares the share of requests above the baseline percentile in both
+    histograms with the two-proportion z-test, so a heavier tail is detected
+    even if the bulk of the distribution does not move.
+    
+    Returns:
+        Tuple of (share of run requests above the baseline percentile,
+        p-value for more run requests above it, p-value for fewer)
+    """
+    threshold = baseline.percentile(percentile)
+    base_above = int(baseline.counts[baseline.values > threshold].sum())
+    run_above = int(run.counts[run.values > threshold].sum())
+    p_slower = two_proportion_test(base_above, baseline.count, run_above, run.count)
+    p_faster = two_proportion_test(run_above, run.count, base_above, baseline.count)
+    return run_above / run.count, p_slower, p_faster
+
+
+def compare_to_baseline(baseline: RunSummary, run: RunSummary, p95_tolerance: float = 0.1,
+                        error_rate_tolerance: float = 0.01, alpha: float = 0.05,
+                        min_requests: int = 30) -> Tuple[pd.DataFrame, bool]:
+    """
+    Compare the p95 per request type and the error rate of a run with a baseline.
+    
+    A request type regresses if its p95 grew by more than p95_tolerance
+    (relative) and significantly more of its requests exceed the baseline p95
+    (tail exceedance test at level alpha). The Mann-Whitney probability that
+    a request got slower is reported as the shift of the whole distribution.
+    The error rate regresses if it grew by more than
+    error_rate_tolerance (absolute) and the two-proportion z-test is
+    significant. Request types with fewer than min_requests requests in
+    either run are not tested.
+    
+    Returns:
+        Tuple of (diff table, whether anything regressed)
+    """
+    rows = []
+    regressed = False
+    for request_type in sorted(set(baseline.histograms) | set(run.histograms)):
+        base = baseline.histograms.get(request_type)
+        new = run.histograms.get(request_type)
+        row = {'Request Type': request_type, 'Metric': 'P95 (ms)',
+               'Base Count': base.count if base else 0, 'New Count': new.count if new else 0,
+               'Base': base.percentile(95) if base else float('nan'),
+               'New': new.percentile(95) if new else float('nan'),
+               'Change': float('nan'), 'New > Base P95 (%)': float('nan'), 'P(New > Base)': float('nan'),
+               'p-Value': float('nan')}
+        if base is None or new is None:
+            row['Status'] = 'NEW' if base is None else 'MISSING'
+        elif base.count < min_requests or new.count < min_requests:
+            row['Status'] = 'SKIPPED'
+        else:
+            row['Change'] = (row['New'] / row['Base'] - 1) * 100 if row['Base'] > 0 else float('nan')
+            row['P(New > Base)'], _, _ = mann_whitney_test(base, new)
+            exceedance, p_slower, p_faster = tail_exceedance_test(base, new, 95)
+            row['New > Base P95 (%)'] = exceedance * 100
+            if row['New'] > row['Base'] * (1 + p95_tolerance) and p_slower < alpha:
+                row['Status'] = 'REGRESSION'
+                row['p-Value'] = p_slower
+                regressed = True
+            elif row['New'] < row['Base'] * (1 - p95_tolerance) and p_faster < alpha:
+                row['Status'] = 'IMPROVED'
+                row['p-Value'] = p_faster
+            else:
+                row['Status'] = 'OK'
+                row['p-Value'] = p_slower
+        rows.append(row)
+    
+    # Errors are not attributed to request types, so the error rate is compared per run
+    base_requests = sum(histogram.count for histogram in baseline.histograms.values())
+    new_requests = sum(histogram.count for histogram in run.histograms.values())
+    base_errors = baseline.error_stats.total_errors
+    new_errors = run.error_stats.total_errors
+    base_total = base_requests + base_errors
+    new_total = new_requests + new_errors
+    row = {'Request Type': 'ALL', 'Metric': 'Error Rate (%)', 'Base Count': base_total, 'New Count': new_total,
+           'Base': base_errors / base_total * 100 if base_total else float('nan'),
+           'New': new_errors / new_total * 100 if new_total else float('nan'),
+           'Change': float('nan'), 'New > Base P95 (%)': float('nan'), 'P(New > Base)': float('nan'),
+           'p-Value': float('nan'), 'Status': 'SKIPPED'}
+    if base_total and new_total:
+        row['Change'] = row['New'] - row['Base']  # Percentage points
+        row['p-Value'] = two_proportion_test(base_errors, base_total, new_errors, new_total)
+        if row['Change'] > error_rate_tolerance * 100 and row['p-Value'] < alpha:
+            row['Status'] = 'REGRESSION'
+            regressed = True
+        else:
+            row['Status'] = 'OK'
+    rows.append(row)
+    
+    return pd.DataFrame(rows), regressed
+
+
+# Metrics of the bar charts: 'average', 'median' or a percentile like 'p95' or 'p99.9'
+METRIC_TYPE_PATTERN = re.compile(r'^p(\d+(?:\.\d+)?)$')
+
+# Whiskers of the bar charts: interquartile range or 95% confidence interval of the metric
+BAR_WHISKERS = ('none', 'iqr', 'ci')
+CONFIDENCE_Z = 1.959963984540054
+
+
+def metric_percentile(metric_type: str) -> float:
+    """Percentile of a metric type ('median' -> 50, 'p95' -> 95), None for 'average'."""
+    if metric_type == 'average':
+        return None
+    if metric_type == 'median':
+        return 50.0
+    match = METRIC_TYPE_PATTERN.match(metric_type)
+    if match is None or not 0 <= float(match.group(1)) <= 100:
+        raise ValueError(f"Invalid metric type '{metric_type}'")
+    return float(match.group(1))
+
+
+def stacked_histograms(columns: list) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Exact histograms of many response time columns, stacked into flat arrays.
+    
+    In-memory columns are sorted together with one np.lexsort over
+    (group, response time); spilled columns use their streamed histograms.
+    
+    Returns:
+        Tuple of (values, counts, starts): group g holds values[starts[g]:starts[g + 1]]
+    """
+    if any(isinstance(column, SpilledColumn) for column in columns):
+        histograms = [response_time_histogram(column) for column in columns]
+        values = np.concatenate([histogram.values for histogram in histograms] + [np.empty(0)])
+        counts = np.concatenate([histogram.counts for histogram in histograms] + [np.empty(0, dtype=np.int64)])
+        sizes = [len(histogram.values) for histogram in histograms]
+    else:
+        lengths = np.array([len(column) for column in columns], dtype=np.int64)
+        samples = np.concatenate([np.asarray(column, dtype=np.float64) for column in columns] + [np.empty(0)])
+        groups = np.repeat(np.arange(len(columns)), lengths)
+        order = np.lexsort((samples, groups))
+        samples = samples[order]
+        groups = groups[order]
+        # A new histogram entry starts wherever the group or the value changes
+        boundaries = np.flatnonzero((np.diff(samples) != 0) | (np.diff(groups) != 0)) + 1
+        entry_starts = np.concatenate([[0], boundaries]) if len(samples) else np.empty(0, dtype=np.int64)
+        values = samples[entry_starts]
+        counts = np.diff(np.append(entry_starts, len(samples)))
+        sizes = np.bincount(groups[entry_starts], minlength=len(columns))
+    starts = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+    return values, counts.astype(np.int64), starts
+
+
+def _values_at_ranks(values: np.ndarray, cumulative: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+    """Sample values at (global) ranks of stacked histograms with the given cumulative counts."""
+    return values[np.searchsorted(cumulative, ranks, side='right')]
+
+
+def grouped_statistics(columns: list, q: List[float], confidence_q: float = None) -> Dict[str, np.ndarray]:
+    """
+    Count, mean, standard deviation and percentiles q of many columns in one vectorized pass.
+    
+    Percentiles use the same linear interpolation as np.percentile. With
+    confidence_q, also returns the distribution-free 95% confidence interval of
+    that percentile (order statistics at the normal approximation of the
+    binomial ranks) as 'ci_low' and 'ci_high', and the interval of the mean
+    as 'mean_ci_low' and 'mean_ci_high'.
+    
+    Returns:
+        dict of arrays; 'percentiles' has the shape (len(columns), len(q))
+    """
+    values, counts, starts = stacked_histograms(columns)
+    q = np.asarray(q, dtype=np.float64)
+    cumulative = np.cumsum(counts)
+    group_offsets = np.concatenate([[0], cumulative])[starts[:-1]]  # Samples before each group
+    n = np.add.reduceat(counts, starts[:-1]) if len(counts) else np.zeros(len(columns), dtype=np.int64)
+    n = np.where(np.diff(starts) > 0, n, 0)
+    totals = np.add.reduceat(values * counts, starts[:-1]) if len(counts) else np.zeros(len(columns))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(n > 0, totals / n, np.nan)
+        group_of_entry = np.repeat(np.arange(len(columns)), np.diff(starts))
+        squares = np.bincount(group_of_entry, weights=counts * (values - mean[group_of_entry]) ** 2,
+                              minlength=len(columns))
+        std = np.where(n > 0, np.sqrt(squares / n), np.nan)
+    
+    result = {'count': n, 'mean': mean, 'std': std, 'percentiles': np.full((len(columns), len(q)), np.nan)}
+    has_data = n > 0
+    if not has_data.any():
+        return result
+    
+    n_valid = n[has_data][:, None]
+    offsets = group_offsets[has_data][:, None]
+    position = (n_valid - 1) * q[None, :] / 100.0
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, n_valid - 1)
+    lower_values = _values_at_ranks(values, cumulative, offsets + lower)
+    upper_values = _values_at_ranks(values, cumulative, offsets + upper)
+    result['percentiles'][has_data] = lower_values + (position - lower) * (upper_values - lower_values)
+    
+    if confidence_q is not None:
+        p = confidence_q / 100.0
+        spread = CONFIDENCE_Z * np.sqrt(n_valid[:, 0] * p * (1 - p))
+        # 1-based ranks of the bounds (Conover), converted to 0-based ranks
+        low_rank = np.clip(np.floor(n_valid[:, 0] * p - spread).astype(np.int64) - 1, 0, n_valid[:, 0] - 1)
+        high_rank = np.clip(np.ceil(n_valid[:, 0] * p + spread).astype(np.int64) - 1, 0, n_valid[:, 0] - 1)
+        for key, ranks in (('ci_low', low_rank), ('ci_high', high_rank)):
+            result[key] = np.full(len(columns), np.nan)
+            result[key][has_data] = _values_at_ranks(values, cumulative, offsets[:, 0] + ranks)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        half_width = CONFIDENCE_Z * std / np.sqrt(n)
+    result['mean_ci_low'] = mean - half_width
+    result['mean_ci_high'] = mean + half_width
+    return result
+
+
+def calculate_multi_file_statistics(file_data_list: List[FileData]) -> pd.DataFrame:
+    """Calculate statistics for multiple files, keeping file information."""
+    all_stats = []
+    
+    for file_data in file_data_list:
+        for request_type, times in file_data.response_times.items():
+            if times:  # Only process if there are response times
+                histogram = response_time_histogram(times)
+                all_stats.append({
+                    'Request Type': request_type,
+                    'File': file_data.file_label,
+                    'Average Response Time (ms)': histogram.mean,
+                    'Median Response Time (ms)': histogram.percentile(50),
+                    'Min Response Time (ms)': histogram.min,
+                    'Max Response Time (ms)': histogram.max,
+                    'Count': histogram.count
+                })
+    
+    return pd.DataFrame(all_stats).sort_values(['Request Type', 'File'])
+
+
+def find_slowest_requests(file_data: FileData, k: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Select the k slowest requests per request type and over all request types of one file.
+    
+    Uses np.partition, so only the k selected requests are sorted instead
+    of the whole run. Spilled columns are scanned chunk by chunk, keeping the
+    k slowest requests of every chunk as candidates. Ties are broken by log
+    order, so the result does not depend on the chunking. If the response
+    lines carry user ids, the user of every request is reported as well.
+    
+    Returns:
+        Tuple of (per_request_type, overall) DataFrames sorted by descending response time
+    """
+    with_users = has_user_ids(file_data)
+    columns = ['File', 'Request Type', 'Rank', 'Time (s)', 'Wall Clock', 'Response Time (ms)']
+    if with_users:
+        columns.insert(2, 'User')
+    per_type_rows = []
+    type_names = []
+    all_times = []
+    all_timestamps = []
+    all_type_codes = []
+    all_users = []
+    
+    def top_k_indices(values: np.ndarray, order: np.ndarray, count: int) -> np.ndarray:
+        """Indices of the count largest values (ties in ascending order), sorted by descending value."""
+        count = min(count, len(values))
+        if count == 0:
+            return np.empty(0, dtype=np.int64)
+        threshold = np.partition(values, len(values) - count)[len(values) - count]
+        candidates = np.flatnonzero(values >= threshold)
+        return candidates[np.lexsort((order[candidates], -values[candidates]))][:count]
+    
+    def wall_clock(relative_time: float) -> str:
+        if file_data.start_time is None:
+            return ""
+        return datetime.fromtimestamp(file_data.start_time + relative_time).strftime("%Y-%m-%d %H:%M:%S,%f")[:-3]
+    
+    for request_type, times in sorted(file_data.response_times.items()):
+        timestamps = (file_data.response_timestamps or {}).get(request_type, [])
+        min_len = min(len(times), len(timestamps))
+        if min_len == 0:
+            continue
+        
+        candidate_times = []
+        candidate_timestamps = []
+        candidate_rows = []
+        offset = 0
+        for times_chunk, timestamps_chunk in iter_paired_chunks(times, timestamps):
+            rows = np.arange(offset, offset + len(times_chunk))
+            selected = top_k_indices(times_chunk, rows, k)
+            candidate_times.append(np.asarray(times_chunk[selected]))
+            candidate_timestamps.append(np.asarray(timestamps_chunk[selected]))
+            candidate_rows.append(rows[selected])
+            offset += len(times_chunk)
+        times = np.concatenate(candidate_times)
+        timestamps = np.concatenate(candidate_timestamps)
+        rows = np.concatenate(candidate_rows)
+        selected = top_k_indices(times, rows, k)
+        # Spilled user ids are read only at the selected rows
+        users = file_data.response_users[request_type].take(rows[selected]) if with_users else None
+        
+        for rank, index in enumerate(selected, 1):
+            row = [file_data.file_label, request_type, rank, timestamps[index],
+                   wall_clock(timestamps[index]), times[index]]
+            if with_users:
+                row.insert(2, int(users[rank - 1]))
+            per_type_rows.append(row)
+        
+        # The k slowest of each request type are the only candidates for the overall top k
+        type_names.append(request_type)
+        all_times.append(times[selected])
+        all_timestamps.append(timestamps[selected])
+        all_type_codes.append(np.full(len(selected), len(type_names) - 1, dtype=np.int64))
+        if with_users:
+            all_users.append(users)
+    
+    overall_rows = []
+    if all_times:
+        times = np.concatenate(all_times)
+        timestamps = np.concatenate(all_timestamps)
+        type_codes = np.concatenate(all_type_codes)
+        users = np.concatenate(all_users) if with_users else None
+        # Ties are ordered like the request types (and by log order within a type)
+        order = np.arange(len(times))
+        for rank, index in enumerate(top_k_indices(times, order, k), 1):
+            row = [file_data.file_label, type_names[type_codes[index]], rank, timestamps[index],
+                   wall_clock(timestamps[index]), times[index]]
+            if with_users:
+                row.insert(2, int(users[index]))
+            overall_rows.append(row)
+    
+    return pd.DataFrame(per_type_rows, columns=columns), pd.DataFrame(overall_rows, columns=columns)
+
+
+def cluster_outliers(outliers: pd.DataFrame, gap_seconds: float) -> pd.DataFrame:
+    """
+    Group outliers that are close in time.
+    
+    Outliers belong to the same cluster when less than gap_seconds lie between
+    consecutive outliers.
+    
+    Returns:
+        DataFrame with one row per cluster (start, end, size, request types)
+    """
+    if outliers.empty:
+        return pd.DataFrame(columns=['Start (s)', 'End (s)', 'Start Wall Clock', 'Outliers',
+                                     'Max Response Time (ms)', 'Request Types'])
+    
+    ordered = outliers.sort_values('Time (s)')
+    cluster_ids = np.concatenate([[0], np.cumsum(np.diff(ordered['Time (s)'].to_numpy()) > gap_seconds)])
+    
+    clusters = []
+    for _, cluster in ordered.groupby(cluster_ids):
+        type_counts = cluster['Request Type'].value_counts()
+        clusters.append({
+            'Start (s)': cluster['Time (s)'].iloc[0],
+            'End (s)': cluster['Time (s)'].iloc[-1],
+            'Start Wall Clock': cluster['Wall Clock'].iloc[0],
+            'Outliers': len(cluster),
+            'Max Response Time (ms)': cluster['Response Time (ms)'].max(),
+            'Request Types': ', '.join(f"{name} ({count})" for name, count in type_counts.items()),
+        })
+    return pd.DataFrame(clusters).sort_values('Outliers', ascending=False, kind='stable')
+
+
+def print_tail_report(file_data_list: List[FileData], k: int, gap_seconds: float = 5.0,
+                      output_dir: Path = None):
+    """Print the slowest requests per file and request type and how they cluster in time."""
+    typer.echo("\n" + "="*80)
+    typer.echo(f"TAIL REPORT (top {k} slowest requests)")
+    typer.echo("="*80)
+    
+    per_type_frames = []
+    cluster_frames = []
+    for i, file_data in enumerate(file_data_list, 1):
+        per_type, overall = find_slowest_requests(file_data, k)
+        typer.echo(f"\n[{i}] FILE: {file_data.file_label} ({file_data.file_path.name})")
+        typer.echo("-" * 60)
+        
+        if overall.empty:
+            typer.echo("No response time data with timestamps found.")
+            continue
+        
+        typer.echo(f"Slowest {len(overall)} requests overall:")
+        typer.echo(overall.drop(columns=['File']).to_string(index=False, float_format=lambda v: f"{v:.1f}"))
+        
+        typer.echo(f"\nSlowest requests per request type (top {k}):")
+        for request_type, group in per_type.groupby('Request Type', sort=True):
+            slowest = ', '.join(f"{row['Response Time (ms)']:.0f}ms@{row['Time (s)']:.0f}s"
+                                + (f" (user{row['User']})" if 'User' in row else "")
+                                for _, row in group.iterrows())
+            typer.echo(f"  {request_type}: {slowest}")
+        
+        clusters = cluster_outliers(overall, gap_seconds)
+        typer.echo(f"\nOutlier clusters (gap > {gap_seconds:g}s starts a new cluster):")
+        typer.echo(clusters.to_string(index=False, float_format=lambda v: f"{v:.1f}"))
+        
+        per_type_frames.append(per_type)
+        clusters.insert(0, 'File', file_data.file_label)
+        cluster_frames.append(clusters)
+    
+    if output_dir is not None and per_type_frames:
+        tail_file = output_dir / 'tail_report_slowest_requests.csv'
+        pd.concat(per_type_frames).to_csv(tail_file, index=False)
+        cluster_file = output_dir / 'tail_report_outlier_clusters.csv'
+        pd.concat(cluster_frames).to_csv(cluster_file, index=False)
+        typer.echo(f"\nTail report saved to: {tail_file} and {cluster_file}")
+
+
+# Percentiles of the coordinated omission report
+CORRECTION_PERCENTILES = [50, 90, 95, 99, 99.9]
+
+
+def corrected_latency_statistics(file_data: FileData, expected_interval_ms: float) -> pd.DataFrame:
+    """
+    Raw and coordinated-omission corrected percentiles per request type and
+    over all request types (see LatencyHistogram.corrected).
+    """
+    histograms = {request_type: response_time_histogram(times)
+                  for request_type, times in sorted(file_data.response_times.items()) if len(times) > 0}
+    if not histograms:
+        return pd.DataFrame()
+    overall = LatencyHistogram(values=np.empty(0), counts=np.empty(0, dtype=np.int64))
+    for histogram in histograms.values():
+        overall = overall.merge(histogram)
+    histograms['ALL'] = overall
+    
+    rows = []
+    for request_type, histogram in histograms.items():
+        try:
+            corrected = histogram.corrected(expected_interval_ms)
+            corrected_count = corrected.count
+            corrected_values = corrected.percentile(CORRECTION_PERCENTILES)
+        except ValueError as e:
+            typer.echo(f"Warning: No corrected percentiles for {request_type}: {e}", err=True)
+            corrected_count = float('nan')
+            corrected_values = np.full(len(CORRECTION_PERCENTILES), np.nan)
+        row = {'Request Type': request_type, 'Samples': histogram.count, 'Corrected Samples': corrected_count}
+        for q, raw_value, corrected_value in zip(CORRECTION_PERCENTILES, histogram.percentile(CORRECTION_PERCENTILES),
+                                                 corrected_values):
+            row[f'P{q:g} (ms)'] = raw_value
+            row[f'P{q:g} Corrected (ms)'] = corrected_value
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def print_corrected_latency_report(file_data_list: List[FileData], expected_interval_ms: float,
+                                   output_dir: Path = None):
+    """Print raw and coordinated-omission corrected percentiles side by side."""
+    typer.echo("\n" + "="*80)
+    typer.echo(f"COORDINATED OMISSION CORRECTION (expected interval {expected_interval_ms:g} ms per user)")
+    typer.echo("="*80)
+    
+    frames = []
+    for i, file_data in enumerate(file_data_list, 1):
+        typer.echo(f"\n[{i}] FILE: {file_data.file_label} ({file_data.file_path.name})")
+        typer.echo("-" * 60)
+        statistics = corrected_latency_statistics(file_data, expected_interval_ms)
+        if statistics.empty:
+            typer.echo("No response time data found.")
+            continue
+        typer.echo(statistics.to_string(index=False, float_format=lambda v: f"{v:.1f}"))
+        overall = statistics.iloc[-1]
+        if np.isnan(overall['Corrected Samples']):
+            statistics.insert(0, 'File', file_data.file_label)
+            frames.append(statistics)
+            continue
+        synthetic = int(overall['Corrected Samples'] - overall['Samples'])
+        typer.echo(f"Synthesized {synthetic:,} samples for requests that waiting users could not send "
+                   f"({100.0 * synthetic / overall['Corrected Samples']:.1f}% of the corrected histogram)")
+        statistics.insert(0, 'File', file_data.file_label)
+        frames.append(statistics)
+    
+    if output_dir is not None and frames:
+        corrected_file = output_dir / 'latency_coordinated_omission.csv'
+        pd.concat(frames).to_csv(corrected_file, index=False)
+        typer.echo(f"\nCorrected percentiles saved to: {corrected_file}")
+
+
+# Change-point detection (see detect_change_points)
+CHANGE_POINT_QUANTILE = 95
+CHANGE_POINT_MIN_WINDOWS = 3  # Minimum segment length in windows
+
+
+def windowed_latency(file_data: FileData, window_seconds: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Exact latency histograms of all request types per time window.
+    
+    The (window, response time) pairs are reduced chunk by chunk with
+    np.lexsort, so spilled columns never have to be loaded at once.
+    
+    Returns:
+        Tuple of (windows, values, counts), sorted by window and response time
+    """
+    reduced = (np.empty(0, dtype=np.int64), np.empty(0), np.empty(0, dtype=np.int64))
+    parts = []
+    pending = 0
+    for request_type, times in file_data.response_times.items():
+        timestamps = (file_data.response_timestamps or {}).get(request_type, [])
+        for times_chunk, timestamps_chunk in iter_paired_chunks(times, timestamps):
+            windows = np.floor_divide(np.asarray(timestamps_chunk, dtype=np.float64), window_seconds).astype(np.int64)
+            parts.append(_reduce_window_pairs(windows, np.asarray(times_chunk, dtype=np.float64),
+                                              np.ones(len(windows), dtype=np.int64)))
+            pending += len(windows)
+            # Merge once the pending pairs outgrow the merged ones (keeps memory and work near-linear)
+            if pending > len(reduced[0]):
+                reduced = _reduce_window_pairs(*(np.concatenate(columns) for columns in zip(reduced, *parts)))
+                parts, pending = [], 0
+    if parts:
+        reduced = _reduce_window_pairs(*(np.concatenate(columns) for columns in zip(reduced, *parts)))
+    return reduced
+
+
+def _reduce_window_pairs(windows: np.ndarray, values: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sort (window, value, count) triples and add up the counts of equal (window, value) pairs."""
+    order = np.lexsort((values, windows))
+    windows, values, counts = windows[order], values[order], counts[order]
+    if len(windows) == 0:
+        return windows, values, counts
+    entry_starts = np.concatenate([[0], np.flatnonzero((np.diff(windows) != 0) | (np.diff(values) != 0)) + 1])
+    return windows[entry_starts], values[entry_starts], np.add.reduceat(counts, entry_starts)
+
+
+def _histogram_percentile(values: np.ndarray, counts: np.ndarray, q: float) -> float:
+    """Percentile of a sorted histogram, interpolated like LatencyHistogram.percentile."""
+    return LatencyHistogram(values, counts).percentile(q) if len(counts) else float('nan')
+
+
+def binary_segmentation(signal: np.ndarray, penalty: float, min_size: int = CHANGE_POINT_MIN_WINDOWS) -> List[int]:
+    """
+    Split a (windows x features) signal into segments of constant mean by
+    binary segmentation (recursive CUSUM).
+    
+    The cost of a segment is its sum of squared deviations from the segment
+    mean, so the cost of every split of a segment follows from cumulative sums
+    in one vectorized step; a segment is split at its best point as long as
+    that lowers the cost by more than the penalty. The work is O(n log n) in
+    the number of windows n for balanced splits.
+    
+    Returns:
+        Sorted window indices at which a new segment starts
+    """
+    sums = np.concatenate([np.zeros((1, signal.shape[1])), np.cumsum(signal, axis=0)])
+    squares = np.concatenate([[0.0], np.cumsum((signal ** 2).sum(axis=1))])
+    
+    def segment_cost(starts, ends) -> np.ndarray:
+        return squares[ends] - squares[starts] - ((sums[ends] - sums[starts]) ** 2).sum(axis=-1) / (ends - starts)
+    
+    boundaries = []
+    segments = [(0, len(signal))]
+    while segments:
+        start, end = segments.pop()
+        if end - start < 2 * min_size:
+            continue
+        splits = np.arange(start + min_size, end - min_size + 1)
+        gains = segment_cost(start, end) - segment_cost(start, splits) - segment_cost(splits, end)
+        best = int(np.argmax(gains))
+        if gains[best] > penalty:
+            split = int(splits[best])
+            boundaries.append(split)
+            segments.extend([(start, split), (split, end)])
+    return sorted(boundaries)
+
+
+def _standardize(series: np.ndarray) -> np.ndarray:
+    """Scale a series by a robust estimate of its noise (MAD of the first differences); None if it is constant."""
+    sigma = 1.4826 * np.median(np.abs(np.diff(series) - np.median(np.diff(series)))) / np.sqrt(2)
+    if not sigma > 0:
+        sigma = np.std(series)
+    return (series - series.mean()) / sigma if sigma > 0 else None
+
+
+def detect_change_points(file_data: FileData, window_seconds: float = 10.0,
+                         penalty: float = 3.0) -> Tuple[List[float], pd.DataFrame]:
+    """
+    Locate abrupt shifts of the latency or error rate of a run, e.g. the onset
+    of noisy-neighbor interference.
+    
+    The run is cut into windows of window_seconds; binary segmentation splits
+    the windowed p95 (log scale) and error rate, both scaled by their noise
+    level, with a penalty of penalty * log(windows) per feature and change point.
+    
+    Returns:
+        Tuple of (change point times in seconds, DataFrame with one row per segment)
+    """
+    windows, values, counts = windowed_latency(file_data, window_seconds)
+    timeline = file_data.error_timeline if file_data.error_timeline is not None else ErrorTimeline.empty()
+    error_windows = np.floor_divide(timeline.times, window_seconds).astype(np.int64)
+    num_windows = int(max(windows.max() if len(windows) else -1, error_windows.max() if len(error_windows) else -1)) + 1
+    if num_windows == 0:
+        return [], pd.DataFrame()
+    
+    requests = np.bincount(windows, weights=counts, minlength=num_windows).astype(np.int64)
+    errors = np.bincount(error_windows, minlength=num_windows)
+    window_starts = np.searchsorted(windows, np.arange(num_windows + 1))
+    p95 = np.array([_histogram_percentile(values[a:b], counts[a:b], CHANGE_POINT_QUANTILE)
+                    for a, b in zip(window_starts[:-1], window_starts[1:])])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        error_rate = np.where(requests + errors > 0, errors / (requests + errors), 0.0)
+    
+    # Windows without requests keep the latency of the previous window
+    features = [error_rate]
+    if not np.isnan(p95).all():
+        features.insert(0, np.log1p(pd.Series(p95).ffill().bfill().to_numpy()))
+    signal = [scaled for scaled in map(_standardize, features) if scaled is not None]
+    boundaries = binary_segmentation(np.column_stack(signal), penalty * len(signal) * np.log(num_windows)) if signal else []
+    
+    segments = []
+    edges = [0] + boundaries + [num_windows]
+    for first, last in zip(edges[:-1], edges[1:]):
+        a, b = window_starts[first], window_starts[last]
+        histogram = LatencyHistogram(*_reduce_window_pairs(np.zeros(b - a, dtype=np.int64), values[a:b], counts[a:b])[1:])
+        segment_requests = int(requests[first:last].sum())
+        segment_errors = int(errors[first:last].sum())
+        total = segment_requests + segment_errors
+        segments.append({
+            'Start (s)': first * window_seconds,
+            'End (s)': last * window_seconds,
+            'Requests': segment_requests,
+            'Errors': segment_errors,
+            'Mean (ms)': histogram.mean if segment_requests else np.nan,
+            'P95 (ms)': histogram.percentile(CHANGE_POINT_QUANTILE) if segment_requests else np.nan,
+            'Error Rate (%)': 100.0 * segment_errors / total if total else 0.0,
+        })
+    segments_df = pd.DataFrame(segments)
+    segments_df['P95 Change (%)'] = 100.0 * segments_df['P95 (ms)'].pct_change(fill_method=None)
+    segments_df['Error Rate Change (pp)'] = segments_df['Error Rate (%)'].diff()
+    return [boundary * window_seconds for boundary in boundaries], segments_df
+
+
+def print_change_point_report(file_data_list: List[FileData], segment_frames: List[pd.DataFrame],
+                              window_seconds: float, output_dir: Path = None):
+    """Print the detected change points and the statistics of the segments between them."""
+    typer.echo("\n" + "="*80)
+    typer.echo(f"CHANGE POINTS (p95 and error rate per {window_seconds:g}s window)")
+    typer.echo("="*80)
+    
+    for i, (file_data, segments) in enumerate(zip(file_data_list, segment_frames), 1):
+        typer.echo(f"\n[{i}] FILE: {file_data.file_label} ({file_data.file_path.name})")
+        typer.echo("-" * 60)
+        if segments.empty:
+            typer.echo("No data with timestamps found.")
+            continue
+        if file_data.change_points:
+            typer.echo("Change points at: " + ', '.join(f"{t:g}s" for t in file_data.change_points))
+        else:
+            typer.echo("No change points detected.")
+        typer.echo(segments.to_string(index=False, na_rep='-', float_format=lambda v: f"{v:.1f}"))
+    
+    frames = [segments.assign(File=file_data.file_label)
+              for file_data, segments in zip(file_data_list, segment_frames) if not segments.empty]
+    if output_dir is not None and frames:
+        segments_file = output_dir / 'change_point_segments.csv'
+        segments_df = pd.concat(frames)
+        segments_df.insert(0, 'File', segments_df.pop('File'))
+        segments_df.to_csv(segments_file, index=False)
+        typer.echo(f"\nChange point segments saved to: {segments_file}")
+
+
+def draw_change_points(ax, change_points: List[float]):
+    """Mark change points as vertical dashed lines; returns the last line (for legends) or None."""
+    line = None
+    for change_point in change_points or []:
+        line = ax.axvline(change_point, color='black', linestyle='--', linewidth=1.0, alpha=0.8)
+    return line
+
+
+# Per-user sessions (see reconstruct_sessions)
+SESSION_BYTES_PER_REQUEST = 64  # User id, timestamp, response time, request type and sort order per request
+SESSION_MIN_REQUESTS = 20  # Users with fewer requests are not flagged as slow
+SESSION_OUTLIER_MADS = 3.0  # A user's log p95 this many MADs above the median user is flagged as slow
+
+
+def has_user_ids(file_data: FileData) -> bool:
+    """Whether the response lines of a file carry user ids."""
+    return any(chunk.any() for users in (file_data.response_users or {}).values()
+               for chunk in iter_column_chunks(users, np.uint32))
+
+
+def user_request_records(file_data: FileData) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, List[str]]:
+    """
+    All requests with a known user, sorted by user and time (one np.lexsort).
+    
+    Returns:
+        Tuple of (users, timestamps, response_times, type_codes, request_types)
+        where type_codes index into request_types
+    """
+    request_types = sorted(file_data.response_times)
+    parts = []
+    for code, request_type in enumerate(request_types):
+        users = (file_data.response_users or {}).get(request_type, [])
+        timestamps = (file_data.response_timestamps or {}).get(request_type, [])
+        if len(users) == 0 or len(timestamps) == 0:
+            continue
+        for times_chunk, timestamps_chunk, users_chunk in iter_aligned_chunks(
+                file_data.response_times[request_type], timestamps, users):
+            known = users_chunk > 0
+            parts.append((users_chunk[known], timestamps_chunk[known], times_chunk[known],
+                          np.full(int(known.sum()), code, dtype=np.uint16)))
+    if not parts:
+        return (np.empty(0, dtype=np.uint32), np.empty(0), np.empty(0), np.empty(0, dtype=np.uint16), request_types)
+    users, timestamps, times, codes = (np.concatenate(columns) for columns in zip(*parts))
+    order = np.lexsort((timestamps, users))
+    return users[order], timestamps[order], times[order], codes[order], request_types
+
+
+def _segment_reduce(ufunc: np.ufunc, values: np.ndarray, starts: np.ndarray, sizes: np.ndarray, empty=0) -> np.ndarray:
+    """ufunc.reduceat over consecutive segments of values; empty segments get the value empty."""
+    result = np.full(len(starts), empty, dtype=np.result_type(values, type(empty)))
+    non_empty = sizes > 0
+    if non_empty.any():
+        result[non_empty] = ufunc.reduceat(values, starts[non_empty])
+    return result
+
+
+def reconstruct_sessions(file_data: FileData, burst_gap_seconds: float = 5.0) -> pd.DataFrame:
+    """
+    Reconstruct the session of every locust user: its requests in time order,
+    its latency distribution and its bursts of errors.
+    
+    A user whose p95 lies far above the other users (see SESSION_OUTLIER_MADS)
+    is flagged as slow, e.g. a session pinned to a throttled replica. Errors
+    of a user less than burst_gap_seconds apart belong to the same burst.
+    
+    Returns:
+        DataFrame with one row per user, sorted by user id
+    """
+    users, timestamps, times, codes, request_types = user_request_records(file_data)
+    timeline = file_data.error_timeline if file_data.error_timeline is not None else ErrorTimeline.empty()
+    known = timeline.users > 0
+    error_order = np.lexsort((timeline.times[known], timeline.users[known]))
+    error_users = timeline.users[known][error_order]
+    error_times = timeline.times[known][error_order]
+    
+    all_users = np.union1d(users, error_users)
+    if len(all_users) == 0:
+        return pd.DataFrame()
+    
+    # Requests per user: users are sorted, so every user is one consecutive segment
+    starts = np.searchsorted(users, all_users)
+    requests = np.searchsorted(users, all_users, side='right') - starts
+    stats = grouped_statistics(np.split(times, starts[1:]), [50, 95])
+    gaps = np.zeros(len(timestamps))
+    if len(timestamps) > 1:
+        gaps[1:] = np.where(users[1:] == users[:-1], np.diff(timestamps), 0.0)
+    run_p95 = LatencyHistogram.from_samples(times).percentile(95) if len(times) else np.nan
+    slow = _segment_reduce(np.add, (times > run_p95).astype(np.int64), starts, requests)
+    
+    # Errors per user and bursts of errors
+    error_starts = np.searchsorted(error_users, all_users)
+    errors = np.searchsorted(error_users, all_users, side='right') - error_starts
+    new_burst = np.ones(len(error_users), dtype=bool)
+    new_burst[1:] = (error_users[1:] != error_users[:-1]) | (np.diff(error_times) > burst_gap_seconds)
+    burst_starts = np.flatnonzero(new_burst)
+    burst_sizes = np.diff(np.append(burst_starts, len(error_users)))
+    burst_users = error_users[burst_starts]
+    user_burst_starts = np.searchsorted(burst_users, all_users)
+    user_bursts = np.searchsorted(burst_users, all_users, side='right') - user_burst_starts
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sessions = pd.DataFrame({
+            'User': all_users.astype(np.int64),
+            'Requests': requests,
+            'Errors': errors,
+            'Error Rate (%)': np.where(requests + errors > 0, 100.0 * errors / (requests + errors), 0.0),
+            'Mean (ms)': stats['mean'],
+            'P50 (ms)': stats['percentiles'][:, 0],
+            'P95 (ms)': stats['percentiles'][:, 1],
+            'Max (ms)': _segment_reduce(np.maximum, times, starts, requests, np.nan),
+            'Slow Requests (%)': np.where(requests > 0, 100.0 * slow / requests, np.nan),
+            'First Seen (s)': _segment_reduce(np.minimum, timestamps, starts, requests, np.nan),
+            'Last Seen (s)': _segment_reduce(np.maximum, timestamps, starts, requests, np.nan),
+            'Max Gap (s)': np.where(requests > 1, _segment_reduce(np.maximum, gaps, starts, requests), np.nan),
+            'Last Request': [request_types[codes[start + count - 1]] if count else ''
+                             for start, count in zip(starts, requests)],
+            'Error Bursts': _segment_reduce(np.add, (burst_sizes > 1).astype(np.int64), user_burst_starts, user_bursts),
+            'Longest Burst': _segment_reduce(np.maximum, burst_sizes, user_burst_starts, user_bursts),
+        })
+    
+    # Slow sessions: robust outliers of the (log) p95 among users with enough requests
+    eligible = (sessions['Requests'] >= SESSION_MIN_REQUESTS).to_numpy()
+    log_p95 = np.log(sessions['P95 (ms)'].to_numpy() + 1.0)
+    flagged = np.zeros(len(sessions), dtype=bool)
+    if eligible.sum() >= 3:
+        median = np.median(log_p95[eligible])
+        mad = 1.4826 * np.median(np.abs(log_p95[eligible] - median))
+        if mad > 0:
+            flagged = eligible & (log_p95 > median + SESSION_OUTLIER_MADS * mad)
+    sessions['Slow Session'] = flagged
+    return sessions
+
+
+def print_session_report(file_data_list: List[FileData], session_frames: List[pd.DataFrame],
+                         output_dir: Path = None, max_rows: int = 10):
+    """Print how latency and errors are spread over the locust users of every file."""
+    typer.echo("\n" + "="*80)
+    typer.echo("USER SESSIONS")
+    typer.echo("="*80)
+    
+    float_format = lambda v: f"{v:.1f}"
+    for i, (file_data, sessions) in enumerate(zip(file_data_list, session_frames), 1):
+        typer.echo(f"\n[{i}] FILE: {file_data.file_label} ({file_data.file_path.name})")
+        typer.echo("-" * 60)
+        if sessions.empty:
+            typer.echo("No user ids found.")
+            continue
+        
+        with_requests = sessions[sessions['Requests'] > 0]
+        typer.echo(f"Users: {len(sessions)} ({len(with_requests)} with requests, "
+                   f"{int((sessions['Errors'] > 0).sum())} with errors)")
+        if with_requests.empty:
+            typer.echo("Response lines carry no user ids, only errors are attributed to users "
+                       "(the locustfile has to log 'userN: (METHOD name) Response time X ms').")
+        else:
+            # Share of the slow requests (above the run p95) held by the slowest tenth of the users
+            slow_counts = np.sort((with_requests['Slow Requests (%)'] * with_requests['Requests'] / 100.0).to_numpy())[::-1]
+            top_users = max(1, int(np.ceil(len(slow_counts) / 10)))
+            if slow_counts.sum() > 0:
+                share = 100.0 * slow_counts[:top_users].sum() / slow_counts.sum()
+                typer.echo(f"Requests slower than the run p95: {share:.1f}% come from the slowest {top_users} "
+                           f"user(s) ({100.0 * top_users / len(slow_counts):.1f}% if spread evenly)")
+            
+            slow_sessions = sessions[sessions['Slow Session']].sort_values('P95 (ms)', ascending=False)
+            typer.echo(f"\nSlow sessions (log p95 more than {SESSION_OUTLIER_MADS:g} MADs above the median user, "
+                       f"at least {SESSION_MIN_REQUESTS} requests): {len(slow_sessions)}")
+            if not slow_sessions.empty:
+                typer.echo(slow_sessions.drop(columns=['Slow Session']).head(max_rows)
+                           .to_string(index=False, na_rep='-', float_format=float_format))
+        
+        bursts = sessions[sessions['Longest Burst'] > 1].sort_values(['Longest Burst', 'Errors'], ascending=False)
+        if not bursts.empty:
+            typer.echo("\nLongest error bursts:")
+            typer.echo(bursts[['User', 'Requests', 'Errors', 'Error Bursts', 'Longest Burst', 'Last Request']]
+                       .head(max_rows).to_string(index=False))
+    
+    frames = [sessions.assign(File=file_data.file_label)
+              for file_data, sessions in zip(file_data_list, session_frames) if not sessions.empty]
+    if output_dir is not None and frames:
+        sessions_file = output_dir / 'user_sessions.csv'
+        sessions_df = pd.concat(frames)
+        sessions_df.insert(0, 'File', sessions_df.pop('File'))
+        sessions_df.to_csv(sessions_file, index=False)
+        typer.echo(f"\nUser sessions saved to: {sessions_file}")
+
+
+# Font sizes of the publication-ready charts
+BAR_CHART_FONT_SIZES = {
+    'font.size': 16,
+    'axes.titlesize': 16,
+    'axes.labelsize': 18,
+    'xtick.labelsize': 16,
+    'ytick.labelsize': 16,
+    'legend.fontsize': 14,
+}
+PLOT_FONT_SIZES = {
+    'font.size': 18,
+    'axes.titlesize': 18,
+    'axes.labelsize': 18,
+    'xtick.labelsize': 16,
+    'ytick.labelsize': 16,
+    'legend.fontsize': 12,
+}
+
+# Text rendering of publication-ready charts:
+# - latex: LaTeX with the times package (needs a TeX installation, one LaTeX run per new text)
+# - mathtext: matplotlib's own text and math rendering with Times-like fonts (STIX as fallback),
+#   embedded as TrueType; parsed text and glyphs are cached by matplotlib across figures
+PUBLICATION_BACKENDS = {
+    'latex': {
+        'font.serif': ['Times', 'Times New Roman', 'DejaVu Serif'],
+        'mathtext.fontset': 'dejavuserif',
+        # LaTeX text rendering for crisp output
+        'text.usetex': True,
+        'text.latex.preamble': r'\usepackage{times}',
+    },
+    'mathtext': {
+        'font.serif': ['Times New Roman', 'Times', 'Nimbus Roman', 'STIXGeneral', 'DejaVu Serif'],
+        'mathtext.fontset': 'stix',
+        'text.usetex': False,
+    },
+}
+
+
+def apply_publication_style(font_sizes: Dict[str, int], backend: str = 'latex'):
+    """Set the rcParams of publication-ready charts (font sizes and text rendering backend)."""
+    plt.rcParams.update({
+        **font_sizes,
+        'font.family': 'serif',
+        **PUBLICATION_BACKENDS[backend],
+        'pdf.fonttype': 42,     # TrueType fonts (not bitmap)
+        'ps.fonttype': 42,      # TrueType fonts (not bitmap)
+        'svg.fonttype': 'none', # Keep text as text in SVG
+        'axes.unicode_minus': False,  # ASCII hyphen instead of U+2212 with mathtext, LaTeX typesets its own minus
+    })
+
+
+# Manifest in the output directory recording the inputs and options of every cached chart
+CHART_MANIFEST_FILE = 'chart_manifest.json'
+
+
+def file_data_digest(file_data: FileData) -> str:
+    """SHA-256 digest of the parsed data of a file (response times, timestamps and errors)."""
+    digest = hashlib.sha256()
+    digest.update(file_data.file_label.encode('utf-8'))
+    for request_type in sorted(file_data.response_times):
+        digest.update(request_type.encode('utf-8') + b'\0')
+        for chunk in iter_column_chunks(file_data.response_times[request_type]):
+            digest.update(chunk.tobytes())
+        for chunk in iter_column_chunks((file_data.response_timestamps or {}).get(request_type, [])):
+            digest.update(chunk.tobytes())
+    digest.update(json.dumps(asdict(file_data.error_stats), sort_keys=True).encode('utf-8'))
+    if file_data.error_timeline is not None:
+        for values in (file_data.error_timeline.times, file_data.error_timeline.categories,
+                       file_data.error_timeline.users):
+            digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
+
+
+def chart_cache_key(chart_type: str, file_data_list: List[FileData], options: dict) -> str:
+    """
+    Key of a chart: digest of the input data, the rendering options and the rendering code.
+    
+    The digest of this script and the matplotlib version are part of the key,
+    so charts are rendered again after changes to the chart functions.
+    """
+    for file_data in file_data_list:
+        if file_data.data_digest is None:
+            file_data.data_digest = file_data_digest(file_data)
+    key_data = {
+        'chart': chart_type,
+        'options': options,
+        'inputs': [file_data.data_digest for file_data in file_data_list],
+        'code': hashlib.sha256(Path(__file__).read_bytes()).hexdigest(),
+        'matplotlib': plt.matplotlib.__version__,
+    }
+    return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def load_chart_manifest(output_dir: Path) -> dict:
+    manifest_file = output_dir / CHART_MANIFEST_FILE
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def is_chart_cached(output_dir: Path, output_file: Path, cache_key: str, export_svg: bool) -> bool:
+    """Check whether output_file (and its SVG if requested) was rendered with cache_key."""
+    entry = load_chart_manifest(output_dir).get(output_file.name)
+    if entry is None or entry.get('key') != cache_key or not output_file.exists():
+        return False
+    if export_svg and not (entry.get('svg') and output_file.with_suffix('.svg').exists()):
+        return False
+    return True
+
+
+def record_chart(output_dir: Path, output_file: Path, cache_key: str, chart_type: str,
+                 file_data_list: List[FileData], options: dict, export_svg: bool):
+    """Record a rendered chart with its key, options and inputs in the chart manifest."""
+    manifest = load_chart_manifest(output_dir)
+    manifest[output_file.name] = {
+        'key': cache_key,
+        'chart': chart_type,
+        'options': options,
+        'svg': export_svg,
+        'rendered_at': datetime.now().isoformat(timespec='seconds'),
+        'inputs': [{
+            'label': file_data.file_label,
+            'source_file': str(file_data.file_path),
+            'digest': file_data.data_digest,
+            'requests': sum(len(times) for times in file_data.response_times.values()),
+            'errors': file_data.error_stats.total_errors,
+        } for file_data in file_data_list],
+    }
+    manifest_file = output_dir / CHART_MANIFEST_FILE
+    temp_file = manifest_file.with_suffix('.json.tmp')
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    temp_file.replace(manifest_file)
+
+
+def create_multi_file_bar_chart(file_data_list: List[FileData], output_dir: Path, 
+                                omit_request_count_per_bar_labels: bool = False,
+                                simple_title: bool = False,
+                                publication_ready: bool = False,
+                                export_svg: bool = False,
+                                metric_type: str = "average",
+                                use_cache: bool = False,
+                                publication_backend: str = 'latex',
+                                whiskers: str = 'none'):
+    """Create and save bar charts for multiple files using textures to distinguish files.
+    
+    metric_type is 'average', 'median' or a percentile like 'p95'. whiskers
+    adds the interquartile range ('iqr') or the 95% confidence interval of
+    the metric ('ci') to every bar.
+    
+    With use_cache, the chart is only rendered if no chart of the same input
+    data and options exists in output_dir (see chart_manifest.json).
+    """
+    
+    # Generate output filename for multiple files
+    if len(file_data_list) == 1:
+        output_filename = f'{file_data_list[0].file_label}_locust_analysis_results.pdf'
+    else:
+        file_labels = '_vs_'.join([fd.file_label for fd in file_data_list[:3]])  # Limit to first 3 for filename
+        if len(file_data_list) > 3:
+            file_labels += '_and_more'
+        output_filename = f'multi_file_comparison_{file_labels}.pdf'
+    
+    output_file = output_dir / output_filename
+    
+    if use_cache:
+        chart_options = {'omit_request_count_per_bar_labels': omit_request_count_per_bar_labels,
+                         'simple_title': simple_title, 'publication_ready': publication_ready,
+                         'metric_type': metric_type, 'whiskers': whiskers,
+                         'publication_backend': publication_backend if publication_ready else None}
+        cache_key = chart_cache_key('bar_chart', file_data_list, chart_options)
+        if is_chart_cached(output_dir, output_file, cache_key, export_svg and publication_ready):
+            typer.echo(f"Multi-file chart is up to date, skipping: {output_file}")
+            return
     
     # Check if there are any errors across all files
     total_errors_across_files = sum(file_data.error_stats.total_errors for file_data in file_data_list)
@@ -314,24 +3008,7 @@ def create_multi_file_bar_chart(file_data_list: List[FileData], output_dir: Path
     
     # Set publication-ready styling
     if publication_ready:
-        plt.rcParams.update({
-            'font.size': 16,
-            'axes.titlesize': 16,
-            'axes.labelsize': 18,
-            'xtick.labelsize': 16,
-            'ytick.labelsize': 16,
-            'legend.fontsize': 14,
-            'font.family': 'serif',
-            'font.serif': ['Times', 'Times New Roman', 'DejaVu Serif'],
-            'mathtext.fontset': 'dejavuserif',
-            # LaTeX text rendering for crisp output
-            'text.usetex': True,
-            'text.latex.preamble': r'\usepackage{times}',
-            'pdf.fonttype': 42,     # TrueType fonts (not bitmap)
-            'ps.fonttype': 42,      # TrueType fonts (not bitmap)
-            'svg.fonttype': 'none', # Keep text as text in SVG
-            'axes.unicode_minus': False,  # Use LaTeX minus sign
-        })
+        apply_publication_style(BAR_CHART_FONT_SIZES, publication_backend)
         # Adjust figure size based on whether we have errors
         if has_errors:
             figsize = (12, 8)  # Standard two-subplot size
@@ -372,33 +3049,52 @@ def create_multi_file_bar_chart(file_data_list: List[FileData], output_dir: Path
         if len(file_data_list) > 8:
             # Use colormap for many categories
             colors = plt.colormaps['tab10'](np.linspace(0, 1, len(file_data_list)))
+        
+        # Metric and whiskers of all (file, request type) bars in one vectorized pass
+        percentile = metric_percentile(metric_type.lower())
+        groups = [(i, request_type) for i, file_data in enumerate(file_data_list) for request_type in all_request_types
+                  if request_type in file_data.response_times and file_data.response_times[request_type]]
+        statistics = grouped_statistics([file_data_list[i].response_times[request_type] for i, request_type in groups],
+                                        [50.0 if percentile is None else percentile, 25.0, 75.0],
+                                        confidence_q=percentile)
+        if percentile is None:
+            metric_values = statistics['mean']
+            confidence_interval = (statistics['mean_ci_low'], statistics['mean_ci_high'])
+        else:
+            metric_values = statistics['percentiles'][:, 0]
+            confidence_interval = (statistics.get('ci_low'), statistics.get('ci_high'))
+        if whiskers == 'iqr':
+            whisker_bounds = (statistics['percentiles'][:, 1], statistics['percentiles'][:, 2])
+        elif whiskers == 'ci':
+            whisker_bounds = confidence_interval
+        else:
+            whisker_bounds = None
+        group_index = {group: index for index, group in enumerate(groups)}
 
         for i, file_data in enumerate(file_data_list):
             file_response_times = []
             file_request_counts = []
+            file_whiskers = [[], []]
             file_total_requests = 0
 
             color_to_use = colors[i]
             
             for request_type in all_request_types:
-                if request_type in file_data.response_times and file_data.response_times[request_type]:
-                    times = file_data.response_times[request_type]
-                    count = len(times)
-                    
-                    # Calculate the selected metric
-                    if metric_type.lower() == 'median':
-                        sorted_times = sorted(times)
-                        n = len(sorted_times)
-                        if n % 2 == 0:
-                            response_time_value = (sorted_times[n//2 - 1] + sorted_times[n//2]) / 2
-                        else:
-                            response_time_value = sorted_times[n//2]
-                    else:  # average
-                        response_time_value = sum(times) / len(times)
+                index = group_index.get((i, request_type))
+                if index is not None:
+                    count = int(statistics['count'][index])
+                    response_time_value = float(metric_values[index])
                 else:
                     response_time_value = 0
                     count = 0
                 
+                if whisker_bounds is not None:
+                    # Error bar lengths below and above the bar (the IQR need not contain the average)
+                    low = whisker_bounds[0][index] if index is not None else response_time_value
+                    high = whisker_bounds[1][index] if index is not None else response_time_value
+                    file_whiskers[0].append(max(0.0, response_time_value - low))
+                    file_whiskers[1].append(max(0.0, high - response_time_value))
+                
                 file_response_times.append(response_time_value)
                 file_request_counts.append(count)
                 file_total_requests += count
@@ -413,7 +3109,9 @@ def create_multi_file_bar_chart(file_data_list: List[FileData], output_dir: Path
             bars = ax1.bar(x_positions + i * bar_width, file_response_times, 
                           bar_width, label=file_data.file_label,
                           color=color_to_use, alpha=alpha_val, hatch=hatch, 
-                          edgecolor='black', linewidth=edge_width)
+                          edgecolor='black', linewidth=edge_width,
+                          yerr=file_whiskers if whisker_bounds is not None else None,
+                          error_kw={'elinewidth': edge_width, 'capsize': 2, 'ecolor': 'black'})
            
             # Add value labels on bars (omit response time labels in publication mode for cleaner appearance)
             for j, (bar, response_time, count) in enumerate(zip(bars, file_response_times, file_request_counts)):
@@ -422,7 +3120,8 @@ def create_multi_file_bar_chart(file_data_list: List[FileData], output_dir: Path
                     
                     # Only show response time labels if not in publication mode
                     if not publication_ready:
-                        ax1.text(bar.get_x() + bar.get_width()/2., height + height*0.01,
+                        label_height = height + (file_whiskers[1][j] if whisker_bounds is not None else 0)
+                        ax1.text(bar.get_x() + bar.get_width()/2., label_height + height*0.01,
                                 f'{response_time:.0f}ms', ha='center', va='bottom', fontsize=8, fontweight='bold')
                    
                     if not omit_request_count_per_bar_labels:
@@ -563,17 +3262,6 @@ def create_multi_file_bar_chart(file_data_list: List[FileData], output_dir: Path
         else:
             plt.tight_layout(pad=1.0)
     
-    # Generate output filename for multiple files
-    if len(file_data_list) == 1:
-        output_filename = f'{file_data_list[0].file_label}_locust_analysis_results.pdf'
-    else:
-        file_labels = '_vs_'.join([fd.file_label for fd in file_data_list[:3]])  # Limit to first 3 for filename
-        if len(file_data_list) > 3:
-            file_labels += '_and_more'
-        output_filename = f'multi_file_comparison_{file_labels}.pdf'
-    
-    output_file = output_dir / output_filename
-    
     # Save with publication-quality settings optimized for small two-column figures
     if publication_ready:
         plt.savefig(output_file, format='pdf', 
@@ -595,6 +3283,10 @@ def create_multi_file_bar_chart(file_data_list: List[FileData], output_dir: Path
     
     typer.echo(f"Multi-file chart saved to: {output_file}")
     
+    if use_cache:
+        record_chart(output_dir, output_file, cache_key, 'bar_chart', file_data_list, chart_options,
+                     export_svg and publication_ready)
+    
     # Show the plot
     # plt.show()
 
@@ -616,33 +3308,42 @@ def _get_subplot_position_info(subplot_index: int, rows: int, cols: int) -> dict
 
 def create_scatter_plot(file_data_list: List[FileData], output_dir: Path,
                         publication_ready: bool = False,
-                        export_svg: bool = False):
+                        export_svg: bool = False,
+                        use_cache: bool = False,
+                        publication_backend: str = 'latex'):
     """Create and save scatter/line plots for response times over relative time.
     
     Optimizes subplot axes by hiding:
     - X-axis labels and ticks for plots in the top rows
     - Y-axis labels and ticks for plots in the rightmost columns
+    
+    With use_cache, the plot is only rendered if no plot of the same input
+    data and options exists in output_dir (see chart_manifest.json).
     """
+    
+    # Generate output filename
+    if len(file_data_list) == 1:
+        output_filename = f'{file_data_list[0].file_label}_scatter_plot.pdf'
+    else:
+        file_labels = '_vs_'.join([fd.file_label for fd in file_data_list[:3]])
+        if len(file_data_list) > 3:
+            file_labels += '_and_more'
+        output_filename = f'scatter_plot_{file_labels}.pdf'
+    
+    output_file = output_dir / output_filename
+    
+    if use_cache:
+        chart_options = {'publication_ready': publication_ready,
+                         'publication_backend': publication_backend if publication_ready else None,
+                         'change_points': [file_data.change_points for file_data in file_data_list]}
+        cache_key = chart_cache_key('scatter_plot', file_data_list, chart_options)
+        if is_chart_cached(output_dir, output_file, cache_key, export_svg and publication_ready):
+            typer.echo(f"Scatter plot is up to date, skipping: {output_file}")
+            return
    
     # Set publication-ready styling
     if publication_ready:
-        plt.rcParams.update({
-            'font.size': 18,
-            'axes.titlesize': 18,
-            'axes.labelsize': 18,
-            'xtick.labelsize': 16,
-            'ytick.labelsize': 16,
-            'legend.fontsize': 12,
-            'font.family': 'serif',
-            'font.serif': ['Times', 'Times New Roman', 'DejaVu Serif'],
-            'mathtext.fontset': 'dejavuserif',
-            'text.usetex': True,
-            'text.latex.preamble': r'\usepackage{times}',
-            'pdf.fonttype': 42,
-            'ps.fonttype': 42,
-            'svg.fonttype': 'none',
-            'axes.unicode_minus': False,
-        })
+        apply_publication_style(PLOT_FONT_SIZES, publication_backend)
     
     # Calculate subplot layout based on number of files
     num_files = len(file_data_list)
@@ -683,7 +3384,7 @@ def create_scatter_plot(file_data_list: List[FileData], output_dir: Path,
         if file_data.response_times:
             for times in file_data.response_times.values():
                 if times:
-                    global_max_time = max(global_max_time, max(times))
+                    global_max_time = max(global_max_time, column_max(times))
     
     # Plot each file in its own subplot
     for i, file_data in enumerate(file_data_list):
@@ -725,13 +3426,15 @@ def create_scatter_plot(file_data_list: List[FileData], output_dir: Path,
                 
                 if min_len > 0:
                     color = request_colors[request_type_index % len(request_colors)]
-                    scatter = ax.scatter(timestamps[:min_len], response_times[:min_len], 
-                                       alpha=0.7, s=15, color=color, marker='o')
+                    # Spilled columns are plotted chunk by chunk
+                    for times_chunk, timestamps_chunk in iter_paired_chunks(response_times, timestamps):
+                        scatter = ax.scatter(timestamps_chunk, times_chunk,
+                                           alpha=0.7, s=15, color=color, marker='o')
                     legend_elements.append((scatter, request_type))
                     request_type_index += 1
         
         # Plot errors as red X markers
-        if file_data.error_timestamps:
+        if file_data.error_timestamps is not None and len(file_data.error_timestamps) > 0:
             # Use a high value for error visualization
             error_response_times = [global_max_time * 1.1] * len(file_data.error_timestamps)
             # error_response_times = [0] * len(file_data.error_timestamps)
@@ -739,6 +3442,10 @@ def create_scatter_plot(file_data_list: List[FileData], output_dir: Path,
                                      color='red', marker='x', s=30, alpha=0.8)
             legend_elements.append((error_scatter, 'Errors'))
         
+        change_point_line = draw_change_points(ax, file_data.change_points)
+        if change_point_line is not None:
+            legend_elements.append((change_point_line, 'Change points'))
+        
         # Formatting for each subplot with optimized axis labels
         # Only show x-axis labels for bottom row
         if pos_info['is_bottom_row']:
@@ -786,14 +3493,152 @@ def create_scatter_plot(file_data_list: List[FileData], output_dir: Path,
     else:
         plt.tight_layout(pad=0.1)  # Minimal padding for single subplot
     
+    # Save with publication-quality settings
+    if publication_ready:
+        plt.savefig(output_file, format='pdf', 
+                   bbox_inches='tight', dpi=600, facecolor='white',
+                   edgecolor='none', pad_inches=0.02, transparent=False)
+        
+        if export_svg:
+            svg_file = output_file.with_suffix('.svg')
+            plt.savefig(svg_file, format='svg', bbox_inches='tight',
+                       facecolor='white', edgecolor='none', pad_inches=0.02)
+            typer.echo(f"SVG version saved to: {svg_file}")
+    else:
+        plt.savefig(output_file, format='pdf', bbox_inches='tight')
+    
+    typer.echo(f"Scatter plot saved to: {output_file}")
+    plt.close()
+    
+    if use_cache:
+        record_chart(output_dir, output_file, cache_key, 'scatter_plot', file_data_list, chart_options,
+                     export_svg and publication_ready)
+
+
+def create_heatmap_plot(file_data_list: List[FileData], output_dir: Path,
+                        publication_ready: bool = False,
+                        export_svg: bool = False,
+                        time_bins: int = 120,
+                        latency_bins: int = 60,
+                        publication_backend: str = 'latex'):
+    """Create and save latency-over-time heatmaps (one column per file, one row per request type).
+    
+    Each heatmap is a 2-D histogram of time bucket x log-scaled latency bucket,
+    computed with vectorized binning, so the rendering cost depends on the
+    number of bins instead of the number of requests. A strip with the error
+    count per time bucket is shown underneath each file column.
+    """
+    from matplotlib.colors import LogNorm
+    
+    # Set publication-ready styling
+    if publication_ready:
+        apply_publication_style(PLOT_FONT_SIZES, publication_backend)
+    
+    all_request_types = set()
+    for file_data in file_data_list:
+        if file_data.response_timestamps:
+            all_request_types.update(file_data.response_timestamps.keys())
+    all_request_types = sorted(all_request_types)
+    
+    # Common bin edges so that all heatmaps are directly comparable
+    max_time = 0.0
+    min_latency = np.inf
+    max_latency = 0.0
+    for file_data in file_data_list:
+        for request_type, timestamps in (file_data.response_timestamps or {}).items():
+            times = file_data.response_times.get(request_type, [])
+            if len(timestamps) > 0 and len(times) > 0:
+                histogram = response_time_histogram(times)
+                max_time = max(max_time, column_max(timestamps))
+                min_latency = min(min_latency, histogram.min)
+                max_latency = max(max_latency, histogram.max)
+        if file_data.error_timestamps is not None and len(file_data.error_timestamps) > 0:
+            max_time = max(max_time, float(np.max(file_data.error_timestamps)))
+    
+    if not all_request_types or max_latency <= 0:
+        typer.echo("No response time data with timestamps found, skipping heatmap.")
+        return
+    
+    time_edges = np.linspace(0.0, max_time if max_time > 0 else 1.0, time_bins + 1)
+    # Response times are logged in whole milliseconds; 0 ms is put into the first bucket
+    latency_edges = np.geomspace(max(min_latency, 1.0), max(max_latency, 2.0) * 1.0001, latency_bins + 1)
+    
+    histograms = {}
+    max_count = 1
+    for i, file_data in enumerate(file_data_list):
+        for request_type in all_request_types:
+            timestamps = (file_data.response_timestamps or {}).get(request_type, [])
+            times = file_data.response_times.get(request_type, [])
+            min_len = min(len(timestamps), len(times))
+            if min_len == 0:
+                continue
+            counts = np.zeros((time_bins, latency_bins))
+            for times_chunk, timestamps_chunk in iter_paired_chunks(times, timestamps):
+                chunk_counts, _, _ = np.histogram2d(timestamps_chunk, np.maximum(times_chunk, latency_edges[0]),
+                                                    bins=[time_edges, latency_edges])
+                counts += chunk_counts
+            histograms[(i, request_type)] = counts
+            max_count = max(max_count, int(counts.max()))
+    
+    num_files = len(file_data_list)
+    num_types = len(all_request_types)
+    figsize = (4 * num_files + 2, 1.8 * num_types + 1.5) if publication_ready else (5 * num_files + 2, 2.2 * num_types + 2)
+    fig = plt.figure(figsize=figsize)
+    grid = fig.add_gridspec(num_types + 1, num_files, height_ratios=[3] * num_types + [1.5],
+                            hspace=0.08, wspace=0.05)
+    norm = LogNorm(vmin=1, vmax=max_count)
+    mesh = None
+    
+    for i, file_data in enumerate(file_data_list):
+        for j, request_type in enumerate(all_request_types):
+            ax = fig.add_subplot(grid[j, i])
+            counts = histograms.get((i, request_type))
+            if counts is not None:
+                # Empty buckets are left blank instead of being drawn in the lowest color
+                mesh = ax.pcolormesh(time_edges, latency_edges, np.ma.masked_equal(counts.T, 0),
+                                     cmap='viridis', norm=norm)
+            else:
+                ax.text(0.5, 0.5, 'No data', ha='center', va='center', transform=ax.transAxes)
+            ax.set_yscale('log')
+            ax.set_ylim(latency_edges[0], latency_edges[-1])
+            ax.set_xlim(time_edges[0], time_edges[-1])
+            draw_change_points(ax, file_data.change_points)
+            ax.tick_params(axis='x', which='both', bottom=False, labelbottom=False)
+            if i == 0:
+                ax.set_ylabel(f'{request_type}\n(ms)')
+            else:
+                ax.tick_params(axis='y', which='both', left=False, labelleft=False)
+            if j == 0:
+                # Place title inside the plot area instead of above
+                ax.text(0.02, 0.98, file_data.file_label, transform=ax.transAxes,
+                       fontweight='bold', verticalalignment='top',
+                       bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.8))
+        
+        # Error strip: number of errors per time bucket
+        error_ax = fig.add_subplot(grid[num_types, i])
+        error_timestamps = file_data.error_timestamps if file_data.error_timestamps is not None else []
+        error_counts, _ = np.histogram(np.asarray(error_timestamps, dtype=np.float64), bins=time_edges)
+        error_ax.bar(time_edges[:-1], error_counts, width=np.diff(time_edges), align='edge',
+                     color='red', alpha=0.8)
+        error_ax.set_xlim(time_edges[0], time_edges[-1])
+        draw_change_points(error_ax, file_data.change_points)
+        error_ax.set_xlabel('Time (seconds from start)')
+        if i == 0:
+            error_ax.set_ylabel('Errors')
+        error_ax.grid(axis='y', alpha=0.3, linestyle='--', linewidth=0.5)
+    
+    if mesh is not None:
+        colorbar = fig.colorbar(mesh, ax=fig.axes, fraction=0.02, pad=0.01)
+        colorbar.set_label('Requests per bucket')
+    
     # Generate output filename
     if len(file_data_list) == 1:
-        output_filename = f'{file_data_list[0].file_label}_scatter_plot.pdf'
+        output_filename = f'{file_data_list[0].file_label}_latency_heatmap.pdf'
     else:
         file_labels = '_vs_'.join([fd.file_label for fd in file_data_list[:3]])
         if len(file_data_list) > 3:
             file_labels += '_and_more'
-        output_filename = f'scatter_plot_{file_labels}.pdf'
+        output_filename = f'latency_heatmap_{file_labels}.pdf'
     
     output_file = output_dir / output_filename
     
@@ -811,33 +3656,127 @@ def create_scatter_plot(file_data_list: List[FileData], output_dir: Path,
     else:
         plt.savefig(output_file, format='pdf', bbox_inches='tight')
     
-    typer.echo(f"Scatter plot saved to: {output_file}")
+    typer.echo(f"Latency heatmap saved to: {output_file}")
+    plt.close()
+
+
+def create_error_timeline_plot(file_data_list: List[FileData], output_dir: Path,
+                               publication_ready: bool = False,
+                               export_svg: bool = False,
+                               bin_seconds: float = 10.0,
+                               publication_backend: str = 'latex'):
+    """Create and save stacked error-rate timelines (errors per time bin and category, one subplot per file)."""
+    
+    # Set publication-ready styling
+    if publication_ready:
+        apply_publication_style(PLOT_FONT_SIZES, publication_backend)
+    
+    # Common time axis for all files
+    end_time = 0.0
+    for file_data in file_data_list:
+        for timestamps in (file_data.response_timestamps or {}).values():
+            if len(timestamps) > 0:
+                end_time = max(end_time, column_max(timestamps))
+        if file_data.error_timeline is not None and len(file_data.error_timeline) > 0:
+            end_time = max(end_time, float(file_data.error_timeline.times.max()))
+    
+    series = []
+    used_categories = set()
+    for file_data in file_data_list:
+        timeline = file_data.error_timeline if file_data.error_timeline is not None else ErrorTimeline.empty()
+        bin_edges, counts = timeline.rate_series(bin_seconds, end_time)
+        series.append((bin_edges, counts))
+        used_categories.update(np.flatnonzero(counts.sum(axis=1)).tolist())
+    
+    if not used_categories:
+        typer.echo("No errors with timestamps found, skipping error timeline.")
+        return
+    
+    used_categories = sorted(used_categories)
+    category_colors = plt.colormaps['tab20'](np.linspace(0, 1, len(ERROR_CATEGORIES)))
+    
+    num_files = len(file_data_list)
+    figsize = (12, 2.5 * num_files + 1) if publication_ready else (14, 3 * num_files + 1)
+    fig, axes = plt.subplots(num_files, 1, figsize=figsize, sharex=True, squeeze=False)
+    axes = axes[:, 0]
+    
+    for ax, file_data, (bin_edges, counts) in zip(axes, file_data_list, series):
+        # Errors per second in each bin, stacked by category
+        rates = counts[used_categories] / bin_seconds
+        # Repeat the last bin so that the step plot covers the full last bin
+        rates = np.concatenate([rates, rates[:, -1:]], axis=1)
+        ax.stackplot(bin_edges, rates, step='post',
+                     labels=[ERROR_CATEGORY_LABELS[ERROR_CATEGORIES[c]] for c in used_categories],
+                     colors=category_colors[used_categories], alpha=0.85)
+        draw_change_points(ax, file_data.change_points)
+        ax.set_ylabel('Errors/s')
+        ax.grid(True, alpha=0.3, linestyle='--', linewidth=0.5)
+        ax.margins(y=0.3)
+        # Place title inside the plot area instead of above
+        ax.text(0.02, 0.98, f'{file_data.file_label} ({int(counts.sum())} errors)', transform=ax.transAxes,
+               fontweight='bold', verticalalignment='top',
+               bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.8))
+    
+    axes[-1].set_xlabel(f'Time (seconds from start, {bin_seconds:g}s bins)')
+    axes[0].legend(loc='upper right', ncol=min(len(used_categories), 3), frameon=True)
+    
+    if publication_ready:
+        plt.tight_layout(pad=1.5)
+    else:
+        plt.tight_layout(pad=1.0)
+    
+    # Generate output filename
+    if len(file_data_list) == 1:
+        output_filename = f'{file_data_list[0].file_label}_error_timeline.pdf'
+    else:
+        file_labels = '_vs_'.join([fd.file_label for fd in file_data_list[:3]])
+        if len(file_data_list) > 3:
+            file_labels += '_and_more'
+        output_filename = f'error_timeline_{file_labels}.pdf'
+    
+    output_file = output_dir / output_filename
+    
+    # Save with publication-quality settings
+    if publication_ready:
+        plt.savefig(output_file, format='pdf', 
+                   bbox_inches='tight', dpi=600, facecolor='white',
+                   edgecolor='none', pad_inches=0.02, transparent=False)
+        
+        if export_svg:
+            svg_file = output_file.with_suffix('.svg')
+            plt.savefig(svg_file, format='svg', bbox_inches='tight',
+                       facecolor='white', edgecolor='none', pad_inches=0.02)
+            typer.echo(f"SVG version saved to: {svg_file}")
+    else:
+        plt.savefig(output_file, format='pdf', bbox_inches='tight')
+    
+    typer.echo(f"Error timeline saved to: {output_file}")
     plt.close()
 
 
-def _calculate_file_statistics(response_times: Dict[str, List[float]]) -> pd.DataFrame:
-    """Calculate average and median response times for each request type (helper function)."""
+def _calculate_file_statistics(response_times: Dict[str, List[float]], metric_type: str = "average") -> pd.DataFrame:
+    """Calculate average and median (and the percentile of metric_type) response times for each request type (helper function)."""
     stats = []
     
-    for request_type, times in response_times.items():
-        if times:  # Only process if there are response times
-            sorted_times = sorted(times)
-            n = len(sorted_times)
-            
-            # Calculate median
-            if n % 2 == 0:
-                median_time = (sorted_times[n//2 - 1] + sorted_times[n//2]) / 2
-            else:
-                median_time = sorted_times[n//2]
-            
-            stats.append({
-                'Request Type': request_type,
-                'Average Response Time (ms)': sum(times) / len(times),
-                'Median Response Time (ms)': median_time,
-                'Min Response Time (ms)': min(times),
-                'Max Response Time (ms)': max(times),
-                'Count': len(times)
-            })
+    request_types = [request_type for request_type, times in response_times.items() if times]
+    percentile = metric_percentile(metric_type)
+    extra_percentile = percentile not in (None, 50.0)
+    q = [50, 0, 100] + ([percentile] if extra_percentile else [])
+    statistics = grouped_statistics([response_times[request_type] for request_type in request_types], q)
+    
+    for index, request_type in enumerate(request_types):
+        median_time, min_time, max_time = statistics['percentiles'][index, :3]
+        row = {
+            'Request Type': request_type,
+            'Average Response Time (ms)': statistics['mean'][index],
+            'Median Response Time (ms)': median_time,
+            'Min Response Time (ms)': min_time,
+            'Max Response Time (ms)': max_time,
+            'Count': int(statistics['count'][index])
+        }
+        if extra_percentile:
+            row[f'{metric_type.title()} Response Time (ms)'] = statistics['percentiles'][index, 3]
+        stats.append(row)
     
     if not stats:
         return pd.DataFrame(columns=['Request Type', 'Average Response Time (ms)', 'Median Response Time (ms)', 'Min Response Time (ms)', 'Max Response Time (ms)', 'Count'])
@@ -857,7 +3796,7 @@ def print_multi_file_summary(file_data_list: List[FileData], metric_type: str =
         typer.echo("-" * 60)
         
         # Calculate stats for this file
-        stats_df = _calculate_file_statistics(file_data.response_times)
+        stats_df = _calculate_file_statistics(file_data.response_times, metric_type)
         
         if not stats_df.empty:
             total_requests = stats_df['Count'].sum()
@@ -893,6 +3832,18 @@ def print_multi_file_summary(file_data_list: List[FileData], metric_type: str =
                 typer.echo(f"  HTTP Errors: {error_stats.total_http_errors}")
             if error_stats.total_functional_errors > 0:
                 typer.echo(f"  Functional Errors: {error_stats.total_functional_errors}")
+        
+        # When did the errors of each category occur?
+        timeline = file_data.error_timeline
+        if timeline is not None and len(timeline) > 0:
+            bin_seconds = 60.0
+            _, counts = timeline.rate_series(bin_seconds)
+            typer.echo("  Error timeline (first / last occurrence, peak per minute):")
+            for code in np.flatnonzero(counts.sum(axis=1)):
+                category_times = timeline.times[timeline.categories == code]
+                typer.echo(f"    {ERROR_CATEGORY_LABELS[ERROR_CATEGORIES[code]]}: "
+                          f"{category_times.min():.0f}s / {category_times.max():.0f}s, "
+                          f"peak {counts[code].max()} at minute {counts[code].argmax() + 1}")
     
     # Always show combined statistics section
     typer.echo("\n" + "="*60)
@@ -933,29 +3884,110 @@ def analyze(
     output_dir: Path = typer.Option(None, "--output-dir", "-o", help="Directory to save the chart (defaults to first log file directory)"),
     publication_ready: bool = typer.Option(False, "--publication", "-p", help="Generate publication-ready plots with academic styling"),
     export_svg: bool = typer.Option(False, "--svg", help="Also export SVG format for better LaTeX compatibility"),
-    metric_type: str = typer.Option("average", "--metric-type", "-m", help="Response time metric to plot ('average' or 'median')", case_sensitive=False),
-    scatter_plot: bool = typer.Option(False, "--scatter-plot", help="Generate scatter/line plot of response times over time instead of bar charts")
+    publication_backend: str = typer.Option("latex", "--publication-backend", help="Text rendering of publication-ready plots: 'latex' (needs a TeX installation) or 'mathtext' (same Times look without LaTeX, much faster)", case_sensitive=False),
+    metric_type: str = typer.Option("average", "--metric-type", "-m", help="Response time metric to plot ('average', 'median' or a percentile like 'p95' or 'p99.9')", case_sensitive=False),
+    whiskers: str = typer.Option("none", "--whiskers", help="Whiskers on the bars: 'none', 'iqr' (interquartile range) or 'ci' (95% confidence interval of the metric)", case_sensitive=False),
+    scatter_plot: bool = typer.Option(False, "--scatter-plot", help="Generate scatter/line plot of response times over time instead of bar charts"),
+    error_timeline: bool = typer.Option(False, "--error-timeline", help="Also generate a stacked timeline of the error rate per error category"),
+    error_bin_seconds: float = typer.Option(10.0, "--error-bin-seconds", help="Width of the time bins of the error timeline in seconds"),
+    top_k: int = typer.Option(0, "--top-k", help="Report the k slowest requests per file and request type and how they cluster in time (0 disables the tail report)"),
+    outlier_gap_seconds: float = typer.Option(5.0, "--outlier-gap-seconds", help="Outliers further apart than this many seconds start a new cluster in the tail report"),
+    change_points: bool = typer.Option(False, "--change-points", help="Detect shifts of the p95 latency and error rate over time (e.g. noisy-neighbor interference), report the segments and mark them in the plots"),
+    change_point_window: float = typer.Option(10.0, "--change-point-window", help="Width of the time windows of the change-point detection in seconds"),
+    change_point_penalty: float = typer.Option(3.0, "--change-point-penalty", help="Penalty per change point in units of log(windows); larger values report fewer change points"),
+    expected_interval_ms: float = typer.Option(None, "--expected-interval-ms", help="Expected interval between the requests of a locust user in ms: also report percentiles corrected for coordinated omission (requests that users could not send while waiting for slow responses)"),
+    sessions: bool = typer.Option(False, "--sessions", help="Reconstruct the session of every locust user (latency, errors, error bursts) and flag users that are much slower than the others. Needs a locustfile that logs the user id on response lines ('userN: (GET home) Response time X ms'); otherwise only errors are attributed to users"),
+    error_burst_gap: float = typer.Option(5.0, "--error-burst-gap", help="Errors of a user less than this many seconds apart belong to the same error burst"),
+    heatmap: bool = typer.Option(False, "--heatmap", help="Generate latency-over-time heatmaps (time bucket x log latency bucket) instead of bar charts"),
+    heatmap_time_bins: int = typer.Option(120, "--heatmap-time-bins", help="Number of time buckets of the heatmaps"),
+    heatmap_latency_bins: int = typer.Option(60, "--heatmap-latency-bins", help="Number of log-scaled latency buckets of the heatmaps"),
+    input_format: str = typer.Option("auto", "--input-format", help="Format of the input files: 'auto' (detect per file), 'locust-log', 'request-csv', 'stats-history' or 'locust-json'", case_sensitive=False),
+    warmup_seconds: float = typer.Option(None, "--warmup-seconds", help="Drop the first seconds of every file as warm-up instead of cutting at the warm-up marker (without a marker, the steady state is detected from the data)"),
+    merge_workers: bool = typer.Option(False, "--merge-workers", help="Treat the logs of the workers of a distributed locust run (same name apart from the worker suffix) as one run, merged by timestamp"),
+    worker_pattern: str = typer.Option(WORKER_SUFFIX_PATTERN, "--worker-pattern", help="Regular expression of the worker suffix in the log file names for --merge-workers"),
+    no_chart_cache: bool = typer.Option(False, "--no-chart-cache", help="Always render bar charts and scatter plots, even if an identical chart exists in the output directory"),
+    summary_dir: Path = typer.Option(None, "--summary-dir", help="Also write a mergeable JSON summary per log file to this directory (see the aggregate command)"),
+    metrics_textfile: Path = typer.Option(None, "--metrics-textfile", help="Also write latency histograms, throughput and error counts of every file in the Prometheus text format (e.g. a *.prom file for the node-exporter textfile collector)"),
+    db_file: Path = typer.Option(None, "--db", help="Also store the parsed runs in this SQLite database (same as the import command, without parsing the logs again)"),
+    max_memory: str = typer.Option(None, "--max-memory", help="Cap the memory used for the response records (e.g. 2Gi): they are spilled to disk while parsing and statistics and charts stream over them"),
+    spill_dir: Path = typer.Option(None, "--spill-dir", help="Directory for the spilled response records of --max-memory (defaults to the system temp directory)")
 ):
     """
     Analyze one or more locust log files and create visualizations showing:
-    1. Bar charts: Average or median response times per request type (with request counts displayed)
+    1. Bar charts: Average, median or percentile response times per request type (with request counts displayed)
        and total number of errors by category
     2. Scatter plots: Response times over relative time with error markers (--scatter-plot option)
+    3. Heatmaps: Request density per time and latency bucket with an error strip (--heatmap option)
+    4. Error timelines: Stacked error rate per error category over time (--error-timeline option)
     
     When multiple files are provided, data from all files will be plotted
     in the same chart with different colors/patterns to distinguish between files.
     
     Features:
     - Bar chart mode: Total request count in title, request counts within bars, 
-      choice between average and median response times
+      choice between average, median and percentile (e.g. p95) response times,
+      optional IQR or confidence interval whiskers
     - Scatter plot mode: Response times plotted over relative time, errors shown as red X markers
+    - Heatmap mode: Density of response times over time, scales with the number of bins for long runs
+    - Change-point detection (--change-points): segments with before/after p95 and error rate, marked in the plots
+    - Coordinated omission correction (--expected-interval-ms): corrected and raw percentiles side by side
+    - User sessions (--sessions): per-user latency and error bursts, e.g. to find sessions stuck on a slow replica
+      (needs a locustfile that logs the user id on the response lines)
     - Publication-ready styling and SVG export options
+    - Memory cap (--max-memory) for logs larger than RAM, with the same results as in memory
+    - Warm-up cut-off at the warm-up marker, detected from the data if the marker is missing,
+      or set with --warmup-seconds
+    - Distributed runs (--merge-workers): the worker logs of a run are merged into one run
     """
     
     # Validate metric type
     metric_type_lower = metric_type.lower()
-    if metric_type_lower not in ['average', 'median']:
-        typer.echo(f"Error: Invalid metric type '{metric_type}'. Must be 'average' or 'median'.", err=True)
+    try:
+        metric_percentile(metric_type_lower)
+    except ValueError:
+        typer.echo(f"Error: Invalid metric type '{metric_type}'. Must be 'average', 'median' or a percentile like 'p95'.", err=True)
+        raise typer.Exit(1)
+    
+    whiskers = whiskers.lower()
+    if whiskers not in BAR_WHISKERS:
+        typer.echo(f"Error: Invalid whiskers '{whiskers}'. Must be one of: {', '.join(BAR_WHISKERS)}.", err=True)
+        raise typer.Exit(1)
+    
+    input_format = input_format.lower()
+    if input_format != 'auto' and input_format not in LOG_LOADERS:
+        typer.echo(f"Error: Invalid input format '{input_format}'. Must be 'auto' or one of: {', '.join(LOG_LOADERS)}.", err=True)
+        raise typer.Exit(1)
+    
+    if heatmap_time_bins < 1 or heatmap_latency_bins < 1:
+        typer.echo("Error: --heatmap-time-bins and --heatmap-latency-bins must be at least 1.", err=True)
+        raise typer.Exit(1)
+    
+    if change_point_window <= 0:
+        typer.echo("Error: --change-point-window must be positive.", err=True)
+        raise typer.Exit(1)
+    
+    if error_bin_seconds <= 0:
+        typer.echo("Error: --error-bin-seconds must be positive.", err=True)
+        raise typer.Exit(1)
+    
+    if expected_interval_ms is not None and expected_interval_ms <= 0:
+        typer.echo("Error: --expected-interval-ms must be positive.", err=True)
+        raise typer.Exit(1)
+    
+    if warmup_seconds is not None and warmup_seconds < 0:
+        typer.echo("Error: --warmup-seconds must not be negative.", err=True)
+        raise typer.Exit(1)
+    
+    if merge_workers:
+        try:
+            re.compile(worker_pattern)
+        except re.error as e:
+            typer.echo(f"Error: Invalid worker pattern '{worker_pattern}': {e}", err=True)
+            raise typer.Exit(1)
+    
+    publication_backend = publication_backend.lower()
+    if publication_backend not in PUBLICATION_BACKENDS:
+        typer.echo(f"Error: Invalid publication backend '{publication_backend}'. Must be one of: {', '.join(PUBLICATION_BACKENDS)}.", err=True)
         raise typer.Exit(1)
     
     # Validate input files
@@ -981,39 +4013,392 @@ def analyze(
     
     typer.echo(f"Output directory: {output_dir}")
     
-    # Parse all log files using the multi-file parser
-    typer.echo("\nParsing log files...")
-    file_data_list = parse_multiple_log_files(log_files)
+    spill = open_spill_store(max_memory, spill_dir)
+    try:
+        # Parse all log files using the multi-file parser
+        typer.echo("\nParsing log files...")
+        file_data_list = parse_multiple_log_files(log_files, input_format, spill, warmup_seconds,
+                                                  worker_pattern if merge_workers else None)
+        
+        # Check if any files have data
+        has_data = False
+        for file_data in file_data_list:
+            if file_data.response_times or file_data.error_stats.total_errors > 0:
+                has_data = True
+                break
+        
+        if not has_data:
+            typer.echo("No response time data or errors found in any log file.")
+            typer.echo("Please check the log file formats.")
+            raise typer.Exit(1)
+        
+        # Change points are detected before plotting so that the plots can mark them
+        segment_frames = []
+        if change_points:
+            for file_data in file_data_list:
+                file_data.change_points, segments = detect_change_points(file_data, change_point_window,
+                                                                         change_point_penalty)
+                segment_frames.append(segments)
+        
+        # Create and save charts using appropriate chart function
+        scatter_points = sum(len(times) for file_data in file_data_list for times in file_data.response_times.values())
+        if scatter_plot and spill is not None and scatter_points * SCATTER_PLOT_BYTES_PER_POINT > spill.max_memory:
+            # Matplotlib holds all points of a scatter plot in memory, so it cannot stay under the cap
+            typer.echo(f"\nSkipping scatter plot: {scatter_points:,} points do not fit into --max-memory {max_memory} "
+                       f"(use --heatmap instead).", err=True)
+        elif scatter_plot:
+            typer.echo("\nCreating scatter plot...")
+            create_scatter_plot(file_data_list, output_dir, 
+                              publication_ready=publication_ready, 
+                              export_svg=export_svg,
+                              use_cache=not no_chart_cache,
+                              publication_backend=publication_backend)
+        if heatmap:
+            typer.echo("\nCreating latency heatmap...")
+            create_heatmap_plot(file_data_list, output_dir,
+                                publication_ready=publication_ready,
+                                export_svg=export_svg,
+                                time_bins=heatmap_time_bins,
+                                latency_bins=heatmap_latency_bins,
+                                publication_backend=publication_backend)
+        if not scatter_plot and not heatmap:
+            typer.echo("\nCreating bar charts...")
+            # Use consistent styling for all cases (simplified for better readability)
+            create_multi_file_bar_chart(file_data_list, output_dir, omit_request_count_per_bar_labels=True, 
+                                       simple_title=True, publication_ready=publication_ready, 
+                                       export_svg=export_svg, metric_type=metric_type_lower,
+                                       use_cache=not no_chart_cache,
+                                       publication_backend=publication_backend,
+                                       whiskers=whiskers)
+        if error_timeline:
+            typer.echo("\nCreating error timeline...")
+            create_error_timeline_plot(file_data_list, output_dir,
+                                       publication_ready=publication_ready,
+                                       export_svg=export_svg,
+                                       bin_seconds=error_bin_seconds,
+                                       publication_backend=publication_backend)
+        
+        # Print summary using multi-file summary function
+        print_multi_file_summary(file_data_list, metric_type_lower)
+        
+        if top_k > 0:
+            print_tail_report(file_data_list, top_k, outlier_gap_seconds, output_dir)
+        
+        if change_points:
+            print_change_point_report(file_data_list, segment_frames, change_point_window, output_dir)
+        
+        if expected_interval_ms is not None:
+            print_corrected_latency_report(file_data_list, expected_interval_ms, output_dir)
+        
+        if sessions and spill is not None and scatter_points * SESSION_BYTES_PER_REQUEST > spill.max_memory:
+            # The requests of all users are sorted by user and time in memory
+            typer.echo(f"\nSkipping user sessions: {scatter_points:,} requests do not fit into --max-memory {max_memory}.",
+                       err=True)
+        elif sessions:
+            session_frames = [reconstruct_sessions(file_data, error_burst_gap) for file_data in file_data_list]
+            print_session_report(file_data_list, session_frames, output_dir)
+        
+        if summary_dir is not None:
+            typer.echo("\nSaving run summaries...")
+            for file_data in file_data_list:
+                summary_file = save_run_summary(build_run_summary(file_data), summary_dir)
+                typer.echo(f"Run summary saved to: {summary_file}")
+        
+        if metrics_textfile is not None:
+            write_metrics_textfile([build_run_summary(file_data) for file_data in file_data_list], metrics_textfile)
+            typer.echo(f"\nPrometheus metrics saved to: {metrics_textfile}")
+        
+        if db_file is not None:
+            typer.echo("\nImporting runs into the results database...")
+            connection = open_results_db(db_file)
+            try:
+                for file_data in file_data_list:
+                    with connection:
+                        run_id = import_run(connection, file_data)
+                    typer.echo(f"  Imported {file_data.file_path} as run {run_id}")
+                run_count = connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+            finally:
+                connection.close()
+            typer.echo(f"{len(file_data_list)} run(s) imported, {run_count} run(s) in {db_file}")
+        
+        typer.echo(f"\n✅ Analysis complete! Results saved to {output_dir}")
+    finally:
+        if spill is not None:
+            spill.close()
+
+@app.command()
+def aggregate(
+    summary_files: List[Path] = typer.Argument(..., help="Run summary files (*.summary.json) or directories containing them"),
+    output_csv: Path = typer.Option(None, "--output-csv", help="Also save the aggregated statistics as CSV")
+):
+    """
+    Aggregate repeated runs from their run summaries (written by analyze --summary-dir).
     
-    # Check if any files have data
-    has_data = False
-    for file_data in file_data_list:
-        if file_data.response_times or file_data.error_stats.total_errors > 0:
-            has_data = True
-            break
+    Runs with the same experiment type and load profile are grouped. For each
+    group and request type, pooled percentiles are computed from the merged
+    histograms and the spread between the runs is reported. The raw log files
+    are not needed.
+    """
+    paths = []
+    for summary_file in summary_files:
+        if summary_file.is_dir():
+            paths.extend(sorted(summary_file.glob('*.summary.json')))
+        elif summary_file.is_file():
+            paths.append(summary_file)
+        else:
+            typer.echo(f"Error: Summary file '{summary_file}' does not exist.", err=True)
+            raise typer.Exit(1)
     
-    if not has_data:
-        typer.echo("No response time data or errors found in any log file.")
-        typer.echo("Please check the log file formats.")
+    if not paths:
+        typer.echo("No run summaries found.", err=True)
         raise typer.Exit(1)
     
-    # Create and save charts using appropriate chart function
-    if scatter_plot:
-        typer.echo("\nCreating scatter plot...")
-        create_scatter_plot(file_data_list, output_dir, 
-                          publication_ready=publication_ready, 
-                          export_svg=export_svg)
-    else:
-        typer.echo("\nCreating bar charts...")
-        # Use consistent styling for all cases (simplified for better readability)
-        create_multi_file_bar_chart(file_data_list, output_dir, omit_request_count_per_bar_labels=True, 
-                                   simple_title=True, publication_ready=publication_ready, 
-                                   export_svg=export_svg, metric_type=metric_type_lower)
+    summaries = [load_run_summary(path) for path in paths]
+    aggregate_df = aggregate_run_summaries(summaries)
+    print_aggregate_summary(summaries, aggregate_df)
+    
+    if output_csv is not None:
+        aggregate_df.to_csv(output_csv, index=False)
+        typer.echo(f"\nAggregated statistics saved to: {output_csv}")
+
+@app.command("import")
+def import_logs(
+    log_files: List[Path] = typer.Argument(..., help="Log files or directories to search for LoadTester_Logs*/locust_*.log files"),
+    db_file: Path = typer.Option(Path("experiment_results.sqlite"), "--db", help="SQLite database the runs are stored in"),
+    input_format: str = typer.Option("auto", "--input-format", help="Format of the input files: 'auto' (detect per file), 'locust-log', 'request-csv', 'stats-history' or 'locust-json'", case_sensitive=False),
+    warmup_seconds: float = typer.Option(None, "--warmup-seconds", help="Drop the first seconds of every file as warm-up instead of cutting at the warm-up marker (without a marker, the steady state is detected from the data)"),
+    merge_workers: bool = typer.Option(False, "--merge-workers", help="Treat the logs of the workers of a distributed locust run (same name apart from the worker suffix) as one run, merged by timestamp"),
+    worker_pattern: str = typer.Option(WORKER_SUFFIX_PATTERN, "--worker-pattern", help="Regular expression of the worker suffix in the log file names for --merge-workers"),
+    max_memory: str = typer.Option(None, "--max-memory", help="Cap the memory used for the response records (e.g. 2Gi) by spilling them to disk while parsing"),
+    spill_dir: Path = typer.Option(None, "--spill-dir", help="Directory for the spilled response records of --max-memory (defaults to the system temp directory)")
+):
+    """
+    Parse runs and store them in a local SQLite database for queries across experiments.
+    
+    The database holds the individual records, the statistics per request type,
+    the error statistics and the error timeline of every run, indexed by
+    experiment type, tfvars name, request type and time. Importing a run
+    again replaces it.
+    """
+    input_format = input_format.lower()
+    if input_format != 'auto' and input_format not in LOG_LOADERS:
+        typer.echo(f"Error: Invalid input format '{input_format}'. Must be 'auto' or one of: {', '.join(LOG_LOADERS)}.", err=True)
+        raise typer.Exit(1)
     
-    # Print summary using multi-file summary function
-    print_multi_file_summary(file_data_list, metric_type_lower)
+    if warmup_seconds is not None and warmup_seconds < 0:
+        typer.echo("Error: --warmup-seconds must not be negative.", err=True)
+        raise typer.Exit(1)
+    
+    if merge_workers:
+        try:
+            re.compile(worker_pattern)
+        except re.error as e:
+            typer.echo(f"Error: Invalid worker pattern '{worker_pattern}': {e}", err=True)
+            raise typer.Exit(1)
+    
+    paths = []
+    for log_file in log_files:
+        if log_file.is_dir():
+            paths.extend(sorted(path for logs_dir in log_file.rglob('LoadTester_Logs*') if logs_dir.is_dir()
+                                for path in logs_dir.glob('locust_*.log')))
+        elif log_file.is_file():
+            paths.append(log_file)
+        else:
+            typer.echo(f"Error: Log file '{log_file}' does not exist.", err=True)
+            raise typer.Exit(1)
+    
+    if not paths:
+        typer.echo("No log files found.", err=True)
+        raise typer.Exit(1)
+    
+    runs = group_worker_logs(paths, worker_pattern) if merge_workers else [(path, [path]) for path in paths]
+    
+    spill = open_spill_store(max_memory, spill_dir)
+    connection = open_results_db(db_file)
+    try:
+        for _, run_paths in runs:
+            # One run at a time, so only the records of the current run are held
+            file_data, = parse_multiple_log_files(run_paths, input_format, spill, warmup_seconds,
+                                                  worker_pattern if merge_workers else None)
+            with connection:
+                run_id = import_run(connection, file_data)
+            requests = sum(len(times) for times in file_data.response_times.values())
+            typer.echo(f"  Imported {file_data.file_path} as run {run_id} "
+                       f"({requests:,} records, {file_data.error_stats.total_errors} errors)")
+        run_count = connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+    finally:
+        connection.close()
+        if spill is not None:
+            spill.close()
+    typer.echo(f"\n{len(runs)} run(s) imported, {run_count} run(s) in {db_file}")
+
+
+@app.command()
+def query(
+    sql: str = typer.Argument(None, help="SQL query to run (default: statistics per experiment, tfvars file, load profile and request type)"),
+    db_file: Path = typer.Option(Path("experiment_results.sqlite"), "--db", help="SQLite database created by the import command"),
+    output_csv: Path = typer.Option(None, "--output-csv", help="Also save the query result as CSV")
+):
+    """
+    Query the runs stored by the import command.
+    
+    Tables: runs, records, stats, error_stats and errors (joined by run_id).
+    """
+    if not db_file.is_file():
+        typer.echo(f"Error: Database '{db_file}' does not exist.", err=True)
+        raise typer.Exit(1)
+    
+    connection = open_results_db(db_file)
+    try:
+        result = pd.read_sql_query(sql or DEFAULT_RESULTS_QUERY, connection)
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
+        typer.echo(f"Error: Query failed: {e}", err=True)
+        raise typer.Exit(1)
+    finally:
+        connection.close()
+    
+    with pd.option_context('display.max_rows', None, 'display.max_columns', None, 'display.width', None):
+        typer.echo(result.to_string(index=False, float_format=lambda v: f"{v:.1f}"))
+    
+    if output_csv is not None:
+        result.to_csv(output_csv, index=False)
+        typer.echo(f"\nQuery result saved to: {output_csv}")
+
+@app.command()
+def efficiency(
+    summary_files: List[Path] = typer.Argument(..., help="Run summary files (*.summary.json) or directories containing them"),
+    tfvars_dir: Path = typer.Option(Path("terraform_teastore/experiment"), "--tfvars-dir", help="Directory with the tfvars files of the experiments"),
+    slo_p95_ms: float = typer.Option(None, "--slo-p95-ms", help="SLO for the P95 response time over all requests in milliseconds"),
+    max_error_rate: float = typer.Option(None, "--max-error-rate", help="SLO for the error rate (fraction of requests, e.g. 0.01)"),
+    output_csv: Path = typer.Option(None, "--output-csv", help="Also save the efficiency table as CSV")
+):
+    """
+    Relate the resources allocated to TeaStore (from the tfvars files) to the measured latency and throughput.
+    
+    Runs are grouped by experiment configuration (the experiment directory,
+    e.g. cpu-with-resources-<tfvars name>). Reports throughput per allocated
+    core and GiB and P95 per millicore and GiB. Configurations are grouped by
+    the resources they request (CPU and memory, CPU only, memory only); per
+    group, they are ranked by allocation, a latency-versus-allocation model is
+    fitted and the cheapest configuration that meets the SLO is named.
+    """
+    paths = []
+    for summary_file in summary_files:
+        if summary_file.is_dir():
+            paths.extend(sorted(summary_file.glob('*.summary.json')))
+        elif summary_file.is_file():
+            paths.append(summary_file)
+        else:
+            typer.echo(f"Error: Summary file '{summary_file}' does not exist.", err=True)
+            raise typer.Exit(1)
+    
+    if not paths:
+        typer.echo("No run summaries found.", err=True)
+        raise typer.Exit(1)
+    
+    efficiency_df = score_efficiency([load_run_summary(path) for path in paths], tfvars_dir,
+                                     slo_p95_ms=slo_p95_ms, max_error_rate=max_error_rate)
+    if efficiency_df.empty:
+        typer.echo("No runs with a known resource allocation found.", err=True)
+        raise typer.Exit(1)
+    print_efficiency_report(efficiency_df, slo_p95_ms=slo_p95_ms, max_error_rate=max_error_rate)
+    
+    if output_csv is not None:
+        efficiency_df.to_csv(output_csv, index=False)
+        typer.echo(f"\nEfficiency table saved to: {output_csv}")
+
+@app.command("compare-baseline")
+def compare_baseline(
+    baseline_file: Path = typer.Argument(..., help="Reference summary (JSON) to compare with, or to write with --save"),
+    inputs: List[Path] = typer.Argument(..., help="Log files, run summary files (*.summary.json) or directories containing summaries"),
+    save: bool = typer.Option(False, "--save", help="Store the pooled inputs as the new reference summary instead of comparing"),
+    p95_tolerance: float = typer.Option(0.10, "--p95-tolerance", help="Allowed relative growth of the p95 per request type (0.10 = 10%)"),
+    error_rate_tolerance: float = typer.Option(0.01, "--error-rate-tolerance", help="Allowed absolute growth of the error rate (0.01 = 1 percentage point)"),
+    alpha: float = typer.Option(0.05, "--alpha", help="Significance level of the tail exceedance and two-proportion tests"),
+    min_requests: int = typer.Option(30, "--min-requests", help="Do not test request types with fewer requests"),
+    input_format: str = typer.Option("auto", "--input-format", help="Format of input log files: 'auto' (detect per file), 'locust-log', 'request-csv', 'stats-history' or 'locust-json'", case_sensitive=False),
+    output_csv: Path = typer.Option(None, "--output-csv", help="Also save the diff table as CSV")
+):
+    """
+    Check runs against a stored baseline and exit with code 1 on a latency or error rate regression.
+    
+    With --save, the inputs (e.g. the repeats of a Baseline run) are pooled
+    into a reference summary with the exact latency histograms per request
+    type and the error counts. Without it, every input run is compared with
+    the reference: the p95 of each request type (tolerance plus a test of
+    the share of requests above the baseline p95) and the error rate
+    (tolerance plus a two-proportion z-test).
+    """
+    input_format = input_format.lower()
+    if input_format != 'auto' and input_format not in LOG_LOADERS:
+        typer.echo(f"Error: Invalid input format '{input_format}'. Must be 'auto' or one of: {', '.join(LOG_LOADERS)}.", err=True)
+        raise typer.Exit(1)
+    
+    summaries = load_run_summaries(inputs, input_format)
+    if not summaries:
+        typer.echo("No runs found.", err=True)
+        raise typer.Exit(1)
     
-    typer.echo(f"\n✅ Analysis complete! Results saved to {output_dir}")
+    if save:
+        baseline = merge_run_summaries(summaries)
+        baseline_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_file, 'w', encoding='utf-8') as f:
+            json.dump(baseline.to_dict(), f, separators=(',', ':'))
+        requests = sum(histogram.count for histogram in baseline.histograms.values())
+        typer.echo(f"Baseline of {len(summaries)} run(s) ({requests:,} requests, "
+                   f"{baseline.error_stats.total_errors} errors) saved to: {baseline_file}")
+        return
+    
+    if not baseline_file.is_file():
+        typer.echo(f"Error: Baseline '{baseline_file}' does not exist (create it with --save).", err=True)
+        raise typer.Exit(1)
+    baseline = load_run_summary(baseline_file)
+    
+    typer.echo("\n" + "="*80)
+    typer.echo(f"BASELINE COMPARISON (p95 +{p95_tolerance:.0%}, error rate +{error_rate_tolerance * 100:g} pp, alpha {alpha:g})")
+    typer.echo(f"Baseline: {baseline_file} ({baseline.experiment_type}, {baseline.run_name})")
+    typer.echo("="*80)
+    
+    frames = []
+    regressions = 0
+    for i, summary in enumerate(summaries, 1):
+        diff_df, regressed = compare_to_baseline(baseline, summary, p95_tolerance=p95_tolerance,
+                                                 error_rate_tolerance=error_rate_tolerance, alpha=alpha,
+                                                 min_requests=min_requests)
+        typer.echo(f"\n[{i}] RUN: {summary.experiment_type}/{summary.run_name}")
+        typer.echo("-" * 60)
+        typer.echo(diff_df.to_string(index=False, na_rep='-', float_format=lambda v: f"{v:.3g}" if abs(v) < 0.01 else f"{v:.2f}"))
+        typer.echo(f"Result: {'❌ REGRESSION' if regressed else '✅ OK'}")
+        regressions += regressed
+        diff_df.insert(0, 'Run', f"{summary.experiment_type}/{summary.run_name}")
+        frames.append(diff_df)
+    
+    if output_csv is not None:
+        pd.concat(frames).to_csv(output_csv, index=False)
+        typer.echo(f"\nDiff table saved to: {output_csv}")
+    
+    if regressions:
+        typer.echo(f"\n❌ {regressions} of {len(summaries)} run(s) regressed against the baseline.")
+        raise typer.Exit(1)
+    typer.echo(f"\n✅ No regressions in {len(summaries)} run(s).")
+
+@app.command("serve-metrics")
+def serve_metrics(
+    summary_dirs: List[Path] = typer.Argument(..., help="Directories with run summaries (written by analyze --summary-dir)"),
+    host: str = typer.Option("0.0.0.0", "--host", help="Address the exporter listens on"),
+    port: int = typer.Option(9108, "--port", help="Port the exporter listens on")
+):
+    """
+    Serve the run summaries as OpenMetrics on /metrics for Prometheus.
+    
+    Exports the latency histogram, request count and throughput per request
+    type and the error counts per category of every run.
+    """
+    for summary_dir in summary_dirs:
+        if not summary_dir.is_dir():
+            typer.echo(f"Error: Summary directory '{summary_dir}' does not exist.", err=True)
+            raise typer.Exit(1)
+    serve_openmetrics(summary_dirs, host=host, port=port)
 
 if __name__ == "__main__":
     app()
@@ -5,12 +5,33 @@ Response Time Statistics Calculator
 Calculates comprehensive statistics for network response time measurements,
 including averages, standard deviation (jitter), min/max values, and
 coefficient of variation for consistency analysis.
+
+With --adaptive, the script measures the endpoint itself (TCP connect, time
+to first byte and total time via http.client) and keeps sampling until the
+95% confidence interval of the mean or median is narrower than a target, or
+until a time budget runs out. The report includes the achieved precision.
 """
 
 import sys
+import math
+import time
+import socket
+import argparse
 import statistics
+import http.client
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+from urllib.parse import urlsplit
+
+
+CONFIDENCE = 0.95
+
+# Metrics that can be measured, named like the columns of the report
+METRICS = {
+    'total': 'Total Response Time',
+    'connect': 'TCP Connection Time',
+    'ttfb': 'Time to First Byte',
+}
 
 
 def calculate_stats(values: List[float]) -> Dict[str, float]:
@@ -28,6 +49,65 @@ def calculate_stats(values: List[float]) -> Dict[str, float]:
     }
 
 
+def t_quantile(p: float, df: int) -> float:
+    """Quantile of Student's t distribution (exact for 1 and 2 degrees of freedom, else Cornish-Fisher expansion)."""
+    if df <= 0:
+        return float('inf')
+    if df == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+    z = statistics.NormalDist().inv_cdf(p)
+    return (z
+            + (z ** 3 + z) / (4 * df)
+            + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2)
+            + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * df ** 3)
+            + (79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5 - 1920 * z ** 3 - 945 * z) / (92160 * df ** 4))
+
+
+def mean_confidence_interval(values: List[float], confidence: float = CONFIDENCE) -> Tuple[float, float]:
+    """Confidence interval of the mean (t approximation)."""
+    if len(values) < 2:
+        return float('-inf'), float('inf')
+    mean = statistics.mean(values)
+    half_width = t_quantile(0.5 + confidence / 2, len(values) - 1) * statistics.stdev(values) / math.sqrt(len(values))
+    return mean - half_width, mean + half_width
+
+
+def median_confidence_interval(values: List[float], confidence: float = CONFIDENCE) -> Tuple[float, float]:
+    """Distribution-free confidence interval of the median (order statistics at the binomial ranks)."""
+    n = len(values)
+    if n < 2:
+        return float('-inf'), float('inf')
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+    spread = z * math.sqrt(n) / 2
+    ordered = sorted(values)
+    # 1-based ranks of the bounds, converted to 0-based indices
+    low = max(0, math.floor(n / 2 - spread) - 1)
+    high = min(n - 1, math.ceil(n / 2 + spread) - 1)
+    return ordered[low], ordered[high]
+
+
+def confidence_interval(values: List[float], statistic: str = 'mean') -> Tuple[float, float]:
+    if statistic == 'median':
+        return median_confidence_interval(values)
+    return mean_confidence_interval(values)
+
+
+def precision_stats(values: List[float], statistic: str = 'mean') -> Dict[str, float]:
+    """Estimate, confidence interval and its half-width (absolute and relative to the estimate)."""
+    estimate = statistics.median(values) if statistic == 'median' else statistics.mean(values)
+    low, high = confidence_interval(values, statistic)
+    half_width = (high - low) / 2
+    return {
+        'estimate': estimate,
+        'low': low,
+        'high': high,
+        'half_width': half_width,
+        'relative': half_width / estimate if estimate > 0 else float('inf'),
+    }
+
+
 def format_time_stats(stats: Dict[str, float], label: str) -> Dict[str, Any]:
     """Format timing statistics for output."""
     return {
@@ -49,8 +129,9 @@ def format_time_stats(stats: Dict[str, float], label: str) -> Dict[str, Any]:
     }
 
 
-def generate_report(endpoint: str, total_times: List[float], connect_times: List[float], transfer_times: List[float]) -> str:
-    """Generate a complete formatted report."""
+def generate_report(endpoint: str, total_times: List[float], connect_times: List[float], transfer_times: List[float],
+                    statistic: str = 'mean', sampling: Dict[str, Any] = None) -> str:
+    """Generate a complete formatted report (sampling describes an adaptive measurement)."""
     from datetime import datetime
     
     # Calculate statistics for each metric
@@ -102,6 +183,15 @@ def generate_report(endpoint: str, total_times: List[float], connect_times: List
     report.append(f"  - Transfer CV:           {transfer_stats['cv']:.1f}%")
     report.append("")
     
+    # Achieved Precision
+    report.append(f"Achieved Precision ({CONFIDENCE:.0%} confidence interval of the {statistic}):")
+    report.extend(format_precision(total_times, connect_times, transfer_times, statistic))
+    if sampling is not None:
+        report.append(f"  - Stopped after {len(total_times)} measurements in {sampling['elapsed']:.1f}s: {sampling['stop_reason']}")
+        if sampling['failures']:
+            report.append(f"  - Failed measurements: {sampling['failures']}")
+    report.append("")
+    
     # Notes
     report.append("Notes:")
     report.append("  - Total Response Time: Complete round-trip time including all network and HTTP processing")
@@ -109,10 +199,26 @@ def generate_report(endpoint: str, total_times: List[float], connect_times: List
     report.append("  - Time to First Byte: Time until first response byte received (includes HTTP processing)")
     report.append("  - Standard Deviation (±): Measures jitter/variation in response times")
     report.append("  - Coefficient of Variation (CV): Standard deviation as percentage of mean (lower = more consistent)")
+    report.append("  - Precision (±): Half-width of the confidence interval (t approximation for the mean, order statistics for the median)")
     
     return "\n".join(report)
 
 
+def format_precision(total_times: List[float], connect_times: List[float], transfer_times: List[float],
+                     statistic: str = 'mean') -> List[str]:
+    lines = []
+    for label, values in ((METRICS['total'], total_times), (METRICS['connect'], connect_times),
+                          (METRICS['ttfb'], transfer_times)):
+        label = f"{label}:"
+        if len(values) < 2:
+            lines.append(f"  {label:<25} not enough measurements")
+            continue
+        precision = precision_stats(values, statistic)
+        lines.append(f"  {label:<25} {precision['estimate'] * 1000:.2f} ms ±{precision['half_width'] * 1000:.2f} ms "
+                     f"({precision['relative'] * 100:.1f}%, CI {precision['low'] * 1000:.2f} - {precision['high'] * 1000:.2f} ms)")
+    return lines
+
+
 def generate_console_summary(total_times: List[float], connect_times: List[float], transfer_times: List[float]) -> str:
     """Generate summary statistics for console output."""
     total_stats = calculate_stats(total_times)
@@ -123,19 +229,173 @@ def generate_console_summary(total_times: List[float], connect_times: List[float
     summary.append(f"  Average total response time: {total_stats['mean'] * 1000:.2f} ms (±{total_stats['std_dev'] * 1000:.2f} ms jitter)")
     summary.append(f"  Average TCP connection time: {connect_stats['mean'] * 1000:.2f} ms (±{connect_stats['std_dev'] * 1000:.2f} ms jitter)")
     summary.append(f"  Connection consistency: {connect_stats['cv']:.1f}% CV")
+    if len(total_times) > 1:
+        precision = precision_stats(total_times)
+        summary.append(f"  Precision of the average total response time: ±{precision['half_width'] * 1000:.2f} ms "
+                       f"({precision['relative'] * 100:.1f}%, {CONFIDENCE:.0%} confidence, {len(total_times)} measurements)")
     
     return "\n".join(summary)
 
 
+def measure_once(url: str, timeout: float = 10.0) -> Tuple[float, float, float]:
+    """
+    Request url on a new connection and time it like curl's time_total, time_connect and time_starttransfer
+    
+    Returns:
+        tuple: (total, connect, time to first byte) in seconds
+    """
+    parts = urlsplit(url)
+    connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+    connection = connection_class(parts.hostname, parts.port, timeout=timeout)
+    target = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+    try:
+        start = time.perf_counter()
+        connection.connect()
+        connected = time.perf_counter()
+        connection.request('GET', target, headers={'Connection': 'close'})
+        response = connection.getresponse()  # Returns once the status line and headers are read
+        first_byte = time.perf_counter()
+        response.read()
+        end = time.perf_counter()
+    finally:
+        connection.close()
+    if response.status >= 400:
+        raise http.client.HTTPException(f"HTTP {response.status} {response.reason}")
+    return end - start, connected - start, first_byte - start
+
+
+def sample_adaptively(url: str, statistic: str = 'mean', metrics: List[str] = ('total',),
+                      target_ms: float = None, target_relative: float = None, min_samples: int = 10,
+                      max_samples: int = 1000, time_budget: float = 60.0, interval: float = 0.5,
+                      timeout: float = 10.0, max_failures: int = 10, log=print) -> Dict[str, Any]:
+    """
+    Measure url until the confidence intervals of all metrics are narrow enough
+    
+    Sampling stops when the half-width of the confidence interval of the
+    statistic is at most target_ms milliseconds or at most target_relative
+    times the estimate for every metric (after min_samples measurements),
+    or when max_samples, the time budget or max_failures consecutive
+    failures are reached.
+    
+    Returns:
+        dict: lists 'total', 'connect' and 'ttfb' (seconds), 'failures', 'elapsed' and 'stop_reason'
+    """
+    samples = {'total': [], 'connect': [], 'ttfb': []}
+    failures = 0
+    consecutive_failures = 0
+    start = time.monotonic()
+    stop_reason = f"maximum of {max_samples} measurements reached"
+    
+    def precise_enough() -> bool:
+        for metric in metrics:
+            precision = precision_stats(samples[metric], statistic)
+            if target_ms is not None and precision['half_width'] * 1000 <= target_ms:
+                continue
+            if target_relative is not None and precision['relative'] <= target_relative:
+                continue
+            return False
+        return True
+    
+    while len(samples['total']) < max_samples:
+        if time.monotonic() - start >= time_budget:
+            stop_reason = f"time budget of {time_budget:g}s used up"
+            break
+        try:
+            total, connect, ttfb = measure_once(url, timeout)
+        except (OSError, http.client.HTTPException, socket.timeout) as e:
+            failures += 1
+            consecutive_failures += 1
+            log(f"  Measurement failed: {e}")
+            if consecutive_failures >= max_failures:
+                stop_reason = f"{max_failures} consecutive measurements failed"
+                break
+        else:
+            consecutive_failures = 0
+            samples['total'].append(total)
+            samples['connect'].append(connect)
+            samples['ttfb'].append(ttfb)
+            n = len(samples['total'])
+            log(f"  Response time measurement {n}: Total: {total:.6f}s, Connect: {connect:.6f}s, Transfer: {ttfb:.6f}s")
+            if n >= max(min_samples, 2) and precise_enough():
+                stop_reason = "target precision reached"
+                break
+        time.sleep(interval)
+    
+    return {**samples, 'failures': failures, 'elapsed': time.monotonic() - start, 'stop_reason': stop_reason}
+
+
+def adaptive_main(argv: List[str]):
+    arg_parser = argparse.ArgumentParser(
+        prog="calculate_response_stats.py --adaptive",
+        description="Measure an endpoint until the confidence interval of its response time is narrow enough")
+    arg_parser.add_argument("url", help="Endpoint to measure, e.g. http://1.2.3.4/tools.descartes.teastore.webui/status")
+    arg_parser.add_argument("--statistic", choices=["mean", "median"], default="mean",
+                            help="Statistic whose confidence interval is checked (default: mean)")
+    arg_parser.add_argument("--metrics", default="total",
+                            help=f"Comma-separated metrics that must reach the target: {', '.join(METRICS)} (default: total)")
+    arg_parser.add_argument("--target-ms", type=float,
+                            help="Stop when the CI half-width is at most this many milliseconds")
+    arg_parser.add_argument("--target-relative", type=float, default=0.05,
+                            help="Stop when the CI half-width is at most this fraction of the estimate (default: 0.05)")
+    arg_parser.add_argument("--min-samples", type=int, default=10, help="Minimum number of measurements (default: 10)")
+    arg_parser.add_argument("--max-samples", type=int, default=1000, help="Maximum number of measurements (default: 1000)")
+    arg_parser.add_argument("--time-budget", type=float, default=60.0,
+                            help="Stop after this many seconds (default: 60)")
+    arg_parser.add_argument("--interval", type=float, default=0.5,
+                            help="Pause between measurements in seconds (default: 0.5)")
+    arg_parser.add_argument("--timeout", type=float, default=10.0, help="Timeout per request in seconds (default: 10)")
+    arg_parser.add_argument("--file", help="Save the detailed report to this file")
+    args = arg_parser.parse_args(argv)
+    
+    metrics = [metric.strip() for metric in args.metrics.split(',') if metric.strip()]
+    unknown = [metric for metric in metrics if metric not in METRICS]
+    if unknown or not metrics:
+        arg_parser.error(f"unknown metrics: {', '.join(unknown)} (choose from {', '.join(METRICS)})")
+    
+    targets = []
+    if args.target_ms is not None:
+        targets.append(f"±{args.target_ms:g} ms")
+    if args.target_relative is not None:
+        targets.append(f"±{args.target_relative:.0%}")
+    print(f"Sampling {args.url} until the {CONFIDENCE:.0%} CI of the {args.statistic} "
+          f"({', '.join(metrics)}) is within {' or '.join(targets)}, at most {args.time_budget:g}s")
+    
+    sampling = sample_adaptively(args.url, statistic=args.statistic, metrics=metrics,
+                                 target_ms=args.target_ms, target_relative=args.target_relative,
+                                 min_samples=args.min_samples, max_samples=args.max_samples,
+                                 time_budget=args.time_budget, interval=args.interval, timeout=args.timeout)
+    total_times, connect_times, transfer_times = sampling['total'], sampling['connect'], sampling['ttfb']
+    print(f"Stopped after {len(total_times)} measurements in {sampling['elapsed']:.1f}s: {sampling['stop_reason']}")
+    if not total_times:
+        print("Error: No successful timing measurements collected", file=sys.stderr)
+        sys.exit(1)
+    
+    print(generate_console_summary(total_times, connect_times, transfer_times))
+    if args.file:
+        try:
+            with open(args.file, 'w') as f:
+                f.write(generate_report(args.url, total_times, connect_times, transfer_times,
+                                        statistic=args.statistic, sampling=sampling))
+            print(f"  Detailed results saved to: {args.file}")
+        except IOError as e:
+            print(f"  Warning: Could not save detailed report to file: {e}", file=sys.stderr)
+
+
 def main():
     """Main function to process timing data and output statistics."""
+    if len(sys.argv) > 1 and sys.argv[1] == '--adaptive':
+        adaptive_main(sys.argv[2:])
+        return
+    
     if len(sys.argv) < 5:
         print("Usage: python3 calculate_response_stats.py 'total_times' 'connect_times' 'transfer_times' endpoint_url [--file output_file]")
+        print("       python3 calculate_response_stats.py --adaptive endpoint_url [--target-relative 0.05] [--time-budget 60] [--file output_file]")
         print("Example: python3 calculate_response_stats.py '0.089,0.078,0.085' '0.012,0.011,0.013' '0.067,0.056,0.061' 'http://1.2.3.4/status' --file report.txt")
         print("")
         print("Output modes:")
         print("  - Console only: python3 script.py total connect transfer endpoint")
         print("  - File output: python3 script.py total connect transfer endpoint --file output.txt")
+        print("  - Adaptive measurement: python3 script.py --adaptive endpoint --file output.txt (see --adaptive --help)")
         sys.exit(1)
     
     try:
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+TeaStore OOMKilled and Restart Detector
+
+Fetches all pods of the TeaStore namespace with a single API request and
+checks the container statuses (restart counts and the reason of the last
+termination) of every TeaStore service in one pass.
+
+With --watch, a watch stream on the pods stays open (e.g. for the length of
+an experiment) and every container restart is recorded with its timestamps,
+so OOMKilled events can be lined up with the latency data of the load test.
+
+Usage:
+    kubectl proxy --port=8001 &
+    python check_oomkilled.py
+    python check_oomkilled.py --watch --events-file restarts.csv
+"""
+
+import os
+import csv
+import sys
+import time
+import signal
+import argparse
+import http.client
+from datetime import datetime
+
+from k8s_api import KubernetesApiError, add_api_arguments, client_from_arguments
+
+
+# Define the namespace
+NAMESPACE = "teastore"
+
+# Define the service names
+SERVICES = ["registry", "auth", "webui", "recommender", "image", "persistence", "db"]
+
+EVENTS_CSV_HEADER = ["observed_at", "terminated_at", "service", "pod", "container",
+                     "restart_count", "reason", "exit_code"]
+
+
+def parse_k8s_timestamp(value):
+    """Convert an RFC 3339 timestamp of the API (e.g. 2025-10-03T18:50:10Z) to seconds since epoch."""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def service_of_pod(pod_name, services=SERVICES):
+    """Return the TeaStore service a pod belongs to (same substring match as check_oomkilled.sh)."""
+    for service in services:
+        if service in pod_name:
+            return service
+    return None
+
+
+def container_states(pod):
+    """
+    Extract the relevant state of every container of a pod
+
+    Returns:
+        list: dicts with container name, restart count and the last termination (if any)
+    """
+    states = []
+    status = pod.get('status', {})
+    for container in status.get('containerStatuses', []) + status.get('initContainerStatuses', []):
+        terminated = container.get('lastState', {}).get('terminated')
+        if terminated is None:
+            terminated = container.get('state', {}).get('terminated')
+        states.append({
+            'container': container['name'],
+            'restart_count': container.get('restartCount', 0),
+            'terminated': terminated,
+        })
+    return states
+
+
+def check_pods(pods, services=SERVICES):
+    """
+    Check all pods in one pass
+
+    Returns:
+        dict: service -> {'pods': int, 'oomkilled': list, 'restarts': int}
+    """
+    report = {service: {'pods': 0, 'oomkilled': [], 'restarts': 0} for service in services}
+    for pod in pods:
+        pod_name = pod['metadata']['name']
+        service = service_of_pod(pod_name, services)
+        if service is None:
+            continue
+        report[service]['pods'] += 1
+        for state in container_states(pod):
+            report[service]['restarts'] += state['restart_count']
+            terminated = state['terminated']
+            if terminated and terminated.get('reason') == "OOMKilled":
+                report[service]['oomkilled'].append({'pod': pod_name, **state})
+    return report
+
+
+def format_report(report, namespace=NAMESPACE):
+    lines = ["Checking TeaStore services for OOMKilled status...",
+             "================================================"]
+    for service, result in report.items():
+        if result['pods'] == 0:
+            lines.append(f"Checking {service}... ❌ No pods found")
+        elif result['oomkilled']:
+            lines.append(f"Checking {service}... 🚨 OOMKilled detected!")
+            for entry in result['oomkilled']:
+                terminated = entry['terminated']
+                lines.append(f"  └─ Pod: {entry['pod']} (container {entry['container']}) has been OOMKilled")
+                lines.append("     Termination details:")
+                lines.append(f"       Reason:    {terminated.get('reason')}")
+                lines.append(f"       Exit Code: {terminated.get('exitCode')}")
+                lines.append(f"       Started:   {terminated.get('startedAt')}")
+                lines.append(f"       Finished:  {terminated.get('finishedAt')}")
+                lines.append(f"       Restarts:  {entry['restart_count']}")
+        else:
+            restarts = f", {result['restarts']} restart(s)" if result['restarts'] else ""
+            lines.append(f"Checking {service}... ✅ OK ({result['pods']} pod(s) checked{restarts})")
+    lines.append("")
+    lines.append("Summary:")
+    lines.append("========")
+    lines.append(f"Checked {len(report)} TeaStore services in namespace '{namespace}'")
+    lines.append(f"Services: {' '.join(report)}")
+    return "\n".join(lines)
+
+
+class RestartWatcher:
+    """Tracks restart counts per container and records every restart seen on the watch stream."""
+
+    def __init__(self, client, namespace=NAMESPACE, services=SERVICES):
+        self.client = client
+        self.namespace = namespace
+        self.services = services
+        self.restart_counts = {}
+        self.events = []
+        self.listed = False
+
+    def _pods_path(self):
+        return f"/api/v1/namespaces/{self.namespace}/pods"
+
+    def list_pods(self, on_event=None):
+        """
+        List all pods and remember their restart counts; returns (pods, resourceVersion)
+
+        The initial list only takes the current restart counts as the baseline.
+        A re-list (after the watch expired) records the restarts that happened
+        while no watch was open.
+        """
+        record = self.listed
+        pod_list = self.client.get_json(self._pods_path())
+        pods = pod_list.get('items', [])
+        for pod in pods:
+            for restart_event in self.update(pod, record=record):
+                if on_event:
+                    on_event(restart_event)
+        self.listed = True
+        return pods, pod_list['metadata']['resourceVersion']
+
+    def update(self, pod, record=True):
+        """Compare the restart counts of a pod with the last known ones and return new restart events."""
+        pod_name = pod['metadata']['name']
+        service = service_of_pod(pod_name, self.services)
+        if service is None:
+            return []
+        new_events = []
+        for state in container_states(pod):
+            key = (pod_name, state['container'])
+            previous = self.restart_counts.get(key, 0)
+            self.restart_counts[key] = state['restart_count']
+            if record and state['restart_count'] > previous:
+                terminated = state['terminated'] or {}
+                new_events.append({
+                    'observed_at': time.time(),
+                    'terminated_at': parse_k8s_timestamp(terminated.get('finishedAt')),
+                    'service': service,
+                    'pod': pod_name,
+                    'container': state['container'],
+                    'restart_count': state['restart_count'],
+                    'reason': terminated.get('reason', "Unknown"),
+                    'exit_code': terminated.get('exitCode'),
+                })
+        self.events.extend(new_events)
+        return new_events
+
+    def watch(self, resource_version, duration=None, on_event=None):
+        """
+        Follow the pod watch stream until duration is over
+
+        The API server ends watches after a while, so the stream is reopened
+        from the last seen resourceVersion; if that version has expired (410),
+        the pods are listed again.
+        """
+        deadline = None if duration is None else time.monotonic() + duration
+        while True:
+            timeout = 60 if deadline is None else max(1, min(60, deadline - time.monotonic()))
+            try:
+                for event in self.client.watch(self._pods_path(), {"resourceVersion": resource_version,
+                                                                   "allowWatchBookmarks": "true"},
+                                               timeout_seconds=timeout):
+                    event_type = event.get('type')
+                    pod = event.get('object', {})
+                    if event_type == "ERROR":
+                        if pod.get('code') == 410:
+                            _, resource_version = self.list_pods(on_event)
+                        break
+                    resource_version = pod.get('metadata', {}).get('resourceVersion', resource_version)
+                    if event_type in ("ADDED", "MODIFIED"):
+                        for restart_event in self.update(pod):
+                            if on_event:
+                                on_event(restart_event)
+            except KubernetesApiError as e:
+                if e.status != 410:
+                    raise
+                _, resource_version = self.list_pods(on_event)
+            except (OSError, http.client.HTTPException) as e:
+                print(f"Warning: Watch stream interrupted: {e}", file=sys.stderr)
+                time.sleep(1)
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+
+
+def format_event(event):
+    terminated_at = (datetime.fromtimestamp(event['terminated_at']).isoformat(timespec='seconds')
+                     if event['terminated_at'] else "unknown")
+    marker = "🚨" if event['reason'] == "OOMKilled" else "⚠"
+    return (f"{marker} {event['service']}: {event['pod']}/{event['container']} restarted "
+            f"(reason {event['reason']}, exit code {event['exit_code']}, terminated at {terminated_at}, "
+            f"restart count {event['restart_count']})")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Check TeaStore services for OOMKilled containers and restarts")
+    arg_parser.add_argument("-n", "--namespace", default=NAMESPACE,
+                            help=f"Namespace of the TeaStore pods (default: {NAMESPACE})")
+    arg_parser.add_argument("--watch", action="store_true",
+                            help="Keep a watch stream open and record every container restart")
+    arg_parser.add_argument("--duration", type=float,
+                            help="Stop watching after this many seconds (default: until SIGINT/SIGTERM)")
+    arg_parser.add_argument("--events-file",
+                            help="Append the restart events recorded in watch mode to this CSV file")
+    add_api_arguments(arg_parser)
+    args = arg_parser.parse_args()
+
+    client = client_from_arguments(args)
+    watcher = RestartWatcher(client, namespace=args.namespace)
+
+    try:
+        pods, resource_version = watcher.list_pods()
+    except (OSError, http.client.HTTPException, KubernetesApiError) as e:
+        print(f"Error: Could not list pods in namespace '{args.namespace}': {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(format_report(check_pods(pods), args.namespace))
+
+    if not args.watch:
+        client.close()
+        return
+
+    class StopWatching(Exception):
+        pass
+
+    def request_stop(signum, frame):
+        # Raising interrupts the blocking read on the watch stream
+        raise StopWatching()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    events_file = None
+    writer = None
+    if args.events_file:
+        write_header = not os.path.exists(args.events_file) or os.path.getsize(args.events_file) == 0
+        events_file = open(args.events_file, 'a', newline='', encoding='utf-8')
+        writer = csv.DictWriter(events_file, fieldnames=EVENTS_CSV_HEADER)
+        if write_header:
+            writer.writeheader()
+            events_file.flush()
+
+    def on_event(event):
+        print(format_event(event), flush=True)
+        if writer is not None:
+            writer.writerow({**event,
+                             'observed_at': f"{event['observed_at']:.3f}",
+                             'terminated_at': "" if event['terminated_at'] is None else f"{event['terminated_at']:.3f}"})
+            events_file.flush()
+
+    print(f"\nWatching pods in namespace '{args.namespace}' for container restarts...", flush=True)
+    try:
+        watcher.watch(resource_version, duration=args.duration, on_event=on_event)
+    except StopWatching:
+        pass
+    finally:
+        if events_file is not None:
+            events_file.close()
+        client.close()
+
+    oomkilled = sum(1 for event in watcher.events if event['reason'] == "OOMKilled")
+    print(f"\nRecorded {len(watcher.events)} restart(s), {oomkilled} OOMKilled")
+
+
+if __name__ == "__main__":
+    main()
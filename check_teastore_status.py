@@ -4,23 +4,83 @@ TeaStore Status Checker
 
 This script parses the HTML response from TeaStore's status endpoint and checks
 if all services are running with OK status.
+
+Usage:
+    python check_teastore_status.py <html_content_or_file>
+    python check_teastore_status.py watch <status_url> [--timeout SECONDS]
+    python check_teastore_status.py probe <status_url> [--rounds N]
+
+The watch mode keeps polling the status page over a single keep-alive
+connection until all expected services report OK and prints the time it
+took for each service to become ready.
+
+The probe mode reads the registered instances of every service from the
+status page and queries the health endpoint of each instance concurrently,
+reporting per-instance latency and status so that slow replicas show up
+before the load starts.
 """
 
 import sys
 import re
+import time
+import json
+import codecs
+import asyncio
+import statistics
+import random
+import argparse
+import http.client
+from urllib.parse import urlsplit
 from html.parser import HTMLParser
 
 
+# Expected services
+EXPECTED_SERVICES = {"WebUI", "Auth", "Persistence", "Recommender", "Image"}
+
+# Rest of the status page that is still read after all expected services were parsed, so that
+# the keep-alive connection can be reused; the connection is dropped for larger remainders
+STATUS_PAGE_DRAIN_LIMIT = 64 * 1024
+
+# Services whose instances are probed individually in probe mode
+PROBED_SERVICES = ("Auth", "Persistence", "Recommender", "Image")
+
+# Health endpoint of a single service instance, {service} is the lower-case service name
+HEALTH_PATH_TEMPLATE = "/tools.descartes.teastore.{service}/rest/ready/isready"
+
+
 class TeaStoreStatusParser(HTMLParser):
-    def __init__(self):
+    """Incremental parser for the TeaStore status page.
+
+    The page can be fed in arbitrary chunks (e.g. while it is streamed from the
+    server). Services are kept in ``services_by_name`` as soon as their row is
+    complete, and ``all_expected_seen`` turns true once every expected service
+    has been parsed, so callers can stop reading the rest of the page.
+    """
+
+    def __init__(self, expected_services=EXPECTED_SERVICES):
+        self.expected_services = frozenset(expected_services)
         super().__init__()
+
+    def reset(self):
+        """Reset the parser so that a single instance can be reused for every poll."""
+        super().reset()
         self.in_table = False
         self.in_row = False
         self.in_cell = False
         self.current_row = []
-        self.current_cell = ""
-        self.services = []
+        self.current_cell = []
+        self.services_by_name = {}
         self.cell_class = None
+        self.missing_expected = set(self.expected_services)
+
+    @property
+    def services(self):
+        """Parsed services in page order."""
+        return list(self.services_by_name.values())
+
+    @property
+    def all_expected_seen(self):
+        return not self.missing_expected
         
     def handle_starttag(self, tag, attrs):
         if tag == "table":
@@ -28,9 +88,12 @@ class TeaStoreStatusParser(HTMLParser):
         elif tag == "tr" and self.in_table:
             self.in_row = True
             self.current_row = []
+        elif tag == "br" and self.in_cell:
+            # The hosts cell lists one instance per line
+            self.current_cell.append("\n")
         elif tag == "td" and self.in_row:
             self.in_cell = True
-            self.current_cell = ""
+            self.current_cell = []
             # Check if this td has a class attribute
             self.cell_class = None
             for attr_name, attr_value in attrs:
@@ -48,45 +111,40 @@ class TeaStoreStatusParser(HTMLParser):
                 service_status = self.current_row[3].strip()
                 # Skip the header row
                 if service_name != "Service" and service_name != "":
-                    self.services.append({
+                    host_list = self.current_row[2].split()
+                    self.services_by_name[service_name] = {
                         'name': service_name,
                         'count': self.current_row[1].strip(),
-                        'hosts': self.current_row[2].strip(),
+                        'hosts': ", ".join(host_list),
+                        'host_list': host_list,
                         'status': service_status
-                    })
+                    }
+                    self.missing_expected.discard(service_name)
         elif tag == "td" and self.in_cell:
             self.in_cell = False
-            self.current_row.append(self.current_cell)
+            self.current_row.append("".join(self.current_cell))
     
     def handle_data(self, data):
         if self.in_cell:
-            self.current_cell += data
+            self.current_cell.append(data)
 
 
-def check_teastore_status(html_content):
+def summarize_teastore_status(services_by_name, expected_services=EXPECTED_SERVICES):
     """
-    Parse HTML content and check TeaStore service status
+    Check the parsed services and build the status message
     
     Args:
-        html_content (str): HTML content from TeaStore status page
+        services_by_name (dict): Parsed services keyed by service name
+        expected_services (set): Services that have to be present and OK
         
     Returns:
         tuple: (success: bool, services: list, message: str)
     """
-    parser = TeaStoreStatusParser()
-    try:
-        parser.feed(html_content)
-    except Exception as e:
-        return False, [], f"Failed to parse HTML: {str(e)}"
-    
-    services = parser.services
+    services = list(services_by_name.values())
     
     if not services:
         return False, [], "No services found in status page"
     
-    # Expected services
-    expected_services = {"WebUI", "Auth", "Persistence", "Recommender", "Image"}
-    
     # Check each service
     ok_services = []
     failed_services = []
@@ -117,19 +175,469 @@ def check_teastore_status(html_content):
         for service in failed_services:
             message_parts.append(f"  - {service}")
     
+    missing_services = set(expected_services).difference(services_by_name)
+    if missing_services:
+        message_parts.append("✗ Services missing:")
+        for service in sorted(missing_services):
+            message_parts.append(f"  - {service}")
+    
     message = "\n".join(message_parts)
     
     # All services should be OK and we should have at least the expected services
-    success = (len(failed_services) == 0 and 
-               ok_count >= len(expected_services) and
-               all(any(svc['name'] == expected for svc in services) for expected in expected_services))
+    success = len(failed_services) == 0 and not missing_services
     
     return success, services, message
 
 
+def check_teastore_status(html_content, parser=None):
+    """
+    Parse HTML content and check TeaStore service status
+    
+    Args:
+        html_content (str): HTML content from TeaStore status page
+        parser (TeaStoreStatusParser): Optional parser to reuse; it is reset before use
+        
+    Returns:
+        tuple: (success: bool, services: list, message: str)
+    """
+    if parser is None:
+        parser = TeaStoreStatusParser()
+    else:
+        parser.reset()
+    try:
+        parser.feed(html_content)
+        parser.close()
+    except Exception as e:
+        return False, [], f"Failed to parse HTML: {str(e)}"
+    
+    return summarize_teastore_status(parser.services_by_name, parser.expected_services)
+
+
+class StatusPageConnection:
+    """Keep-alive HTTP connection to the TeaStore status page.
+
+    The underlying connection is reused across polls and only re-established
+    after a failed request or when the body was not read completely.
+    """
+
+    def __init__(self, url, timeout=10.0):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {url}")
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = parts.path or "/"
+        if parts.query:
+            self.path += "?" + parts.query
+        self.timeout = timeout
+        self.connection = None
+
+    def _connect(self):
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def fetch_into(self, parser, chunk_size=1024, drain_limit=STATUS_PAGE_DRAIN_LIMIT):
+        """
+        Stream the status page into ``parser`` (which must be reset by the caller).
+
+        Parsing stops as soon as the parser has seen all expected services. The
+        rest of the body is still read (up to ``drain_limit`` bytes) so that the
+        keep-alive connection can be reused for the next poll; only a larger
+        remainder is left unread and the connection is dropped.
+        Raises OSError/HTTPException on failure.
+
+        Returns:
+            int: Number of body bytes read
+        """
+        if self.connection is None:
+            self.connection = self._connect()
+        bytes_read = 0
+        try:
+            self.connection.request("GET", self.path, headers={"Connection": "keep-alive"})
+            response = self.connection.getresponse()
+            if response.status != 200:
+                response.read()
+            else:
+                charset = response.headers.get_content_charset() or "utf-8"
+                decoder = codecs.getincrementaldecoder(charset)(errors="replace")
+                while not parser.all_expected_seen:
+                    chunk = response.read1(chunk_size)
+                    if not chunk:
+                        parser.feed(decoder.decode(b"", final=True))
+                        parser.close()
+                        break
+                    bytes_read += len(chunk)
+                    parser.feed(decoder.decode(chunk))
+                # Drain the (usually small) rest of the page so that the connection stays usable
+                drained = 0
+                while drained <= drain_limit:
+                    # read() (unlike read1()) marks the response as closed at its end
+                    chunk = response.read(chunk_size)
+                    if not chunk:
+                        break
+                    drained += len(chunk)
+                bytes_read += drained
+        except (OSError, http.client.HTTPException):
+            self.close()
+            raise
+        if response.will_close or not response.isclosed():
+            self.close()
+        if response.status != 200:
+            raise http.client.HTTPException(f"HTTP {response.status} {response.reason}")
+        return bytes_read
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+def watch_teastore_status(url, timeout=300.0, min_interval=1.0, max_interval=15.0,
+                          backoff_factor=1.5, request_timeout=10.0, log=print):
+    """
+    Poll the TeaStore status page until all expected services report OK.
+
+    The polling interval starts at ``min_interval`` and grows by ``backoff_factor``
+    (up to ``max_interval``) while no progress is made. It drops back to
+    ``min_interval`` whenever another service becomes ready. Every sleep is
+    jittered so that concurrent watchers do not synchronize.
+
+    Args:
+        url (str): URL of the WebUI status page
+        timeout (float): Give up after this many seconds
+        min_interval (float): Initial and minimum delay between polls in seconds
+        max_interval (float): Maximum delay between polls in seconds
+        backoff_factor (float): Multiplier applied to the delay after a poll without progress
+        request_timeout (float): Socket timeout of a single request in seconds
+        log (callable): Function used to report progress
+
+    Returns:
+        tuple: (success: bool, time_to_ready: dict, message: str) where
+        time_to_ready maps service names to seconds since the watch started
+    """
+    parser = TeaStoreStatusParser()
+    connection = StatusPageConnection(url, timeout=request_timeout)
+    start = time.monotonic()
+    deadline = start + timeout
+    time_to_ready = {}
+    interval = min_interval
+    attempt = 0
+    message = "No status page received"
+
+    try:
+        while True:
+            attempt += 1
+            elapsed = time.monotonic() - start
+            parser.reset()
+            try:
+                connection.fetch_into(parser)
+            except (OSError, http.client.HTTPException) as e:
+                success = False
+                message = f"Failed to fetch status page: {e}"
+                log(f"[{elapsed:6.1f}s] attempt {attempt}: ✗ {message}")
+                progressed = False
+            else:
+                success, services, message = summarize_teastore_status(parser.services_by_name,
+                                                                       parser.expected_services)
+                progressed = False
+                for service in services:
+                    if "OK" in service['status'] and service['name'] not in time_to_ready:
+                        time_to_ready[service['name']] = elapsed
+                        progressed = True
+                ready = sorted(time_to_ready)
+                log(f"[{elapsed:6.1f}s] attempt {attempt}: {len(ready)}/{len(services)} services OK"
+                    + (f" ({', '.join(ready)})" if ready else ""))
+
+            if success:
+                return True, time_to_ready, message
+
+            interval = min_interval if progressed else min(interval * backoff_factor, max_interval)
+            sleep_time = random.uniform(interval / 2, interval)
+            if time.monotonic() + sleep_time >= deadline:
+                return False, time_to_ready, message
+            time.sleep(sleep_time)
+    finally:
+        connection.close()
+
+
+def format_time_to_ready(time_to_ready):
+    """Format the per-service time-to-ready as report lines."""
+    lines = ["Time to ready per service:"]
+    for name, seconds in sorted(time_to_ready.items(), key=lambda item: item[1]):
+        lines.append(f"  - {name}: {seconds:.1f}s")
+    missing = sorted(EXPECTED_SERVICES - set(time_to_ready))
+    for name in missing:
+        lines.append(f"  - {name}: not ready")
+    return "\n".join(lines)
+
+
+def watch_main(argv):
+    arg_parser = argparse.ArgumentParser(
+        prog="check_teastore_status.py watch",
+        description="Poll the TeaStore status page until all services are ready")
+    arg_parser.add_argument("url", help="URL of the WebUI status page")
+    arg_parser.add_argument("--timeout", type=float, default=300.0,
+                            help="Give up after this many seconds (default: 300)")
+    arg_parser.add_argument("--min-interval", type=float, default=1.0,
+                            help="Initial delay between polls in seconds (default: 1)")
+    arg_parser.add_argument("--max-interval", type=float, default=15.0,
+                            help="Maximum delay between polls in seconds (default: 15)")
+    arg_parser.add_argument("--request-timeout", type=float, default=10.0,
+                            help="Timeout of a single request in seconds (default: 10)")
+    arg_parser.add_argument("--report-file",
+                            help="Write the time-to-ready per service as JSON to this file")
+    args = arg_parser.parse_args(argv)
+
+    success, time_to_ready, message = watch_teastore_status(
+        args.url, timeout=args.timeout, min_interval=args.min_interval,
+        max_interval=args.max_interval, request_timeout=args.request_timeout)
+
+    print(message)
+    print()
+    print(format_time_to_ready(time_to_ready))
+
+    if args.report_file:
+        with open(args.report_file, 'w', encoding='utf-8') as f:
+            json.dump({'url': args.url, 'ready': success,
+                       'time_to_ready_seconds': {name: round(seconds, 3) for name, seconds in time_to_ready.items()}},
+                      f, indent=2)
+
+    if success:
+        print("\n✓ All TeaStore services are ready!")
+        sys.exit(0)
+    else:
+        print(f"\n✗ TeaStore services are not all ready after {args.timeout:.0f} seconds")
+        sys.exit(1)
+
+
+def parse_instance_address(host, default_port=80):
+    """Split a registered host entry (``host:port`` or a URL) into (host, port)."""
+    parts = urlsplit(host if "//" in host else "//" + host)
+    return parts.hostname, parts.port or default_port
+
+
+async def _get_health(host, port, path):
+    """Send a single HTTP/1.0 GET over a fresh connection and return (status, body)."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(f"GET {path} HTTP/1.0\r\nHost: {host}:{port}\r\n\r\n".encode("ascii"))
+        await writer.drain()
+        status_line = await reader.readline()
+        try:
+            status = int(status_line.split()[1])
+        except (IndexError, ValueError):
+            raise http.client.HTTPException(f"Invalid status line: {status_line[:80]!r}")
+        while (await reader.readline()).strip():
+            pass
+        body = await reader.read()
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+    return status, body
+
+
+async def probe_instance(service, instance, path, rounds=3, timeout=5.0):
+    """
+    Query the health endpoint of one service instance ``rounds`` times in a row.
+
+    An instance is OK if every round answered with HTTP 200 and a body other
+    than ``false``. Latency covers connecting, sending the request and reading
+    the whole response.
+
+    Returns:
+        dict: service, instance, ok, status, latency_ms (median of the answered
+        rounds) and max_latency_ms; the latencies are None if no round was answered
+    """
+    host, port = parse_instance_address(instance)
+    latencies = []
+    status = "OK"
+    for _ in range(rounds):
+        start = time.perf_counter()
+        try:
+            code, body = await asyncio.wait_for(_get_health(host, port, path), timeout)
+        except asyncio.TimeoutError:
+            status = f"timeout after {timeout:g}s"
+            continue
+        except (OSError, http.client.HTTPException) as e:
+            status = f"error: {e}"
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+        if code != 200:
+            status = f"HTTP {code}"
+        elif body.strip().lower() == b"false":
+            status = "not ready"
+    return {
+        'service': service,
+        'instance': instance,
+        'ok': status == "OK",
+        'status': status,
+        'latency_ms': statistics.median(latencies) if latencies else None,
+        'max_latency_ms': max(latencies) if latencies else None,
+    }
+
+
+async def probe_services(services_by_name, services=PROBED_SERVICES,
+                         path_template=HEALTH_PATH_TEMPLATE, rounds=3, timeout=5.0):
+    """
+    Probe every registered instance of ``services`` concurrently.
+
+    Args:
+        services_by_name (dict): Parsed services keyed by service name
+        services (iterable): Names of the services whose instances are probed
+        path_template (str): Health endpoint path, ``{service}`` is replaced by
+            the lower-case service name
+        rounds (int): Number of sequential requests per instance
+        timeout (float): Timeout of a single request in seconds
+
+    Returns:
+        list: One result dict per instance (see probe_instance) in page order;
+        services without registered instances get a single result with
+        instance None
+    """
+    probes = []
+    results = []
+    for name in services:
+        service = services_by_name.get(name)
+        if service is None or not service['host_list']:
+            results.append({'service': name, 'instance': None, 'ok': False,
+                            'status': "no instances registered",
+                            'latency_ms': None, 'max_latency_ms': None})
+            continue
+        path = path_template.format(service=name.lower())
+        for instance in service['host_list']:
+            probes.append(probe_instance(name, instance, path, rounds=rounds, timeout=timeout))
+    return await asyncio.gather(*probes) + results
+
+
+def mark_slow_instances(results, slow_factor=2.0):
+    """
+    Flag instances whose latency exceeds ``slow_factor`` times the median of their service.
+
+    Only services with at least two answered instances are compared. Sets
+    ``slow`` and ``latency_ratio`` on every result.
+    """
+    by_service = {}
+    for result in results:
+        if result['latency_ms'] is not None:
+            by_service.setdefault(result['service'], []).append(result['latency_ms'])
+    for result in results:
+        latencies = by_service.get(result['service'], [])
+        ratio = None
+        if len(latencies) >= 2 and result['latency_ms'] is not None:
+            ratio = result['latency_ms'] / max(statistics.median(latencies), 1e-3)
+        result['latency_ratio'] = ratio
+        result['slow'] = ratio is not None and ratio > slow_factor
+    return results
+
+
+def probe_teastore_instances(url, services=PROBED_SERVICES, path_template=HEALTH_PATH_TEMPLATE,
+                             rounds=3, request_timeout=5.0, slow_factor=2.0):
+    """
+    Read the registered instances from the status page and probe each of them.
+
+    Instance addresses are taken as registered, so they have to be reachable
+    from where this script runs. Raises OSError/HTTPException if the status
+    page cannot be fetched.
+
+    Returns:
+        list: Per-instance results (see probe_services and mark_slow_instances)
+    """
+    parser = TeaStoreStatusParser()
+    connection = StatusPageConnection(url, timeout=request_timeout)
+    try:
+        connection.fetch_into(parser)
+    finally:
+        connection.close()
+    results = asyncio.run(probe_services(parser.services_by_name, services=services,
+                                         path_template=path_template, rounds=rounds,
+                                         timeout=request_timeout))
+    return mark_slow_instances(results, slow_factor)
+
+
+def format_probe_report(results, rounds):
+    """Format the per-instance probe results as report lines grouped by service."""
+    lines = [f"Instance health (median latency of {rounds} round(s)):"]
+    current_service = None
+    for result in sorted(results, key=lambda r: PROBED_SERVICES.index(r['service'])
+                         if r['service'] in PROBED_SERVICES else len(PROBED_SERVICES)):
+        if result['service'] != current_service:
+            current_service = result['service']
+            lines.append(f"  {current_service}:")
+        if result['instance'] is None:
+            lines.append(f"    ✗ {result['status']}")
+            continue
+        line = f"    {'✓' if result['ok'] else '✗'} {result['instance']}: {result['status']}"
+        if result['latency_ms'] is not None:
+            line += f", {result['latency_ms']:.1f} ms (max {result['max_latency_ms']:.1f} ms)"
+        if result['slow']:
+            line += f" ⚠ slow, {result['latency_ratio']:.1f}x the service median"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def probe_main(argv):
+    arg_parser = argparse.ArgumentParser(
+        prog="check_teastore_status.py probe",
+        description="Probe the health endpoint of every registered TeaStore service instance")
+    arg_parser.add_argument("url", help="URL of the WebUI status page")
+    arg_parser.add_argument("--rounds", type=int, default=3,
+                            help="Requests per instance, the median latency is reported (default: 3)")
+    arg_parser.add_argument("--request-timeout", type=float, default=5.0,
+                            help="Timeout of a single request in seconds (default: 5)")
+    arg_parser.add_argument("--slow-factor", type=float, default=2.0,
+                            help="Flag instances slower than this multiple of their service median (default: 2)")
+    arg_parser.add_argument("--health-path", default=HEALTH_PATH_TEMPLATE,
+                            help="Health endpoint path, {service} is replaced by the lower-case "
+                                 f"service name (default: {HEALTH_PATH_TEMPLATE})")
+    arg_parser.add_argument("--services", nargs="+", default=list(PROBED_SERVICES),
+                            help="Services whose instances are probed (default: %(default)s)")
+    arg_parser.add_argument("--report-file",
+                            help="Write the per-instance results as JSON to this file")
+    args = arg_parser.parse_args(argv)
+    if args.rounds < 1:
+        arg_parser.error("--rounds must be at least 1")
+
+    try:
+        results = probe_teastore_instances(
+            args.url, services=args.services, path_template=args.health_path, rounds=args.rounds,
+            request_timeout=args.request_timeout, slow_factor=args.slow_factor)
+    except (OSError, http.client.HTTPException, ValueError) as e:
+        print(f"Failed to fetch status page: {e}")
+        sys.exit(1)
+
+    print(format_probe_report(results, args.rounds))
+
+    if args.report_file:
+        with open(args.report_file, 'w', encoding='utf-8') as f:
+            json.dump({'url': args.url, 'rounds': args.rounds, 'instances': results}, f, indent=2)
+
+    failed = [r for r in results if not r['ok']]
+    slow = [r for r in results if r['slow']]
+    if slow:
+        print(f"\n⚠ {len(slow)} slow instance(s): "
+              + ", ".join(f"{r['service']} {r['instance']}" for r in slow))
+    if failed:
+        print(f"\n✗ {len(failed)} of {len(results)} instance probe(s) failed")
+        sys.exit(1)
+    print(f"\n✓ All {len(results)} TeaStore service instances are healthy")
+    sys.exit(0)
+
+
 def main():
+    if len(sys.argv) >= 2 and sys.argv[1] == "watch":
+        watch_main(sys.argv[2:])
+    if len(sys.argv) >= 2 and sys.argv[1] == "probe":
+        probe_main(sys.argv[2:])
+
     if len(sys.argv) < 2:
         print("Usage: python check_teastore_status.py <html_content_or_file>", file=sys.stderr)
+        print("       python check_teastore_status.py watch <status_url> [--timeout SECONDS]", file=sys.stderr)
+        print("       python check_teastore_status.py probe <status_url> [--rounds N]", file=sys.stderr)
         sys.exit(1)
     
     # Read HTML content from argument (could be content or file path)
@@ -0,0 +1,172 @@
+"""
+Minimal Kubernetes API Client
+
+Small helper used by the monitoring scripts to talk to the Kubernetes API
+without spawning a kubectl process per request. All requests of a client go
+over one keep-alive HTTP(S) connection.
+
+By default the client expects `kubectl proxy` to listen on
+http://127.0.0.1:8001, which takes care of authentication. Alternatively, an
+API server URL and a bearer token can be passed explicitly.
+"""
+
+import os
+import ssl
+import json
+import http.client
+from urllib.parse import urlsplit, urlencode
+
+
+DEFAULT_API_SERVER = os.environ.get("K8S_API_SERVER", "http://127.0.0.1:8001")
+
+
+class KubernetesApiError(Exception):
+    """Raised when the API server answers with a non-2xx status code."""
+
+    def __init__(self, status, reason, body=""):
+        super().__init__(f"HTTP {status} {reason}: {body[:200]}")
+        self.status = status
+
+
+class KubernetesApiClient:
+    """Kubernetes API client that reuses a single keep-alive connection."""
+
+    def __init__(self, base_url=DEFAULT_API_SERVER, token=None, ca_file=None,
+                 insecure=False, timeout=10.0):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {base_url}")
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.base_path = parts.path.rstrip("/")
+        self.token = token
+        self.timeout = timeout
+        self.ssl_context = None
+        if self.scheme == "https":
+            self.ssl_context = ssl.create_default_context(cafile=ca_file)
+            if insecure:
+                self.ssl_context.check_hostname = False
+                self.ssl_context.verify_mode = ssl.CERT_NONE
+        self.connection = None
+
+    def _connect(self, timeout):
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port, timeout=timeout,
+                                               context=self.ssl_context)
+        return http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+
+    def _request_target(self, path, params):
+        target = self.base_path + path
+        if params:
+            target += "?" + urlencode(params)
+        return target
+
+    def _headers(self):
+        headers = {"Accept": "application/json", "Connection": "keep-alive"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    def get_json(self, path, params=None):
+        """
+        GET a resource and decode the JSON response
+
+        Args:
+            path (str): API path, e.g. /api/v1/namespaces/teastore/pods
+            params (dict): Optional query parameters
+
+        Returns:
+            dict: Decoded JSON body
+        """
+        if self.connection is None:
+            self.connection = self._connect(self.timeout)
+        try:
+            self.connection.request("GET", self._request_target(path, params), headers=self._headers())
+            response = self.connection.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException):
+            self.close()
+            raise
+        if response.will_close:
+            self.close()
+        if not 200 <= response.status < 300:
+            raise KubernetesApiError(response.status, response.reason, body.decode("utf-8", "replace"))
+        return json.loads(body)
+
+    def watch(self, path, params=None, timeout_seconds=None):
+        """
+        Open a watch stream and yield the decoded events
+
+        The watch uses its own connection because the stream occupies it until
+        the server ends the watch (after ``timeout_seconds`` if given).
+
+        Yields:
+            dict: Watch events with the keys ``type`` and ``object``
+        """
+        params = dict(params or {})
+        params["watch"] = "true"
+        if timeout_seconds is not None:
+            params["timeoutSeconds"] = int(timeout_seconds)
+        # No socket timeout: a quiet watch stream must not be treated as an error
+        connection = self._connect(None)
+        try:
+            connection.request("GET", self._request_target(path, params), headers=self._headers())
+            response = connection.getresponse()
+            if not 200 <= response.status < 300:
+                body = response.read().decode("utf-8", "replace")
+                raise KubernetesApiError(response.status, response.reason, body)
+            while True:
+                line = response.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        finally:
+            connection.close()
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+_CPU_SUFFIXES = {"n": 1e-6, "u": 1e-3, "m": 1.0}
+_MEMORY_SUFFIXES = {
+    "Ki": 1024, "Mi": 1024 ** 2, "Gi": 1024 ** 3, "Ti": 1024 ** 4,
+    "k": 1000, "K": 1000, "M": 1000 ** 2, "G": 1000 ** 3, "T": 1000 ** 4,
+}
+
+
+def parse_cpu_quantity(quantity):
+    """Convert a Kubernetes CPU quantity (e.g. '250m', '1', '123456n') to millicores."""
+    quantity = str(quantity).strip()
+    if quantity and quantity[-1] in _CPU_SUFFIXES:
+        return float(quantity[:-1]) * _CPU_SUFFIXES[quantity[-1]]
+    return float(quantity) * 1000.0
+
+
+def parse_memory_quantity(quantity):
+    """Convert a Kubernetes memory quantity (e.g. '128Mi', '1Gi', '512k') to bytes."""
+    quantity = str(quantity).strip()
+    for suffix in sorted(_MEMORY_SUFFIXES, key=len, reverse=True):
+        if quantity.endswith(suffix):
+            return float(quantity[:-len(suffix)]) * _MEMORY_SUFFIXES[suffix]
+    return float(quantity)
+
+
+def add_api_arguments(arg_parser):
+    """Add the common connection options of the API client to an argparse parser."""
+    arg_parser.add_argument("--api-server", default=DEFAULT_API_SERVER,
+                            help=f"Kubernetes API URL (default: {DEFAULT_API_SERVER}, i.e. kubectl proxy)")
+    arg_parser.add_argument("--token", default=os.environ.get("K8S_TOKEN"),
+                            help="Bearer token for the API server (default: $K8S_TOKEN)")
+    arg_parser.add_argument("--ca-file", help="CA bundle to verify the API server certificate")
+    arg_parser.add_argument("--insecure", action="store_true",
+                            help="Do not verify the API server certificate")
+
+
+def client_from_arguments(args):
+    return KubernetesApiClient(args.api_server, token=args.token, ca_file=args.ca_file,
+                               insecure=args.insecure)
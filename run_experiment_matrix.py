@@ -0,0 +1,575 @@
+#!/usr/bin/env python3
+"""
+TeaStore Experiment Matrix Runner
+
+Runs a matrix of experiments (e.g. every configuration in
+terraform_teastore/experiment/*.tfvars) as jobs. Every job consists of the
+stages deploy -> readiness -> warmup -> load -> collect -> analyze, each stage
+starts when the stages it depends on have succeeded. Independent jobs run in
+parallel, one per target (a separate cluster given by its kubeconfig and/or a
+separate namespace).
+
+The default deploy stage runs terraform_teastore/deploy.sh on the cluster of
+the target's kubeconfig (passed as KUBECONFIG) with TeaStore in the target's
+namespace, in a terraform workspace named after the target. The ingress
+controller, the monitoring and the noisy neighbors are deployed cluster-wide,
+so with the default deploy stage every target needs its own cluster (targets
+sharing a kubeconfig are rejected); a custom deploy command can lift this.
+
+The progress of every stage is recorded in a JSON state file. Running the
+same matrix again resumes it: finished stages are skipped and failed or
+interrupted jobs continue with the stage that did not finish.
+
+Stage commands are shell command templates with placeholders such as {host},
+{tfvars} or {logs_dir} (see DEFAULT_STAGE_COMMANDS). They can be replaced per
+stage, e.g. by stubs to test the scheduler without terraform and kubectl.
+A stage can set variables for the following stages of its job by printing
+lines of the form "MATRIX_SET name=value" (the deploy stage sets the host).
+
+Usage:
+    python run_experiment_matrix.py --tfvars-glob 'terraform_teastore/experiment/cpu_*.tfvars'
+    python run_experiment_matrix.py --matrix matrix_with_deploy_command.json \
+        --target cluster-a:~/.kube/cluster-a --target cluster-b:~/.kube/cluster-b
+    python run_experiment_matrix.py --matrix matrix.json --dry-run
+    python run_experiment_matrix.py --tfvars-glob '...' --target local \
+        --stage-command deploy='echo MATRIX_SET host=127.0.0.1' --stage-command load='sleep 1'
+"""
+
+import os
+import re
+import sys
+import json
+import glob
+import time
+import shlex
+import signal
+import argparse
+import threading
+import subprocess
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Stages of a job and the stages each of them depends on
+STAGE_DEPENDENCIES = {
+    "deploy": [],
+    "readiness": ["deploy"],
+    "warmup": ["readiness"],
+    "load": ["warmup"],
+    "collect": ["load"],
+    "analyze": ["collect"],
+}
+
+# All jobs share the terraform_teastore directory, so deployments run one at a time
+EXCLUSIVE_STAGES = {"deploy"}
+
+DEFAULT_STAGE_COMMANDS = {
+    "deploy": (
+        "cd terraform_teastore && ./prepare_terraform_scripts.sh"
+        " && ./deploy.sh --namespace {namespace} --workspace {target} {deploy_args} {deployment_type}"
+        " && echo MATRIX_SET host=$(kubectl get ingress -n {namespace}"
+        " -o jsonpath='{{.items[0].status.loadBalancer.ingress[0].ip}}')"
+    ),
+    "readiness": (
+        "python check_teastore_status.py watch http://{host}/tools.descartes.teastore.webui/status"
+        " --timeout {readiness_timeout} --report-file {logs_dir}/teastore_time_to_ready.json"
+    ),
+    "warmup": (
+        "for path in status '' login 'category?category=2&page=1' 'product?id=7' profile; do"
+        " curl -s -f -m 10 -o /dev/null \"http://{host}/tools.descartes.teastore.webui/$path\" || exit 1;"
+        " sleep 0.1; done"
+    ),
+    # Every job gets its own copy of the locust scripts, they write their results into their directory
+    "load": (
+        "rm -rf {work_dir}/locust_scripts && cp -r locust_scripts {work_dir}/ && cd {work_dir}/locust_scripts"
+        " && warmup=True && for profile in {profiles}; do"
+        " ./delete_results.sh && KEEP_TEASTORE_LOGS=True WARMUP_PHASE=$warmup LOAD_INTENSITY_PROFILE=$profile"
+        " ./start_teastore_loadtest.sh --ip {host} --no_port"
+        " && mv -v locust_log.log {logs_dir}/locust_log_$profile.log || exit 1;"
+        " warmup=False; sleep 10; done"
+    ),
+    "collect": (
+        "kubectl get pods -n {namespace} -o wide > {logs_dir}/pods.txt"
+        " && kubectl get events -n {namespace} --sort-by=.lastTimestamp > {logs_dir}/events.txt"
+    ),
+    "analyze": (
+        "python analyze_logs.py analyze {logs_dir}/locust_log_*.log --output-dir {logs_dir}/analysis"
+        " --summary-dir {results_dir}/summaries"
+    ),
+}
+
+# Result directories per experiment type (as in run_teastore_experiment.sh)
+EXPERIMENT_DIRECTORIES = {
+    "training": "Training_Data",
+    "baseline": "Baseline_Data",
+    "cpu-noisy-neighbor": "CPU_experiment",
+    "memory-noisy-neighbor": "Memory_experiment",
+}
+
+DEFAULT_PROFILES = ["low_4"]
+TRAINING_PROFILES = ["med", "med", "med"]
+
+MATRIX_SET_PATTERN = re.compile(r'^MATRIX_SET (\w+)=(.*)$')
+
+
+def experiment_type_of_tfvars(tfvars_name):
+    """Infer the experiment type of a tfvars configuration from its name (as run_all_teastore_experiments.sh does)."""
+    if tfvars_name.startswith("memory_allocator"):
+        return "memory-noisy-neighbor"
+    if tfvars_name.startswith("cpu_load_generator") or "_nn_" in tfvars_name:
+        return "cpu-noisy-neighbor"
+    return "baseline"
+
+
+def deployment_type_of(experiment_type, with_resources=False):
+    """Deployment type passed to deploy.sh (see run_teastore_experiment.sh)."""
+    suffix = "with-resources" if with_resources else "without-resources"
+    if experiment_type == "memory-noisy-neighbor":
+        return f"mem-{suffix}"
+    if experiment_type == "cpu-noisy-neighbor":
+        return f"cpu-{suffix}"
+    return "default"
+
+
+def safe_name(name):
+    return re.sub(r'[^a-zA-Z0-9_-]', '', name.replace(" ", "_"))
+
+
+class Job:
+    """One experiment of the matrix with the template variables of its stage commands."""
+
+    def __init__(self, name, experiment_type, tfvars=None, with_resources=False, profiles=None,
+                 readiness_timeout=None):
+        self.name = name
+        self.experiment_type = experiment_type
+        self.tfvars = tfvars
+        self.deployment_type = deployment_type_of(experiment_type, with_resources)
+        # The results of custom configurations are stored under <deployment type>-<tfvars name>
+        self.result_name = f"{self.deployment_type}-{tfvars}" if tfvars else self.deployment_type
+        if profiles is None:
+            profiles = TRAINING_PROFILES if experiment_type == "training" else DEFAULT_PROFILES
+        self.profiles = profiles
+        if readiness_timeout is None:
+            readiness_timeout = 540 if tfvars else 420
+        self.readiness_timeout = readiness_timeout
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["name"], data.get("experiment_type", "baseline"), tfvars=data.get("tfvars"),
+                   with_resources=data.get("with_resources", False), profiles=data.get("profiles"),
+                   readiness_timeout=data.get("readiness_timeout"))
+
+    def variables(self, results_dir, run_id):
+        output_dir = os.path.join(results_dir, EXPERIMENT_DIRECTORIES.get(self.experiment_type, "Other"),
+                                  self.result_name)
+        return {
+            "name": self.name,
+            "safe_name": safe_name(self.name),
+            "experiment_type": self.experiment_type,
+            "tfvars": self.tfvars or "",
+            "deployment_type": self.deployment_type,
+            "result_name": self.result_name,
+            "deploy_args": f"--additional-var-file experiment/{self.tfvars}.tfvars" if self.tfvars else "",
+            "profiles": " ".join(self.profiles),
+            "readiness_timeout": str(self.readiness_timeout),
+            "results_dir": results_dir,
+            "output_dir": output_dir,
+            "logs_dir": os.path.join(output_dir, f"LoadTester_Logs_{run_id}"),
+            "work_dir": os.path.join(results_dir, "work", safe_name(self.name)),
+        }
+
+
+def jobs_from_tfvars(pattern):
+    """Create one job per tfvars file matching the glob pattern."""
+    jobs = []
+    for path in sorted(glob.glob(pattern)):
+        tfvars = os.path.splitext(os.path.basename(path))[0]
+        jobs.append(Job(tfvars, experiment_type_of_tfvars(tfvars), tfvars=tfvars))
+    return jobs
+
+
+def parse_target(spec):
+    """Parse a target given as name[:kubeconfig[:namespace]]."""
+    name, _, rest = spec.partition(":")
+    kubeconfig, _, namespace = rest.partition(":")
+    return {"name": name, "kubeconfig": os.path.expanduser(kubeconfig) if kubeconfig else "",
+            "namespace": namespace or "teastore"}
+
+
+def check_target_isolation(targets, stage_commands):
+    """
+    Check that the deploy stage can keep the targets apart.
+
+    The default deploy stage deploys cluster-wide components besides TeaStore,
+    so its targets must not share a cluster (kubeconfig).
+
+    Returns:
+        str: Error message, or None if the targets can be used
+    """
+    if stage_commands["deploy"] != DEFAULT_STAGE_COMMANDS["deploy"]:
+        return None
+    kubeconfigs = [target["kubeconfig"] or "~/.kube/config" for target in targets]
+    shared = sorted({kubeconfig for kubeconfig in kubeconfigs if kubeconfigs.count(kubeconfig) > 1})
+    if shared:
+        return (f"Several targets use the kubeconfig {', '.join(shared)}. The default deploy stage also deploys "
+                f"the ingress controller, the monitoring and the noisy neighbors, which are shared by all "
+                f"namespaces of a cluster, so every target needs its own kubeconfig. Use a deploy stage command "
+                f"that keeps the targets apart to run several targets on one cluster.")
+    return None
+
+
+def topological_stages(dependencies):
+    """Order the stages so that every stage comes after the stages it depends on."""
+    ordered = []
+    visiting = set()
+
+    def visit(stage):
+        if stage in ordered:
+            return
+        if stage in visiting:
+            raise ValueError(f"Cyclic stage dependency at '{stage}'")
+        visiting.add(stage)
+        for dependency in dependencies[stage]:
+            visit(dependency)
+        visiting.discard(stage)
+        ordered.append(stage)
+
+    for stage in dependencies:
+        visit(stage)
+    return ordered
+
+
+class MatrixState:
+    """Thread-safe progress of all jobs, persisted as JSON after every change."""
+
+    def __init__(self, state_file):
+        self.state_file = state_file
+        self.lock = threading.Lock()
+        self.jobs = {}
+        if os.path.exists(state_file):
+            with open(state_file, 'r', encoding='utf-8') as f:
+                self.jobs = json.load(f).get("jobs", {})
+
+    def job(self, name):
+        with self.lock:
+            return json.loads(json.dumps(self.jobs.get(name, {})))
+
+    def last_deployed(self, target_name):
+        """Name of the job whose deployment on the target finished last (None if there is none)."""
+        with self.lock:
+            deployed = [(job["stages"]["deploy"].get("finished", 0), name) for name, job in self.jobs.items()
+                        if job.get("target") == target_name
+                        and job.get("stages", {}).get("deploy", {}).get("status") == "done"]
+            return max(deployed)[1] if deployed else None
+
+    def update(self, name, **changes):
+        with self.lock:
+            job = self.jobs.setdefault(name, {"stages": {}, "variables": {}})
+            for key, value in changes.items():
+                if key == "stage":
+                    job["stages"][value["name"]] = value
+                elif key == "variables":
+                    job["variables"].update(value)
+                else:
+                    job[key] = value
+            self._save()
+
+    def _save(self):
+        temp_file = self.state_file + ".tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({"updated": datetime.now().isoformat(timespec='seconds'), "jobs": self.jobs}, f, indent=2)
+        os.replace(temp_file, self.state_file)
+
+
+class MatrixRunner:
+    """Runs the stages of all jobs, at most one job per target at a time."""
+
+    def __init__(self, jobs, targets, stage_commands, state, results_dir, repo_dir,
+                 max_parallel=None, retries=0, dry_run=False, log=print):
+        self.jobs = jobs
+        self.stage_commands = stage_commands
+        self.state = state
+        self.results_dir = results_dir
+        self.repo_dir = repo_dir
+        self.max_parallel = min(max_parallel or len(targets), len(targets))
+        self.retries = retries
+        self.dry_run = dry_run
+        self.log = log
+        self.stages = topological_stages(STAGE_DEPENDENCIES)
+        self.target_names = {target["name"] for target in targets}
+        self.free_targets = list(targets)
+        self.targets_changed = threading.Condition()
+        self.exclusive_locks = {stage: threading.Lock() for stage in EXCLUSIVE_STAGES}
+        self.processes = set()
+        self.processes_lock = threading.Lock()
+        self.stopping = threading.Event()
+
+    def run(self):
+        """Run all jobs; returns a dict job name -> final status."""
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as executor:
+            futures = {job.name: executor.submit(self._run_job, job) for job in self.jobs}
+            return {name: future.result() for name, future in futures.items()}
+
+    def stop(self):
+        """Terminate all running stage commands; their stages stay unfinished and are run again on resume."""
+        self.stopping.set()
+        with self.processes_lock:
+            for process in self.processes:
+                try:
+                    os.killpg(process.pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+
+    def _run_job(self, job):
+        if self.stopping.is_set():
+            return "interrupted"
+        saved = self.state.job(job.name)
+        done = {name for name, stage in saved.get("stages", {}).items() if stage.get("status") == "done"}
+        if all(stage in done for stage in self.stages):
+            self.log(f"[{job.name}] already finished, skipping")
+            return "done"
+
+        # A deployed job has to continue on the cluster/namespace it was deployed to
+        pinned_target = saved.get("target") if "deploy" in done else None
+        if pinned_target is not None and pinned_target not in self.target_names:
+            self.log(f"[{job.name}] was deployed on target '{pinned_target}', which is not given "
+                     f"(add it with --target or use --restart)")
+            return self._finish(job, "failed")
+
+        target = self._acquire_target(pinned_target)
+        try:
+            if pinned_target is not None and self.state.last_deployed(pinned_target) != job.name:
+                # Another job was deployed on the target in the meantime, so all stages are run again
+                self.log(f"[{job.name}] target '{pinned_target}' was redeployed by another job, deploying again")
+                done = set()
+            run_id = saved.get("run_id") or datetime.now().strftime("%Y-%m-%dT%H%M%S")
+            variables = {**job.variables(self.results_dir, run_id), **saved.get("variables", {})}
+            variables.update({"target": target["name"], "namespace": target["namespace"],
+                              "kubeconfig": target["kubeconfig"]})
+            if not self.dry_run:
+                self.state.update(job.name, run_id=run_id, target=target["name"], status="running")
+                for directory in (variables["logs_dir"], variables["work_dir"]):
+                    os.makedirs(directory, exist_ok=True)
+
+            for stage in self.stages:
+                if stage in done:
+                    continue
+                if self.stopping.is_set():
+                    return self._finish(job, "interrupted")
+                if not all(dependency in done for dependency in STAGE_DEPENDENCIES[stage]):
+                    return self._finish(job, "failed")
+
+                lock = self.exclusive_locks.get(stage)
+                if lock is not None:
+                    with lock:
+                        succeeded = self._run_stage(job, stage, variables, target)
+                else:
+                    succeeded = self._run_stage(job, stage, variables, target)
+                if not succeeded:
+                    return self._finish(job, "interrupted" if self.stopping.is_set() else "failed")
+                done.add(stage)
+            return self._finish(job, "done")
+        finally:
+            self._release_target(target)
+
+    def _acquire_target(self, name=None):
+        """Wait for a free target, for the target with the given name if it is not None."""
+        with self.targets_changed:
+            while True:
+                for target in self.free_targets:
+                    if name is None or target["name"] == name:
+                        self.free_targets.remove(target)
+                        return target
+                self.targets_changed.wait()
+
+    def _release_target(self, target):
+        with self.targets_changed:
+            self.free_targets.append(target)
+            self.targets_changed.notify_all()
+
+    def _finish(self, job, status):
+        if not self.dry_run:
+            self.state.update(job.name, status=status)
+        self.log(f"[{job.name}] {status}")
+        return status
+
+    def _run_stage(self, job, stage, variables, target):
+        if self.dry_run:
+            # Variables set by earlier stages are unknown without running them
+            variables = PlaceholderVariables(variables)
+        try:
+            command = self.stage_commands[stage].format_map(variables)
+        except KeyError as e:
+            self.log(f"[{job.name}] {stage}: unknown placeholder {e} (not set by an earlier stage?)")
+            return False
+
+        if self.dry_run:
+            self.log(f"[{job.name}] {stage} on {target['name']}: {command}")
+            return True
+
+        env = dict(os.environ)
+        if target["kubeconfig"]:
+            env["KUBECONFIG"] = target["kubeconfig"]
+
+        log_file = os.path.join(variables["logs_dir"], f"matrix_{stage}.log")
+        for attempt in range(self.retries + 1):
+            self.log(f"[{job.name}] {stage} started on {target['name']}"
+                     + (f" (retry {attempt})" if attempt else ""))
+            started = time.time()
+            self.state.update(job.name, stage={"name": stage, "status": "running", "started": started,
+                                               "attempt": attempt, "log": log_file})
+            with open(log_file, 'a', encoding='utf-8') as log:
+                log.write(f"$ {command}\n")
+                log.flush()
+                process = subprocess.Popen(["bash", "-c", command], cwd=self.repo_dir, env=env,
+                                           stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                           text=True, start_new_session=True)
+                with self.processes_lock:
+                    self.processes.add(process)
+                new_variables = {}
+                for line in process.stdout:
+                    log.write(line)
+                    log.flush()
+                    match = MATRIX_SET_PATTERN.match(line.strip())
+                    if match:
+                        new_variables[match.group(1)] = match.group(2)
+                returncode = process.wait()
+                with self.processes_lock:
+                    self.processes.discard(process)
+
+            finished = time.time()
+            status = "done" if returncode == 0 else ("interrupted" if self.stopping.is_set() else "failed")
+            variables.update(new_variables)
+            self.state.update(job.name, variables=new_variables,
+                              stage={"name": stage, "status": status, "started": started, "finished": finished,
+                                     "returncode": returncode, "attempt": attempt, "log": log_file})
+            self.log(f"[{job.name}] {stage} {status} after {finished - started:.0f}s"
+                     + ("" if returncode == 0 else f" (exit code {returncode}, see {log_file})"))
+            if returncode == 0:
+                return True
+            if self.stopping.is_set():
+                return False
+        return False
+
+
+class PlaceholderVariables(dict):
+    """Template variables that keep unknown placeholders as they are (for --dry-run)."""
+
+    def __missing__(self, key):
+        return "{" + key + "}"
+
+
+def parse_stage_commands(overrides):
+    commands = dict(DEFAULT_STAGE_COMMANDS)
+    for override in overrides:
+        stage, separator, command = override.partition("=")
+        if not separator or stage not in STAGE_DEPENDENCIES:
+            raise ValueError(f"Invalid stage command '{override}', expected STAGE=COMMAND with STAGE one of: "
+                             f"{', '.join(STAGE_DEPENDENCIES)}")
+        commands[stage] = command
+    return commands
+
+
+def format_summary(jobs, state):
+    lines = [f"{'JOB':<70} {'STATUS':<12} {'STAGES DONE'}", f"{'-' * 70} {'-' * 12} {'-' * 30}"]
+    for job in jobs:
+        saved = state.job(job.name)
+        done = [name for name, stage in saved.get("stages", {}).items() if stage.get("status") == "done"]
+        lines.append(f"{job.name:<70} {saved.get('status', 'pending'):<12} {', '.join(done)}")
+    return "\n".join(lines)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Run a matrix of TeaStore experiments as parallel staged jobs")
+    arg_parser.add_argument("--matrix",
+                            help="JSON file with 'experiments' (name, experiment_type, tfvars, with_resources, "
+                                 "profiles), optional 'targets' and 'stages' (stage command templates)")
+    arg_parser.add_argument("--tfvars-glob",
+                            help="Add one experiment per matching tfvars file, "
+                                 "e.g. 'terraform_teastore/experiment/*.tfvars'")
+    arg_parser.add_argument("--target", action="append", default=[],
+                            help="Target to run jobs on as name[:kubeconfig[:namespace]]; one job runs per "
+                                 "target at a time (default: one target 'default'). With the default deploy "
+                                 "stage, every target needs its own kubeconfig (cluster)")
+    arg_parser.add_argument("--max-parallel", type=int,
+                            help="Maximum number of jobs running at the same time (default: number of targets)")
+    arg_parser.add_argument("--stage-command", action="append", default=[], metavar="STAGE=COMMAND",
+                            help="Replace the command template of a stage (e.g. with a stub)")
+    arg_parser.add_argument("--results-dir", default=f"experiment_{datetime.now():%Y-%m-%d}_matrix",
+                            help="Directory for the logs and results of all jobs")
+    arg_parser.add_argument("--state-file",
+                            help="JSON file with the progress of the jobs (default: RESULTS_DIR/matrix_state.json)")
+    arg_parser.add_argument("--restart", action="store_true",
+                            help="Ignore the state file and run all stages again")
+    arg_parser.add_argument("--retries", type=int, default=0,
+                            help="Retry a failed stage this many times (default: 0)")
+    arg_parser.add_argument("--dry-run", action="store_true",
+                            help="Only print the commands of the stages")
+    args = arg_parser.parse_args()
+
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    results_dir = os.path.abspath(args.results_dir)
+
+    matrix = {}
+    if args.matrix:
+        with open(args.matrix, 'r', encoding='utf-8') as f:
+            matrix = json.load(f)
+    jobs = [Job.from_dict(experiment) for experiment in matrix.get("experiments", [])]
+    if args.tfvars_glob:
+        jobs.extend(jobs_from_tfvars(os.path.join(repo_dir, args.tfvars_glob)
+                                     if not os.path.isabs(args.tfvars_glob) else args.tfvars_glob))
+    if not jobs:
+        print("Error: No experiments given (use --matrix and/or --tfvars-glob)", file=sys.stderr)
+        sys.exit(1)
+    names = [job.name for job in jobs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        print(f"Error: Duplicate experiment names: {', '.join(duplicates)}", file=sys.stderr)
+        sys.exit(1)
+
+    targets = [parse_target(spec) for spec in args.target] or matrix.get("targets") or [parse_target("default")]
+    try:
+        stage_commands = parse_stage_commands(
+            [f"{stage}={command}" for stage, command in matrix.get("stages", {}).items()] + args.stage_command)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    isolation_error = check_target_isolation(targets, stage_commands)
+    if isolation_error:
+        print(f"Error: {isolation_error}", file=sys.stderr)
+        sys.exit(1)
+
+    os.makedirs(results_dir, exist_ok=True)
+    state_file = args.state_file or os.path.join(results_dir, "matrix_state.json")
+    if args.restart and os.path.exists(state_file):
+        os.remove(state_file)
+    state = MatrixState(state_file)
+
+    runner = MatrixRunner(jobs, targets, stage_commands, state, results_dir, repo_dir,
+                          max_parallel=args.max_parallel, retries=args.retries, dry_run=args.dry_run)
+
+    def request_stop(signum, frame):
+        print("\nStopping: terminating running stages (run again to resume)...", flush=True)
+        runner.stop()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    print(f"Running {len(jobs)} experiment(s) on {len(targets)} target(s) "
+          f"({', '.join(shlex.quote(target['name']) for target in targets)}), "
+          f"up to {runner.max_parallel} at a time")
+    print(f"State file: {state_file}\n")
+    start = time.time()
+    results = runner.run()
+
+    print(f"\nFinished after {time.time() - start:.0f}s\n")
+    if not args.dry_run:
+        print(format_summary(jobs, state))
+    failed = [name for name, status in results.items() if status != "done"]
+    if failed:
+        print(f"\nWARNING: {len(failed)} experiment(s) did not finish, run the same command again to resume")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
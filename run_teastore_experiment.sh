@@ -75,58 +75,13 @@ determine_status_response_times() {
   
   echo "Measuring TeaStore status endpoint response times..."
   local STATUS_TIMING_FILE="average_status_response_time_$(date +%Y%m%d_%H%M%S).txt"
+  local endpoint="http://$cluster_ip/tools.descartes.teastore.webui/status"
   
-  # Arrays to store timing data
-  local -a total_times
-  local -a connect_times
-  local -a transfer_times
-  
-  # Perform 10 timing measurements
-  for i in {1..10}; do
-    echo "  Response time measurement $i/10"
-    
-    # Use curl with timing output to measure different phases
-    local timing_output
-    timing_output=$(curl -s -f -m 10 -o /dev/null -w "total:%{time_total};connect:%{time_connect};transfer:%{time_starttransfer}" "http://$cluster_ip/tools.descartes.teastore.webui/status" 2>/dev/null)
-    local curl_exit_code=$?
-    
-    if [ $curl_exit_code -eq 0 ] && [ -n "$timing_output" ]; then
-      # Parse timing values
-      local total_time
-      local connect_time
-      local transfer_time
-      total_time=$(echo "$timing_output" | sed -n 's/.*total:\([0-9.]*\).*/\1/p')
-      connect_time=$(echo "$timing_output" | sed -n 's/.*connect:\([0-9.]*\).*/\1/p')
-      transfer_time=$(echo "$timing_output" | sed -n 's/.*transfer:\([0-9.]*\).*/\1/p')
-      
-      # Store values in arrays
-      total_times+=($total_time)
-      connect_times+=($connect_time)
-      transfer_times+=($transfer_time)
-      
-      echo "    Total: ${total_time}s, Connect: ${connect_time}s, Transfer: ${transfer_time}s"
-    else
-      echo "    Failed to get timing data (curl exit code: $curl_exit_code)"
-    fi
-    
-    # Small delay between measurements
-    sleep 0.5
-  done
-  
-  # Generate statistics and reports using Python
-  if [ ${#total_times[@]} -gt 0 ]; then
-    # Convert arrays to comma-separated strings for Python script
-    local total_csv
-    local connect_csv
-    local transfer_csv
-    total_csv=$(IFS=','; echo "${total_times[*]}")
-    connect_csv=$(IFS=','; echo "${connect_times[*]}")
-    transfer_csv=$(IFS=','; echo "${transfer_times[*]}")
-    
-    local endpoint="http://$cluster_ip/tools.descartes.teastore.webui/status"
-    
-    python calculate_response_stats.py "$total_csv" "$connect_csv" "$transfer_csv" "$endpoint" --file "$STATUS_TIMING_FILE"
-  else
+  # Sample until the 95% confidence interval of the mean total, connect and
+  # first-byte times is within 5% (or 1 ms), at least 10 and for at most 60 seconds
+  if ! python calculate_response_stats.py --adaptive "$endpoint" \
+      --metrics total,connect,ttfb --target-relative 0.05 --target-ms 1 \
+      --min-samples 10 --time-budget 60 --file "$STATUS_TIMING_FILE"; then
     echo "⚠ Warning: No successful timing measurements collected"
     echo "Failed to measure response times at $(date)" > "$STATUS_TIMING_FILE"
   fi
@@ -307,52 +262,21 @@ locust_directory="$root_folder/locust_scripts"
 
 echo "Current time: $(date +'%H:%M:%S')"
 if [ "$teastore_with_additional_custom_resource_configurations" = true ]; then
-  echo "Waiting for 240 seconds for TeaStore to start up"
-  sleep 240
+  readiness_timeout=540
 else
-  echo "Waiting for 120 seconds for TeaStore to start up"
-  sleep 120
+  readiness_timeout=420
 fi
 
-# Retry TeaStore status request until all services are OK
-max_retries=20
-retry_count=0
-while [ $retry_count -lt $max_retries ]; do
-  echo "Checking TeaStore services status (attempt $((retry_count + 1))/$max_retries)..."
-  
-  # Get the status page response
-  status_response=$(curl -s -m 10 "http://$cluster_public_ip/tools.descartes.teastore.webui/status" 2>/dev/null)
-  curl_exit_code=$?
-  
-  if [ $curl_exit_code -eq 0 ] && [ -n "$status_response" ]; then
-    # Use Python script to parse HTML and check if all services are OK
-    if echo "$status_response" | python check_teastore_status.py /dev/stdin > /dev/null 2>&1; then
-      # Get the detailed status output for logging
-      detailed_status=$(echo "$status_response" | python check_teastore_status.py /dev/stdin 2>/dev/null)
-      echo "✓ All TeaStore services are ready!"
-      echo "$detailed_status" | grep -E "(Found [0-9]+ services|✓ Services OK:|\ \ - )"
-      break
-    else
-      # Get the detailed status output for logging
-      detailed_status=$(echo "$status_response" | python check_teastore_status.py /dev/stdin 2>/dev/null || echo "Failed to parse status")
-      echo "✗ Not all TeaStore services are ready yet:"
-      echo "$detailed_status" | head -10
-    fi
-  else
-    echo "✗ Failed to connect to TeaStore status endpoint (curl exit code: $curl_exit_code)"
-  fi
-  
-  retry_count=$((retry_count + 1))
-  if [ $retry_count -lt $max_retries ]; then
-    echo "Retrying in 5 seconds..."
-    sleep 5
-  else
-    echo "Error: TeaStore services are not all ready after $max_retries attempts"
-    echo "Last status response (first 500 chars):"
-    echo "$status_response" | head -c 500
-    exit 1
-  fi
-done
+# Poll the TeaStore status page until all services are OK
+# (single long-lived process with a keep-alive connection and adaptive backoff)
+echo "Waiting up to $readiness_timeout seconds for TeaStore services to become ready"
+READINESS_REPORT_FILE="teastore_time_to_ready_$(date +%Y%m%d_%H%M%S).json"
+python check_teastore_status.py watch "http://$cluster_public_ip/tools.descartes.teastore.webui/status" \
+  --timeout "$readiness_timeout" --report-file "$READINESS_REPORT_FILE"
+if [ $? -ne 0 ]; then
+  echo "Error: TeaStore services are not all ready after $readiness_timeout seconds"
+  exit 1
+fi
 
 # perform a few requests to warm up the service (a real warmup is performed by the load test later,
 # this is just a start, because we observed that sometimes the load balancer of TeaStore gets stuck.
@@ -532,6 +456,22 @@ else
   mkdir -pv "$target_directory"
 fi
 
+# Record the resource usage of the TeaStore pods on the main node for the whole load test
+echo "Starting resource usage sampler in background..."
+kubectl proxy --port=8001 > /dev/null 2>&1 &
+kubectl_proxy_pid=$!
+sleep 2
+python sample_resource_usage.py -n teastore -v terraform_teastore/variables.tf --interval 5 \
+  --output "$target_directory/resource_usage_teastore.csv" > "$target_directory/resource_usage_sampler.log" 2>&1 &
+resource_sampler_pid=$!
+echo "Resource usage sampler started with PID $resource_sampler_pid, writing to $target_directory/resource_usage_teastore.csv"
+
+# Record container restarts (e.g. OOMKilled) with timestamps to line them up with the latency data
+python check_oomkilled.py --watch --events-file "$target_directory/container_restarts.csv" \
+  > "$target_directory/container_restarts.log" 2>&1 &
+restart_watcher_pid=$!
+echo "Container restart watcher started with PID $restart_watcher_pid, writing to $target_directory/container_restarts.csv"
+
 for profile in $PROFILES_TO_USE; do
   echo $profile
 
@@ -565,6 +505,12 @@ for profile in $PROFILES_TO_USE; do
 done
 
 echo "*** All load intensity profiles have been executed\n"
+
+echo "Stopping resource usage sampler and container restart watcher..."
+kill "$resource_sampler_pid" "$restart_watcher_pid" 2>/dev/null
+wait "$resource_sampler_pid" "$restart_watcher_pid" 2>/dev/null
+tail -n 1 "$target_directory/container_restarts.log"
+kill "$kubectl_proxy_pid" 2>/dev/null
 echo "******* Remember to download the recorded resource usages before exiting *******\n"
 echo "*** Navigate to http://$cluster_public_ip/grafana to download them\n"
 
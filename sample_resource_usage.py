@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Kubernetes Resource Usage Sampler
+
+Samples the CPU and memory usage of all pods in a namespace (optionally only
+the pods running on one node) at a fixed interval and appends one CSV row per
+pod and sample to an output file. Each sample is a single bulk request to the
+metrics API (the same data `kubectl top pod` shows), sent over a keep-alive
+connection.
+
+Usage:
+    kubectl proxy --port=8001 &
+    python sample_resource_usage.py -n teastore -v terraform_teastore/variables.tf \
+        --interval 5 --output resource_usage.csv
+
+Sampling runs until --duration is reached or the process receives
+SIGINT/SIGTERM, so it can be started in the background for the length of an
+experiment.
+"""
+
+import os
+import re
+import csv
+import sys
+import time
+import signal
+import argparse
+import http.client
+from collections import defaultdict
+
+from k8s_api import (KubernetesApiError, add_api_arguments, client_from_arguments,
+                     parse_cpu_quantity, parse_memory_quantity)
+
+
+CSV_HEADER = ["timestamp", "namespace", "pod", "cpu_millicores", "memory_mib"]
+
+
+def read_main_node(variables_tf_path):
+    """Read the name of the main node from the terraform variables file (as get-k8s-resource-usage.sh does)."""
+    with open(variables_tf_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            match = re.search(r'main\s*=\s*"([^"]+)"', line)
+            if match:
+                return match.group(1)
+    raise ValueError(f"No main node found in {variables_tf_path}")
+
+
+class ResourceUsageSampler:
+    """Collects pod metrics of one namespace with one metrics API request per sample."""
+
+    def __init__(self, client, namespace, node=None, pod_refresh_interval=60.0):
+        self.client = client
+        self.namespace = namespace
+        self.node = node
+        self.pod_refresh_interval = pod_refresh_interval
+        self.node_pods = None
+        self.node_pods_refreshed = 0.0
+        self.known_pods = set()
+
+    def _refresh_node_pods(self):
+        """Fetch the names of the running pods on the node with a single list request."""
+        pod_list = self.client.get_json(
+            f"/api/v1/namespaces/{self.namespace}/pods",
+            {"fieldSelector": f"spec.nodeName={self.node},status.phase=Running"})
+        self.node_pods = {item['metadata']['name'] for item in pod_list.get('items', [])}
+        self.node_pods_refreshed = time.monotonic()
+
+    def sample(self):
+        """
+        Fetch the current usage of all pods
+
+        Returns:
+            dict: pod name -> (cpu millicores, memory MiB), summed over all containers
+        """
+        metrics = self.client.get_json(f"/apis/metrics.k8s.io/v1beta1/namespaces/{self.namespace}/pods")
+        items = metrics.get('items', [])
+
+        if self.node is not None:
+            # The pod list only changes on (re)scheduling, so it is refreshed periodically
+            # or when the metrics contain a pod we have not seen before
+            names = {item['metadata']['name'] for item in items}
+            if (self.node_pods is None
+                    or time.monotonic() - self.node_pods_refreshed > self.pod_refresh_interval
+                    or not names <= self.known_pods):
+                self._refresh_node_pods()
+                self.known_pods = names
+
+        usage = {}
+        for item in items:
+            name = item['metadata']['name']
+            if self.node_pods is not None and name not in self.node_pods:
+                continue
+            cpu = 0.0
+            memory = 0.0
+            for container in item.get('containers', []):
+                cpu += parse_cpu_quantity(container['usage']['cpu'])
+                memory += parse_memory_quantity(container['usage']['memory'])
+            usage[name] = (cpu, memory / 1024 ** 2)
+        return usage
+
+
+def run_sampler(sampler, output_file, interval=5.0, duration=None, log=print):
+    """
+    Sample at a fixed interval and append the rows to output_file
+
+    Ticks are scheduled relative to the start time, so slow requests do not
+    shift later samples; ticks that were missed entirely are skipped.
+
+    Returns:
+        dict: pod name -> list of (cpu millicores, memory MiB) samples
+    """
+    stop = False
+
+    def request_stop(signum, frame):
+        nonlocal stop
+        stop = True
+
+    previous_handlers = {sig: signal.signal(sig, request_stop) for sig in (signal.SIGINT, signal.SIGTERM)}
+
+    history = defaultdict(list)
+    write_header = not os.path.exists(output_file) or os.path.getsize(output_file) == 0
+    start = time.monotonic()
+    next_tick = start
+    samples = 0
+
+    try:
+        with open(output_file, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(CSV_HEADER)
+
+            while not stop:
+                timestamp = time.time()
+                try:
+                    usage = sampler.sample()
+                except (OSError, http.client.HTTPException, KubernetesApiError, ValueError) as e:
+                    print(f"Warning: Could not fetch metrics: {e}", file=sys.stderr)
+                else:
+                    for pod, (cpu, memory) in sorted(usage.items()):
+                        writer.writerow([f"{timestamp:.3f}", sampler.namespace, pod,
+                                         f"{cpu:.1f}", f"{memory:.1f}"])
+                        history[pod].append((cpu, memory))
+                    f.flush()
+                    samples += 1
+
+                now = time.monotonic()
+                if duration is not None and now - start >= duration:
+                    break
+                next_tick += interval
+                if next_tick < now:
+                    next_tick += ((now - next_tick) // interval + 1) * interval
+                while not stop and time.monotonic() < next_tick:
+                    time.sleep(max(0.0, min(0.5, next_tick - time.monotonic())))
+    finally:
+        for sig, handler in previous_handlers.items():
+            signal.signal(sig, handler)
+
+    log(f"Collected {samples} samples in {time.monotonic() - start:.0f} seconds")
+    return history
+
+
+def format_usage_summary(history):
+    """Format average and peak usage per pod like the table of get-k8s-resource-usage.sh."""
+    lines = [f"{'POD NAME':<40} {'AVG CPU':>10} {'MAX CPU':>10} {'AVG MEM':>10} {'MAX MEM':>10}",
+             f"{'-' * 40} {'-' * 10} {'-' * 10} {'-' * 10} {'-' * 10}"]
+    for pod, values in sorted(history.items()):
+        cpu = [v[0] for v in values]
+        memory = [v[1] for v in values]
+        lines.append(f"{pod:<40} {sum(cpu) / len(cpu):>9.0f}m {max(cpu):>9.0f}m "
+                     f"{sum(memory) / len(memory):>8.0f}Mi {max(memory):>8.0f}Mi")
+    return "\n".join(lines)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Sample pod CPU and memory usage into a CSV file")
+    arg_parser.add_argument("-n", "--namespace", default="kube-system",
+                            help="Namespace of the pods (default: kube-system)")
+    node_group = arg_parser.add_mutually_exclusive_group()
+    node_group.add_argument("--node", help="Only sample pods running on this node")
+    node_group.add_argument("-v", "--variables",
+                            help="Only sample pods on the main node configured in this variables.tf")
+    arg_parser.add_argument("--interval", type=float, default=5.0,
+                            help="Seconds between samples (default: 5)")
+    arg_parser.add_argument("--duration", type=float,
+                            help="Stop after this many seconds (default: until SIGINT/SIGTERM)")
+    arg_parser.add_argument("-o", "--output", default="resource_usage.csv",
+                            help="CSV file the samples are appended to (default: resource_usage.csv)")
+    add_api_arguments(arg_parser)
+    args = arg_parser.parse_args()
+
+    node = args.node
+    if args.variables:
+        try:
+            node = read_main_node(args.variables)
+        except (OSError, ValueError) as e:
+            print(f"Error: Failed to get the main node: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    client = client_from_arguments(args)
+    sampler = ResourceUsageSampler(client, args.namespace, node=node)
+
+    target = f"namespace {args.namespace}" + (f" on node {node}" if node else "")
+    print(f"Sampling resource usage of {target} every {args.interval:g}s into {args.output}")
+    try:
+        history = run_sampler(sampler, args.output, interval=args.interval, duration=args.duration)
+    finally:
+        client.close()
+
+    if history:
+        print()
+        print(format_usage_summary(history))
+
+
+if __name__ == "__main__":
+    main()
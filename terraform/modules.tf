@@ -15,6 +15,7 @@ module "metric" {
     user = "admin"
     password = "admin"
   }
+  locust_exporter_targets = var.locust_exporter_targets
 }
 
 module "autoscaler" {
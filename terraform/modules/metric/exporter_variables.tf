@@ -0,0 +1,6 @@
+# Declared outside of variables.tf, which is ignored by git
+variable "locust_exporter_targets" {
+  description = "host:port of analyze_logs.py serve-metrics exporters scraped by Prometheus"
+  type        = list(string)
+  default     = []
+}
@@ -12,6 +12,8 @@ module "prometheus" {
 
   namespace  = var.namespace
   node       = var.node
+
+  locust_exporter_targets = var.locust_exporter_targets
 }
 
 module "grafana" {
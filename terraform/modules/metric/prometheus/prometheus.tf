@@ -14,6 +14,7 @@ resource "helm_release" "prometheus" {
   values = [templatefile("${path.module}/prometheus_values.yml", {
     namespace   = var.namespace
     node        = var.node
+    locust_exporter_targets = var.locust_exporter_targets
     })
   ]
 }
\ No newline at end of file
@@ -5,6 +5,8 @@ set -e  # abort on first error
 SKIP_TEASTORE=false
 DEPLOYMENT_TYPE=""
 ADDITIONAL_VAR_FILE=""
+NAMESPACE="teastore"
+WORKSPACE=""
 
 # Parse arguments
 while [[ $# -gt 0 ]]; do
@@ -17,11 +19,21 @@ while [[ $# -gt 0 ]]; do
             ADDITIONAL_VAR_FILE="$2"
             shift 2
             ;;
+        --namespace)
+            NAMESPACE="$2"
+            shift 2
+            ;;
+        --workspace)
+            WORKSPACE="$2"
+            shift 2
+            ;;
         --help|-h)
             echo "Usage: $0 [OPTIONS] <deployment-type>"
             echo "Options:"
             echo "  --skip-teastore          Skip TeaStore replacement (only replace noise-neighbor)"
             echo "  --additional-var-file FILE  Use an additional tfvars file"
+            echo "  --namespace NAMESPACE    Namespace to deploy TeaStore into (default: teastore)"
+            echo "  --workspace NAME         Terraform workspace to use, created if it does not exist"
             echo "  --help, -h               Show this help message"
             echo ""
             echo "Available deployment types:"
@@ -34,6 +46,8 @@ while [[ $# -gt 0 ]]; do
             echo "Examples:"
             echo "  $0 mem-without-resources"
             echo "  $0 --skip-teastore mem-with-resources"
+            echo ""
+            echo "The cluster is taken from KUBECONFIG if it is set (a single file), else from ~/.kube/config."
             exit 0
             ;;
         -*)
@@ -80,6 +94,11 @@ esac
 
 terraform init
 
+# Separate terraform state per cluster
+if [[ -n "$WORKSPACE" ]]; then
+    terraform workspace select -or-create "$WORKSPACE"
+fi
+
 # Define TeaStore deployment replacements
 TEASTORE_REPLACEMENTS="-replace=module.teastore.kubernetes_deployment_v1.auth -replace=module.teastore.kubernetes_deployment_v1.db -replace=module.teastore.kubernetes_deployment_v1.image -replace=module.teastore.kubernetes_deployment_v1.persistence -replace=module.teastore.kubernetes_deployment_v1.rabbitmq -replace=module.teastore.kubernetes_deployment_v1.recommender -replace=module.teastore.kubernetes_deployment_v1.registry -replace=module.teastore.kubernetes_deployment_v1.webui"
 
@@ -97,6 +116,12 @@ else
     ADDITIONAL_VAR_FILE_PARAM=()
 fi
 
+# Cluster and namespace of the deployment
+TARGET_VAR_PARAMS=("-var=teastore_namespace=$NAMESPACE")
+if [[ -n "$KUBECONFIG" ]]; then
+    TARGET_VAR_PARAMS+=("-var=kubeconfig_path=$KUBECONFIG")
+fi
+
 # Create log file with timestamp
 LOG_FILE="terraform_apply_$(date +%Y%m%d_%H%M%S).log"
 echo "Running terraform apply... Output will be logged to: $LOG_FILE"
@@ -105,7 +130,7 @@ echo "Please wait..."
 # Select and execute the appropriate terraform apply command based on the argument
 case "$DEPLOYMENT_TYPE" in
     "mem-without-resources")
-        if terraform apply -auto-approve -var-file="experiment/memory_allocator_teastore_without_resource.tfvars" "${ADDITIONAL_VAR_FILE_PARAM[@]}" -replace="module.noisy-neighbor.kubernetes_deployment_v1.memory-allocator[0]" $REPLACEMENTS > "$LOG_FILE" 2>&1; then
+        if terraform apply -auto-approve -var-file="experiment/memory_allocator_teastore_without_resource.tfvars" "${ADDITIONAL_VAR_FILE_PARAM[@]}" "${TARGET_VAR_PARAMS[@]}" -replace="module.noisy-neighbor.kubernetes_deployment_v1.memory-allocator[0]" $REPLACEMENTS > "$LOG_FILE" 2>&1; then
             echo "Terraform apply completed successfully!"
         else
             echo "Terraform apply failed! Check $LOG_FILE for details."
@@ -115,7 +140,7 @@ case "$DEPLOYMENT_TYPE" in
         fi
         ;;
     "mem-with-resources")
-        if terraform apply -auto-approve -var-file="experiment/memory_allocator_teastore_with_resource.tfvars" "${ADDITIONAL_VAR_FILE_PARAM[@]}" -replace="module.noisy-neighbor.kubernetes_deployment_v1.memory-allocator[0]" $REPLACEMENTS > "$LOG_FILE" 2>&1; then
+        if terraform apply -auto-approve -var-file="experiment/memory_allocator_teastore_with_resource.tfvars" "${ADDITIONAL_VAR_FILE_PARAM[@]}" "${TARGET_VAR_PARAMS[@]}" -replace="module.noisy-neighbor.kubernetes_deployment_v1.memory-allocator[0]" $REPLACEMENTS > "$LOG_FILE" 2>&1; then
             echo "Terraform apply completed successfully!"
         else
             echo "Terraform apply failed! Check $LOG_FILE for details."
@@ -125,7 +150,7 @@ case "$DEPLOYMENT_TYPE" in
         fi
         ;;
     "cpu-without-resources")
-        if terraform apply -auto-approve -var-file="experiment/cpu_load_generator_teastore_without_resources.tfvars" "${ADDITIONAL_VAR_FILE_PARAM[@]}" -replace="module.noisy-neighbor.kubernetes_deployment_v1.cpu-load-generator[0]" $REPLACEMENTS > "$LOG_FILE" 2>&1; then
+        if terraform apply -auto-approve -var-file="experiment/cpu_load_generator_teastore_without_resources.tfvars" "${ADDITIONAL_VAR_FILE_PARAM[@]}" "${TARGET_VAR_PARAMS[@]}" -replace="module.noisy-neighbor.kubernetes_deployment_v1.cpu-load-generator[0]" $REPLACEMENTS > "$LOG_FILE" 2>&1; then
             echo "Terraform apply completed successfully!"
         else
             echo "Terraform apply failed! Check $LOG_FILE for details."
@@ -135,7 +160,7 @@ case "$DEPLOYMENT_TYPE" in
         fi
         ;;
     "cpu-with-resources")
-        if terraform apply -auto-approve -var-file="experiment/cpu_load_generator_teastore_with_resources.tfvars" "${ADDITIONAL_VAR_FILE_PARAM[@]}" -replace="module.noisy-neighbor.kubernetes_deployment_v1.cpu-load-generator[0]" $REPLACEMENTS > "$LOG_FILE" 2>&1; then
+        if terraform apply -auto-approve -var-file="experiment/cpu_load_generator_teastore_with_resources.tfvars" "${ADDITIONAL_VAR_FILE_PARAM[@]}" "${TARGET_VAR_PARAMS[@]}" -replace="module.noisy-neighbor.kubernetes_deployment_v1.cpu-load-generator[0]" $REPLACEMENTS > "$LOG_FILE" 2>&1; then
             echo "Terraform apply completed successfully!"
         else
             echo "Terraform apply failed! Check $LOG_FILE for details."
@@ -145,7 +170,7 @@ case "$DEPLOYMENT_TYPE" in
         fi
         ;;
     "default")
-        if terraform apply -auto-approve "${ADDITIONAL_VAR_FILE_PARAM[@]}" $REPLACEMENTS > "$LOG_FILE" 2>&1; then
+        if terraform apply -auto-approve "${ADDITIONAL_VAR_FILE_PARAM[@]}" "${TARGET_VAR_PARAMS[@]}" $REPLACEMENTS > "$LOG_FILE" 2>&1; then
             echo "Terraform apply completed successfully!"
         else
             echo "Terraform apply failed! Check $LOG_FILE for details."
@@ -158,8 +183,8 @@ esac
 
 # Clean up succeeded and failed pods in experiment namespaces
 echo "Cleaning up completed and failed pods in experiment namespaces..."
-kubectl delete pod --field-selector=status.phase==Succeeded -n teastore --ignore-not-found=true
-kubectl delete pod --field-selector=status.phase==Failed -n teastore --ignore-not-found=true
+kubectl delete pod --field-selector=status.phase==Succeeded -n "$NAMESPACE" --ignore-not-found=true
+kubectl delete pod --field-selector=status.phase==Failed -n "$NAMESPACE" --ignore-not-found=true
 kubectl delete pod --field-selector=status.phase==Succeeded -n noisy-neighbor --ignore-not-found=true
 kubectl delete pod --field-selector=status.phase==Failed -n noisy-neighbor --ignore-not-found=true
 
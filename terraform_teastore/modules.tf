@@ -14,6 +14,8 @@ module "metric" {
     user = "admin"
     password = "admin"
   }
+
+  locust_exporter_targets = var.locust_exporter_targets
 }
 
 module "teastore" {
@@ -21,6 +23,7 @@ module "teastore" {
   depends_on = [module.metric]
 
   node = local.nodes.main
+  namespace = var.teastore_namespace
 
   image_registry = {
     url                      = local.image_registry_url
@@ -6,7 +6,7 @@ resource "kubernetes_deployment_v1" "auth" {
       app = "auth"
     }
     name      = "auth"
-    namespace = local.namespace
+    namespace = var.namespace
   }
 
   spec {
@@ -6,7 +6,7 @@ resource "kubernetes_deployment_v1" "db" {
       app = "db"
     }
     name      = "db"
-    namespace = local.namespace
+    namespace = var.namespace
   }
 
   spec {
@@ -64,7 +64,7 @@ resource "kubernetes_service" "db" {
 
   metadata {
     name      = "db-svc"
-    namespace = local.namespace
+    namespace = var.namespace
   }
 
   spec {
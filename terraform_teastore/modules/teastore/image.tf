@@ -6,7 +6,7 @@ resource "kubernetes_deployment_v1" "image" {
       app = "image"
     }
     name      = "image"
-    namespace = local.namespace
+    namespace = var.namespace
   }
 
   spec {
@@ -0,0 +1,6 @@
+# Declared outside of variables.tf, which is ignored by git
+variable "namespace" {
+  description = "Namespace TeaStore is deployed into"
+  type        = string
+  default     = "teastore"
+}
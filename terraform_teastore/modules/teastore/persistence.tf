@@ -6,7 +6,7 @@ resource "kubernetes_deployment_v1" "persistence" {
       app = "persistence"
     }
     name      = "persistence"
-    namespace = local.namespace
+    namespace = var.namespace
   }
 
   spec {
@@ -7,7 +7,7 @@ resource "kubernetes_deployment_v1" "rabbitmq" {
       app = "rabbitmq"
     }
     name      = "rabbitmq"
-    namespace = local.namespace
+    namespace = var.namespace
   }
 
   spec {
@@ -72,7 +72,7 @@ resource "kubernetes_service" "rabbitmq" {
 
   metadata {
     name = "rabbitmq-svc"
-    namespace = local.namespace
+    namespace = var.namespace
   }
 
   spec {
@@ -6,7 +6,7 @@ resource "kubernetes_deployment_v1" "recommender" {
       app = "recommender"
     }
     name      = "recommender"
-    namespace = local.namespace
+    namespace = var.namespace
   }
 
   spec {
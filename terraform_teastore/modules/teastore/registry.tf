@@ -6,7 +6,7 @@ resource "kubernetes_deployment_v1" "registry" {
       app = "registry"
     }
     name      = "registry"
-    namespace = local.namespace
+    namespace = var.namespace
   }
 
   spec {
@@ -69,7 +69,7 @@ resource "kubernetes_service" "registry" {
 
   metadata {
     name      = "registry-svc"
-    namespace = local.namespace
+    namespace = var.namespace
   }
 
   spec {
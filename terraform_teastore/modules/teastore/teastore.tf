@@ -2,7 +2,7 @@ resource "kubernetes_namespace_v1" "teastore" {
   provider = kubernetes
 
   metadata {
-    name = local.namespace
+    name = var.namespace
   }
 }
 
@@ -12,7 +12,7 @@ resource "kubernetes_secret_v1" "teastore" {
 
   metadata {
     name      = "regcred"
-    namespace = local.namespace
+    namespace = var.namespace
   }
 
   data = {
@@ -27,7 +27,7 @@ resource "kubernetes_default_service_account_v1" "teastore" {
   depends_on = [kubernetes_namespace_v1.teastore]
 
   metadata {
-    namespace = local.namespace
+    namespace = var.namespace
   }
 
   image_pull_secret {
@@ -6,7 +6,7 @@ resource "kubernetes_deployment_v1" "webui" {
       app = "webui"
     }
     name      = "webui"
-    namespace = local.namespace
+    namespace = var.namespace
   }
 
   spec {
@@ -82,7 +82,7 @@ resource "kubernetes_service_v1" "webui" {
 
   metadata {
     name      = "webui-svc"
-    namespace = local.namespace
+    namespace = var.namespace
   }
   spec {
     selector = {
@@ -111,7 +111,7 @@ resource "kubernetes_ingress_v1" "webui" {
       "app" = "webui"
     }
     name      = "webui"
-    namespace = local.namespace
+    namespace = var.namespace
   }
   spec {
     rule {
@@ -7,8 +7,13 @@ cp -v variables.tf.template variables.tf
 
 # Retrieve worker node names
 
-# Get the entire output and extract just the last column (Nodes), then extract content between brackets
-worker_nodes=$(doctl kubernetes cluster node-pool get k8s-experiments-cluster k8s-experiments-cluster-default-pool | tail -n 1 | awk '{print $(NF-1), $NF}' | sed 's/\[//;s/\]//')
+if [[ -n "$KUBECONFIG" ]]; then
+    # The cluster is given by KUBECONFIG (e.g. one of several clusters), take the nodes from it
+    worker_nodes=$(kubectl get nodes -o jsonpath='{.items[*].metadata.name}')
+else
+    # Get the entire output and extract just the last column (Nodes), then extract content between brackets
+    worker_nodes=$(doctl kubernetes cluster node-pool get k8s-experiments-cluster k8s-experiments-cluster-default-pool | tail -n 1 | awk '{print $(NF-1), $NF}' | sed 's/\[//;s/\]//')
+fi
 
 # Split the space-separated node IDs into an array
 IFS=' ' read -r -a node_array <<< "$worker_nodes"
@@ -33,6 +38,9 @@ echo "$docker_config" > config/docker-config.json
 
 doctl registry logout
 
-# Query kube-config using doctl and copy it to the default folder (~/.kube/config)
+# Query kube-config using doctl and copy it to the default folder (~/.kube/config),
+# unless the kubeconfig of the cluster is given by KUBECONFIG
 
-doctl kubernetes cluster kubeconfig save k8s-experiments-cluster
+if [[ -z "$KUBECONFIG" ]]; then
+    doctl kubernetes cluster kubeconfig save k8s-experiments-cluster
+fi
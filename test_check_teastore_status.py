@@ -0,0 +1,130 @@
+"""Tests for the instance probe mode of check_teastore_status.py against local stub servers."""
+
+import asyncio
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from check_teastore_status import TeaStoreStatusParser, mark_slow_instances, probe_services
+
+SLOW_DELAY = 0.3
+
+
+class HealthHandler(BaseHTTPRequestHandler):
+    """Answers every GET with the server's ``body`` after sleeping ``delay`` seconds."""
+
+    def do_GET(self):
+        self.server.paths.append(self.path)
+        time.sleep(self.server.delay)
+        body = self.server.body
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def start_stub():
+    servers = []
+
+    def start(body=b"true", delay=0.0):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), HealthHandler)
+        server.body = body
+        server.delay = delay
+        server.paths = []
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server, f"127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def refused_address():
+    """Address of a port that was just released, so connecting to it is refused."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return f"127.0.0.1:{port}"
+
+
+def status_page(hosts_by_service):
+    rows = "".join(
+        f"<tr><td>{name}</td><td>{len(hosts)}</td><td>{'<br>'.join(hosts)}</td>"
+        f"<td class=\"success\">OK</td></tr>"
+        for name, hosts in hosts_by_service.items()
+    )
+    return ("<html><body><table><tr><th>Service</th><th>#</th><th>Host(s)</th><th>Status</th></tr>"
+            f"{rows}</table></body></html>")
+
+
+def parse_services(hosts_by_service):
+    parser = TeaStoreStatusParser()
+    parser.feed(status_page(hosts_by_service))
+    return parser.services_by_name
+
+
+def test_probe_services_and_mark_slow_instances(start_stub):
+    fast_a, fast_a_address = start_stub()
+    _, fast_b_address = start_stub()
+    _, slow_address = start_stub(delay=SLOW_DELAY)
+    _, not_ready_address = start_stub(body=b"false")
+    refused = refused_address()
+    services_by_name = parse_services({
+        "Auth": [fast_a_address, fast_b_address, slow_address],
+        "Persistence": [not_ready_address],
+        "Recommender": [refused],
+        "Image": [],
+    })
+
+    results = asyncio.run(probe_services(services_by_name, rounds=2, timeout=5.0))
+    by_instance = {(r['service'], r['instance']): r for r in results}
+    assert len(results) == 6
+
+    # Every registered instance is probed on the health path of its service
+    assert fast_a.paths == ["/tools.descartes.teastore.auth/rest/ready/isready"] * 2
+    for address in (fast_a_address, fast_b_address, slow_address):
+        result = by_instance[("Auth", address)]
+        assert result['ok'] and result['status'] == "OK"
+        assert result['latency_ms'] is not None
+    assert by_instance[("Auth", slow_address)]['latency_ms'] >= SLOW_DELAY * 1000
+
+    not_ready = by_instance[("Persistence", not_ready_address)]
+    assert not not_ready['ok'] and not_ready['status'] == "not ready"
+    assert not_ready['latency_ms'] is not None
+
+    refused_result = by_instance[("Recommender", refused)]
+    assert not refused_result['ok'] and refused_result['status'].startswith("error:")
+    assert refused_result['latency_ms'] is None and refused_result['max_latency_ms'] is None
+
+    no_instances = by_instance[("Image", None)]
+    assert not no_instances['ok'] and no_instances['status'] == "no instances registered"
+
+    mark_slow_instances(results, slow_factor=2.0)
+    assert by_instance[("Auth", slow_address)]['slow']
+    assert by_instance[("Auth", slow_address)]['latency_ratio'] > 2.0
+    assert not by_instance[("Auth", fast_a_address)]['slow']
+    assert not by_instance[("Auth", fast_b_address)]['slow']
+    # Services with fewer than two answered instances are not compared
+    for key in (("Persistence", not_ready_address), ("Recommender", refused), ("Image", None)):
+        assert by_instance[key]['latency_ratio'] is None
+        assert not by_instance[key]['slow']
+
+
+def test_probe_instance_timeout(start_stub):
+    _, slow_address = start_stub(delay=1.0)
+    services_by_name = parse_services({"Auth": [slow_address]})
+
+    results = asyncio.run(probe_services(services_by_name, services=["Auth"], rounds=1, timeout=0.2))
+
+    assert len(results) == 1
+    assert not results[0]['ok'] and results[0]['status'] == "timeout after 0.2s"
+    assert results[0]['latency_ms'] is None
@@ -0,0 +1,124 @@
+"""Tests for the scheduling and resuming of run_experiment_matrix.py with stub stage commands."""
+
+import itertools
+
+from run_experiment_matrix import (DEFAULT_STAGE_COMMANDS, Job, MatrixRunner, MatrixState, check_target_isolation,
+                                   parse_stage_commands, parse_target)
+
+LOAD_SECONDS = 0.5
+
+
+def stub_commands(load=f"sleep {LOAD_SECONDS}"):
+    """Stage commands that only record which stages ran (in {results_dir}/calls) and sleep during the load."""
+    record = "echo {name} {target} $STAGE >> {results_dir}/calls"
+    return parse_stage_commands([
+        f"deploy=STAGE=deploy && {record} && echo MATRIX_SET host=host-{{target}}",
+        f"readiness=STAGE=readiness && {record} && test {{host}} = host-{{target}}",
+        f"warmup=STAGE=warmup && {record}",
+        f"load=STAGE=load && {record} && {load}",
+        f"collect=STAGE=collect && {record}",
+        f"analyze=STAGE=analyze && {record}",
+    ])
+
+
+def make_runner(tmp_path, jobs, targets, stage_commands, log):
+    state = MatrixState(str(tmp_path / "matrix_state.json"))
+    runner = MatrixRunner(jobs, targets, stage_commands, state, str(tmp_path), str(tmp_path), log=log.append)
+    return runner, state
+
+
+def read_calls(tmp_path):
+    return [tuple(line.split()) for line in (tmp_path / "calls").read_text().splitlines()]
+
+
+def load_interval(state, name):
+    load = state.job(name)["stages"]["load"]
+    return load["started"], load["finished"]
+
+
+def make_jobs(count):
+    return [Job(f"job-{index}", "baseline") for index in range(count)]
+
+
+def test_jobs_run_in_parallel_one_per_target(tmp_path):
+    targets = [parse_target("cluster-a:/tmp/kubeconfig-a"), parse_target("cluster-b:/tmp/kubeconfig-b:ns-b")]
+    jobs = make_jobs(4)
+    log = []
+    runner, state = make_runner(tmp_path, jobs, targets, stub_commands(), log)
+
+    results = runner.run()
+
+    assert results == {job.name: "done" for job in jobs}
+    used_targets = {state.job(job.name)["target"] for job in jobs}
+    assert used_targets == {"cluster-a", "cluster-b"}
+    for first, second in itertools.combinations(jobs, 2):
+        start_1, end_1 = load_interval(state, first.name)
+        start_2, end_2 = load_interval(state, second.name)
+        overlap = start_1 < end_2 and start_2 < end_1
+        if state.job(first.name)["target"] == state.job(second.name)["target"]:
+            assert not overlap, f"{first.name} and {second.name} ran on the same target at the same time"
+    # Jobs on different targets run at the same time
+    assert any(start_1 < end_2 and start_2 < end_1
+               for (start_1, end_1), (start_2, end_2) in itertools.combinations(
+                   [load_interval(state, job.name) for job in jobs], 2))
+    # Every stage ran exactly once per job
+    calls = read_calls(tmp_path)
+    assert len(calls) == len(jobs) * 6
+    assert sorted({stage for _, _, stage in calls}) == sorted(DEFAULT_STAGE_COMMANDS)
+
+
+def test_resume_continues_failed_job_on_its_target(tmp_path):
+    targets = [parse_target("cluster-a:/tmp/kubeconfig-a"), parse_target("cluster-b:/tmp/kubeconfig-b")]
+    jobs = make_jobs(2)
+    log = []
+    runner, state = make_runner(tmp_path, jobs, targets, stub_commands(load="test {name} != job-1"), log)
+
+    results = runner.run()
+
+    assert results == {"job-0": "done", "job-1": "failed"}
+    failed_target = state.job("job-1")["target"]
+    assert state.job("job-1")["stages"]["load"]["status"] == "failed"
+
+    # Resume with a working load stage: only the failed stage and the stages after it run again
+    (tmp_path / "calls").write_text("")
+    runner, state = make_runner(tmp_path, jobs, targets, stub_commands(load="true"), log)
+    results = runner.run()
+
+    assert results == {"job-0": "done", "job-1": "done"}
+    assert read_calls(tmp_path) == [("job-1", failed_target, stage) for stage in ("load", "collect", "analyze")]
+    assert "[job-0] already finished, skipping" in log
+    # The host set by the deploy stage of the first run is still known
+    assert state.job("job-1")["variables"]["host"] == f"host-{failed_target}"
+
+
+def test_resume_deploys_again_after_the_target_was_redeployed(tmp_path):
+    targets = [parse_target("cluster-a:/tmp/kubeconfig-a")]
+    jobs = make_jobs(2)
+    log = []
+    # job-0 fails its load, then job-1 is deployed on the same (only) target
+    runner, state = make_runner(tmp_path, jobs, targets, stub_commands(load="test {name} != job-0"), log)
+    assert runner.run() == {"job-0": "failed", "job-1": "done"}
+    assert state.last_deployed("cluster-a") == "job-1"
+
+    (tmp_path / "calls").write_text("")
+    runner, state = make_runner(tmp_path, jobs, targets, stub_commands(load="true"), log)
+    assert runner.run() == {"job-0": "done", "job-1": "done"}
+
+    assert [stage for name, _, stage in read_calls(tmp_path)] == list(DEFAULT_STAGE_COMMANDS)
+    assert any("was redeployed by another job, deploying again" in line for line in log)
+
+
+def test_default_deploy_needs_a_cluster_per_target():
+    default_commands = parse_stage_commands([])
+    own_clusters = [parse_target("a:/tmp/kubeconfig-a:ns-a"), parse_target("b:/tmp/kubeconfig-b")]
+    shared_cluster = [parse_target("a:/tmp/kubeconfig:ns-a"), parse_target("b:/tmp/kubeconfig:ns-b")]
+
+    assert check_target_isolation([parse_target("default")], default_commands) is None
+    assert check_target_isolation([parse_target("a::ns-a")], default_commands) is None
+    assert check_target_isolation(own_clusters, default_commands) is None
+    assert "/tmp/kubeconfig" in check_target_isolation(shared_cluster, default_commands)
+    assert check_target_isolation([parse_target("a"), parse_target("b")], default_commands) is not None
+    assert check_target_isolation(shared_cluster, parse_stage_commands(["deploy=true"])) is None
+
+    deploy = DEFAULT_STAGE_COMMANDS["deploy"]
+    assert "--namespace {namespace}" in deploy and "--workspace {target}" in deploy